@@ -0,0 +1,298 @@
+"""
+Benchmarks: Caminhos Críticos das Simulações
+
+Mede tempo de parede, vazão (passos·corpos/s) e pico de memória das
+simulações principais, com sementes fixas e parâmetros de escala
+(passos, caminhantes, estrelas, agentes):
+
+- simular_queda_entropica (caminhantes 1D)
+- simular_orbita (Newton e Verlinde)
+- calcular_curva_rotacao
+- AgenteConsciente.simular_orbita
+- comparar_agente_vs_materia_inerte
+- GalaxiaConsciente.simular_galaxia (só estrelas e com agente)
+
+Os resultados vão para um arquivo JSON de referência (--salvar), e uma
+execução posterior pode ser comparada a ele (--comparar), terminando com
+código 1 se algum benchmark ficou mais lento que a tolerância.
+
+Uso:
+    python benchmarks/benchmark_simulacoes.py --salvar benchmarks/baseline.json
+    python benchmarks/benchmark_simulacoes.py --comparar benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agente_consciente import AgenteConsciente, comparar_agente_vs_materia_inerte
+from src.galaxia_consciente import GalaxiaConsciente
+from src.rotacao_galactica import calcular_curva_rotacao, simular_orbita
+from src.simulacao_1d import simular_queda_entropica
+
+VERSAO_FORMATO = 1
+SEMENTE = 12345
+
+# Parâmetros de escala padrão (multiplicados por --escala)
+PARAMETROS_PADRAO = {
+    'passos': 2000,
+    'caminhantes': 20,
+    'estrelas': 500,
+    'agentes': 10,
+}
+
+
+def _queda_entropica(p: Dict) -> int:
+    passos = 0
+    for _ in range(p['caminhantes']):
+        passos += len(simular_queda_entropica(passos=p['passos'])) - 1
+    return passos
+
+
+def _simular_orbita(modelo: str) -> Callable[[Dict], int]:
+    def benchmark(p: Dict) -> int:
+        simular_orbita(modelo, 50.0, p['passos'])
+        return p['passos']
+    return benchmark
+
+
+def _curva_rotacao(p: Dict) -> int:
+    # Uma avaliação por raio; repetida para uma medida estável
+    raios = np.linspace(1.0, 200.0, p['estrelas'] * 100)
+    for _ in range(10):
+        calcular_curva_rotacao(raios, 'verlinde')
+    return 10 * len(raios)
+
+
+def _agente_simular_orbita(p: Dict) -> int:
+    passos = 0
+    for _ in range(p['agentes']):
+        agente = AgenteConsciente()
+        passos += len(agente.simular_orbita(p['passos'])) - 1
+    return passos
+
+
+def _comparar_agente_inerte(p: Dict) -> int:
+    passos = 0
+    for _ in range(p['agentes']):
+        consciente, inerte = comparar_agente_vs_materia_inerte(steps=p['passos'])
+        passos += len(consciente) - 1 + len(inerte) - 1
+    return passos
+
+
+def _simular_galaxia(com_agente: bool) -> Callable[[Dict], int]:
+    def benchmark(p: Dict) -> int:
+        galaxia = GalaxiaConsciente(num_estrelas=p['estrelas'], semente=SEMENTE)
+        if com_agente:
+            # O agente pode escapar antes de p['passos']
+            galaxia.adicionar_agente_consciente()
+        galaxia.simular_galaxia(passos=p['passos'])
+        return galaxia.passo_atual * (p['estrelas'] + com_agente)
+    return benchmark
+
+
+BENCHMARKS: Dict[str, Callable[[Dict], int]] = {
+    'queda_entropica': _queda_entropica,
+    'simular_orbita_newton': _simular_orbita('newton'),
+    'simular_orbita_verlinde': _simular_orbita('verlinde'),
+    'curva_rotacao': _curva_rotacao,
+    'agente_simular_orbita': _agente_simular_orbita,
+    'comparar_agente_inerte': _comparar_agente_inerte,
+    'simular_galaxia': _simular_galaxia(com_agente=False),
+    'simular_galaxia_agente': _simular_galaxia(com_agente=True),
+}
+
+
+def _executar(funcao: Callable[[Dict], int], parametros: Dict) -> int:
+    """Executa um benchmark com semente fixa e saída silenciada."""
+    np.random.seed(SEMENTE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return funcao(parametros)
+
+
+def executar_benchmarks(parametros: Optional[Dict] = None,
+                        nomes: Optional[List[str]] = None,
+                        repeticoes: int = 3) -> Dict:
+    """
+    Executa os benchmarks.
+
+    O tempo é o menor de repeticoes execuções; o pico de memória vem de
+    uma execução à parte sob tracemalloc (que deixaria a medida de tempo
+    mais lenta).
+
+    Parameters:
+    -----------
+    parametros : dict, optional
+        'passos', 'caminhantes', 'estrelas' e 'agentes' (padrão:
+        PARAMETROS_PADRAO)
+    nomes : list, optional
+        Benchmarks a executar (padrão: todos)
+    repeticoes : int
+        Execuções cronometradas por benchmark
+
+    Returns:
+    --------
+    dict
+        Referência no formato do arquivo JSON: 'versao', 'ambiente',
+        'parametros' e 'resultados' (por benchmark: 'tempo_s',
+        'trabalho', 'vazao' e 'pico_memoria_bytes')
+    """
+    parametros = dict(PARAMETROS_PADRAO, **(parametros or {}))
+    nomes = list(BENCHMARKS) if nomes is None else nomes
+    desconhecidos = set(nomes) - set(BENCHMARKS)
+    if desconhecidos:
+        raise ValueError(f"Benchmarks desconhecidos: {sorted(desconhecidos)}")
+
+    resultados = {}
+    for nome in nomes:
+        funcao = BENCHMARKS[nome]
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            trabalho = _executar(funcao, parametros)
+            tempos.append(time.perf_counter() - inicio)
+
+        tracemalloc.start()
+        try:
+            _executar(funcao, parametros)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        tempo = min(tempos)
+        resultados[nome] = {
+            'tempo_s': tempo,
+            'trabalho': trabalho,
+            'vazao': trabalho / tempo if tempo > 0 else float('inf'),
+            'pico_memoria_bytes': pico,
+        }
+
+    return {
+        'versao': VERSAO_FORMATO,
+        'ambiente': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'processador': platform.processor() or platform.machine(),
+            'nucleos': os.cpu_count(),
+        },
+        'parametros': parametros,
+        'resultados': resultados,
+    }
+
+
+def comparar(atual: Dict, referencia: Dict,
+             tolerancia: float = 0.2,
+             tolerancia_memoria: float = 0.5) -> List[Dict]:
+    """
+    Compara uma execução com a referência.
+
+    Parameters:
+    -----------
+    atual, referencia : dict
+        Resultados de executar_benchmarks (ou lidos do JSON)
+    tolerancia : float
+        Aumento relativo de tempo admitido (0.2 = 20% mais lento)
+    tolerancia_memoria : float
+        Aumento relativo de pico de memória admitido
+
+    Returns:
+    --------
+    list
+        Um dict por benchmark comum: 'nome', 'razao_tempo',
+        'razao_memoria' e 'regressao'
+    """
+    if atual['parametros'] != referencia['parametros']:
+        raise ValueError("Parâmetros diferentes dos da referência: "
+                         f"{atual['parametros']} != {referencia['parametros']}")
+
+    comparacoes = []
+    for nome, resultado in atual['resultados'].items():
+        base = referencia['resultados'].get(nome)
+        if base is None:
+            continue
+        razao_tempo = resultado['tempo_s'] / base['tempo_s']
+        razao_memoria = (resultado['pico_memoria_bytes'] / base['pico_memoria_bytes']
+                         if base['pico_memoria_bytes'] else 1.0)
+        comparacoes.append({
+            'nome': nome,
+            'razao_tempo': razao_tempo,
+            'razao_memoria': razao_memoria,
+            'regressao': (razao_tempo > 1.0 + tolerancia
+                          or razao_memoria > 1.0 + tolerancia_memoria),
+        })
+    return comparacoes
+
+
+def _imprimir_resultados(resultados: Dict) -> None:
+    print(f"{'benchmark':<26}{'tempo (s)':>12}{'vazão (/s)':>16}{'pico (MiB)':>13}")
+    for nome, r in resultados['resultados'].items():
+        print(f"{nome:<26}{r['tempo_s']:>12.4f}{r['vazao']:>16.4g}"
+              f"{r['pico_memoria_bytes'] / 2**20:>13.2f}")
+
+
+def _imprimir_comparacoes(comparacoes: List[Dict]) -> None:
+    print(f"\n{'benchmark':<26}{'tempo':>10}{'memória':>10}")
+    for c in comparacoes:
+        marca = '  REGRESSÃO' if c['regressao'] else ''
+        print(f"{c['nome']:<26}{c['razao_tempo']:>9.2f}x{c['razao_memoria']:>9.2f}x{marca}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--escala', type=float, default=1.0,
+                        help='multiplica todos os parâmetros de escala')
+    for nome in PARAMETROS_PADRAO:
+        parser.add_argument(f'--{nome}', type=int, help=f'{nome} (padrão: escalado)')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--filtro', nargs='+', choices=list(BENCHMARKS),
+                        help='benchmarks a executar')
+    parser.add_argument('--salvar', help='grava os resultados como referência JSON')
+    parser.add_argument('--comparar', help='compara com uma referência JSON')
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help='aumento de tempo admitido na comparação (0.2 = 20%%)')
+    parser.add_argument('--tolerancia-memoria', type=float, default=0.5,
+                        help='aumento de pico de memória admitido na comparação')
+    args = parser.parse_args(argv)
+
+    parametros = {}
+    for nome, valor in PARAMETROS_PADRAO.items():
+        escolhido = getattr(args, nome)
+        parametros[nome] = escolhido if escolhido is not None else max(1, int(valor * args.escala))
+
+    referencia = None
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            referencia = json.load(arquivo)
+        if referencia.get('versao') != VERSAO_FORMATO:
+            raise SystemExit(f"Formato de referência não suportado: {referencia.get('versao')}")
+
+    resultados = executar_benchmarks(parametros, args.filtro, args.repeticoes)
+    _imprimir_resultados(resultados)
+
+    if args.salvar:
+        with open(args.salvar, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+        print(f"\nReferência salva em {args.salvar}")
+
+    if referencia is not None:
+        comparacoes = comparar(resultados, referencia, args.tolerancia, args.tolerancia_memoria)
+        _imprimir_comparacoes(comparacoes)
+        if any(c['regressao'] for c in comparacoes):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
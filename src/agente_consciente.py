@@ -9,42 +9,122 @@ Teoria: A consciência é a injeção de ordem que resiste à queda entrópica.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+from src.aleatorio import ProvedorAleatorio, obter_provedor
+from src.graficos import DPI_PADRAO, linha_lod, mostrar, pyplot
+from src.precisao import obter_dtype
+from src.piramide_trajetorias import obter_piramide
+
+# Desfechos da comparação em lote
+DESFECHO_ATIVO = 0       # Ainda em movimento ao fim da simulação
+DESFECHO_ABSORVIDO = 1   # Caiu no buraco negro entrópico (r < RAIO_ABSORCAO)
+DESFECHO_ESCAPOU = 2     # Escapou (r > RAIO_ESCAPE)
+
+RAIO_ABSORCAO = 1.0
+RAIO_ESCAPE = 100.0
+
+# Eixo do disco galáctico (estados 3D)
+EIXO_DISCO = np.array([0.0, 0.0, 1.0])
+
+def densidade_entropica_vetorizada(posicoes: np.ndarray) -> np.ndarray:
+    """
+    Densidade entrópica (ver AgenteConsciente.densidade_entropica) avaliada
+    em um conjunto arbitrário de pontos.
+
+    Parameters:
+    -----------
+    posicoes : np.ndarray
+        Pontos de shape (..., d)
+
+    Returns:
+    --------
+    np.ndarray
+        Densidade entrópica de shape (...)
+    """
+    posicoes = np.asarray(posicoes, dtype=float)
+    r2 = np.einsum('...i,...i->...', posicoes, posicoes)
+    with np.errstate(divide='ignore'):
+        return np.where(r2 < 1.0, 1000.0, 1.0 / r2)
+
+def direcao_tangencial(posicoes: np.ndarray, velocidades: np.ndarray) -> np.ndarray:
+    """
+    Direção tangencial (não normalizada) no plano da órbita, em 2D ou 3D.
+
+    Em 2D é a velocidade girada de 90°, [-v_y, v_x]. Em 3D é n × v, com n
+    o eixo do momento angular r × v orientado para +z (o eixo do disco, z,
+    se o momento angular for nulo); no plano xy coincide com o caso 2D.
+
+    Parameters:
+    -----------
+    posicoes, velocidades : np.ndarray
+        Estado de shape (..., d), d = 2 ou 3
+
+    Returns:
+    --------
+    np.ndarray
+        Direção tangencial de shape (..., d)
+    """
+    velocidades = np.asarray(velocidades, dtype=float)
+    if velocidades.shape[-1] == 2:
+        return np.stack([-velocidades[..., 1], velocidades[..., 0]], axis=-1)
+    eixo = np.cross(posicoes, velocidades)
+    eixo *= np.where(eixo[..., 2:] < 0.0, -1.0, 1.0)
+    norma = np.sqrt(np.einsum('...i,...i->...', eixo, eixo))[..., None]
+    eixo = np.where(norma > 0.0, eixo / np.where(norma > 0.0, norma, 1.0), EIXO_DISCO)
+    return np.cross(eixo, velocidades)
 
 class AgenteConsciente:
     """
     Agente consciente que modela consciência como redução de entropia local.
 
     Atributos:
-    - posicao: Tupla (x, y) da posição atual
-    - velocidade: Tupla (vx, vy) da velocidade atual
+    - posicao: Posição atual, (x, y) ou (x, y, z)
+    - velocidade: Velocidade atual, (vx, vy) ou (vx, vy, vz)
     - horizonte_previsao: Número de passos para prever futuro
     - forca_consciente: Intensidade da força anti-gravidade
+    - temperatura: Agitação térmica das decisões
+    - campo_entropico: Grade pré-calculada do campo (opcional, ver campo_entropico)
+    - aleatorio: Fonte do ruído térmico (ProvedorAleatorio)
     """
 
     def __init__(self, posicao_inicial: Tuple[float, float] = (10.0, 0.0),
                  velocidade_inicial: Tuple[float, float] = (0.0, 1.0),
                  horizonte_previsao: int = 5,
-                 forca_consciente: float = 0.1):
+                 forca_consciente: float = 0.1,
+                 temperatura: float = 0.1,
+                 aleatorio: Optional[ProvedorAleatorio] = None,
+                 precisao: Optional[str] = None):
         """
         Inicializa o agente consciente.
 
         Parameters:
         -----------
         posicao_inicial : tuple
-            Posição inicial (x, y)
+            Posição inicial (x, y) ou (x, y, z); a dimensão do estado
+            segue a da posição
         velocidade_inicial : tuple
-            Velocidade inicial (vx, vy)
+            Velocidade inicial, na mesma dimensão
         horizonte_previsao : int
             Passos para prever entropia futura
         forca_consciente : float
             Intensidade da força consciente
+        temperatura : float
+            Agitação térmica usada nas decisões de movimento
+        aleatorio : ProvedorAleatorio, optional
+            Fonte do ruído térmico (padrão: um provedor com semente tirada
+            de np.random, ver aleatorio)
+        precisao : str, optional
+            'float64' ou 'float32' para posição e velocidade (padrão: a
+            precisão padrão, ver precisao)
         """
-        self.posicao = np.array(posicao_inicial, dtype=float)
-        self.velocidade = np.array(velocidade_inicial, dtype=float)
+        dtype = obter_dtype(precisao)
+        self.posicao = np.array(posicao_inicial, dtype=dtype)
+        self.velocidade = np.array(velocidade_inicial, dtype=dtype)
         self.horizonte_previsao = horizonte_previsao
         self.forca_consciente = forca_consciente
+        self.temperatura = temperatura
+        self.campo_entropico = None
+        self.aleatorio = obter_provedor(aleatorio)
         self.trajetoria: List[Tuple[float, float]] = [tuple(self.posicao)]
 
     def densidade_entropica(self, posicao: np.ndarray) -> float:
@@ -62,6 +142,9 @@ class AgenteConsciente:
         float
             Densidade entrópica (maior = mais atraente)
         """
+        if self.campo_entropico is not None:
+            return float(self.campo_entropico.avaliar(posicao))
+
         distancia = np.linalg.norm(posicao)
         if distancia < 1.0:
             return 1000.0  # Centro muito atrativo
@@ -120,12 +203,12 @@ class AgenteConsciente:
             forca_anti_grav = vetor_radial * self.forca_consciente
         else:
             # Manter órbita: força tangencial
-            velocidade_tangencial = np.array([-self.velocidade[1], self.velocidade[0]])
+            velocidade_tangencial = direcao_tangencial(self.posicao, self.velocidade)
             velocidade_tangencial = velocidade_tangencial / np.linalg.norm(velocidade_tangencial)
             forca_anti_grav = velocidade_tangencial * self.forca_consciente * 0.5
 
         # Adicionar ruído térmico
-        ruido = np.random.normal(0, temperatura, 2)
+        ruido = self.aleatorio.normal(temperatura, self.posicao.shape)
         forca_total = forca_anti_grav + ruido
 
         return forca_total
@@ -140,7 +223,7 @@ class AgenteConsciente:
             Passo de tempo
         """
         # Calcular força consciente
-        aceleracao = self.decidir_movimento_consciente()
+        aceleracao = self.decidir_movimento_consciente(self.temperatura)
 
         # Atualizar velocidade
         self.velocidade += aceleracao * dt
@@ -151,7 +234,8 @@ class AgenteConsciente:
         # Registrar trajetória
         self.trajetoria.append(tuple(self.posicao))
 
-    def simular_orbita(self, steps: int = 1000, dt: float = 0.1) -> List[Tuple[float, float]]:
+    def simular_orbita(self, steps: int = 1000, dt: float = 0.1,
+                       integrador=None) -> List[Tuple[float, float]]:
         """
         Simula a órbita do agente consciente.
 
@@ -161,12 +245,27 @@ class AgenteConsciente:
             Número de passos da simulação
         dt : float
             Passo de tempo
+        integrador : IntegradorAdaptativo, optional
+            Se fornecido, integra o mesmo tempo total (steps * dt) com passo
+            adaptativo, registrando um ponto por passo aceito
 
         Returns:
         --------
         list
             Trajetória completa (x, y)
         """
+        if integrador is not None:
+            tempo_total = steps * dt
+            restante = tempo_total
+            while restante > tempo_total * 1e-12:
+                restante -= integrador.passo(self, dt_limite=restante)
+                self.trajetoria.append(tuple(self.posicao))
+
+                if np.linalg.norm(self.posicao) > 100.0:
+                    break
+
+            return self.trajetoria
+
         for _ in range(steps):
             self.atualizar_fisica(dt)
 
@@ -178,7 +277,8 @@ class AgenteConsciente:
 
 def comparar_agente_vs_materia_inerte(posicao_inicial: Tuple[float, float] = (10.0, 0.0),
                                      velocidade_inicial: Tuple[float, float] = (0.0, 1.0),
-                                     steps: int = 500):
+                                     steps: int = 500,
+                                     aleatorio: Optional[ProvedorAleatorio] = None):
     """
     Compara trajetória de agente consciente vs matéria inerte.
 
@@ -190,24 +290,29 @@ def comparar_agente_vs_materia_inerte(posicao_inicial: Tuple[float, float] = (10
         Velocidade inicial
     steps : int
         Passos da simulação
+    aleatorio : ProvedorAleatorio, optional
+        Fonte do ruído do agente e da matéria inerte (padrão: um provedor
+        com semente tirada de np.random)
 
     Returns:
     --------
     tuple
         (trajetoria_consciente, trajetoria_inerte)
     """
+    aleatorio = obter_provedor(aleatorio)
+
     # Agente consciente
-    agente = AgenteConsciente(posicao_inicial, velocidade_inicial)
+    agente = AgenteConsciente(posicao_inicial, velocidade_inicial, aleatorio=aleatorio)
     traj_consciente = agente.simular_orbita(steps)
 
-    # Matéria inerte (queda entrópica simples em 2D)
+    # Matéria inerte (queda entrópica simples, na dimensão do estado)
     pos_inerte = np.array(posicao_inicial, dtype=float)
     vel_inerte = np.array(velocidade_inicial, dtype=float)
     traj_inerte = [tuple(pos_inerte)]
 
     for _ in range(steps):
         # Movimento aleatório + atração entrópica
-        ruido = np.random.normal(0, 0.1, 2)
+        ruido = aleatorio.normal(0.1, pos_inerte.shape)
         vetor_radial = -pos_inerte / np.linalg.norm(pos_inerte)
         atracao = vetor_radial * 0.05  # Força gravitacional simples
 
@@ -220,12 +325,207 @@ def comparar_agente_vs_materia_inerte(posicao_inicial: Tuple[float, float] = (10
 
     return traj_consciente, traj_inerte
 
+def comparar_agente_vs_materia_inerte_lote(posicoes_iniciais: np.ndarray,
+                                          velocidades_iniciais: np.ndarray,
+                                          steps: int = 500,
+                                          dt: float = 0.1,
+                                          horizonte_previsao: int = 5,
+                                          forca_consciente: float = 0.1,
+                                          temperatura: float = 0.1,
+                                          precisao: Optional[str] = None,
+                                          aleatorio: Optional[ProvedorAleatorio] = None
+                                          ) -> Dict[str, np.ndarray]:
+    """
+    Compara M agentes conscientes com M partículas inertes em lote.
+
+    Integra as 2M partículas juntas em arrays (N, d), aplicando a mesma
+    física de AgenteConsciente.atualizar_fisica e da matéria inerte de
+    comparar_agente_vs_materia_inerte. Partículas absorvidas (r < 1) ou
+    que escaparam (r > 100) são congeladas por máscara.
+
+    Parameters:
+    -----------
+    posicoes_iniciais : np.ndarray
+        Posições iniciais, shape (M, d), d = 2 ou 3
+    velocidades_iniciais : np.ndarray
+        Velocidades iniciais, shape (M, d)
+    steps : int
+        Passos da simulação
+    dt : float
+        Passo de tempo dos agentes conscientes
+    horizonte_previsao : int
+        Passos para prever entropia futura
+    forca_consciente : float
+        Intensidade da força consciente
+    temperatura : float
+        Agitação térmica das decisões conscientes
+    precisao : str, optional
+        'float64' ou 'float32' para o estado das 2M partículas (padrão:
+        a precisão padrão, ver precisao)
+    aleatorio : ProvedorAleatorio, optional
+        Fonte do ruído dos agentes e da matéria inerte (padrão: um provedor
+        com semente tirada de np.random)
+
+    Returns:
+    --------
+    dict
+        Arrays de shape (M,): 'raio_final_consciente', 'tempo_vida_consciente',
+        'desfecho_consciente' e os equivalentes '_inerte'
+    """
+    dimensao = np.shape(posicoes_iniciais)[-1]
+    dtype = obter_dtype(precisao)
+    aleatorio = obter_provedor(aleatorio)
+    pos_c = np.array(posicoes_iniciais, dtype=dtype).reshape(-1, dimensao)
+    vel_c = np.array(velocidades_iniciais, dtype=dtype).reshape(-1, dimensao)
+    m = len(pos_c)
+
+    # Estado conjunto: linhas [0, m) conscientes, [m, 2m) inertes
+    posicao = np.concatenate([pos_c, pos_c])
+    velocidade = np.concatenate([vel_c, vel_c])
+    consciente = slice(0, m)
+    inerte = slice(m, 2 * m)
+
+    ativo = np.ones(2 * m, dtype=bool)
+    tempo_vida = np.full(2 * m, steps, dtype=np.int64)
+    desfecho = np.full(2 * m, DESFECHO_ATIVO, dtype=np.int8)
+
+    escala_ruido = np.empty((2 * m, 1), dtype=dtype)
+    escala_ruido[consciente] = temperatura
+    escala_ruido[inerte] = 0.1
+
+    delta_v = np.empty_like(velocidade)
+    passo_tempo = np.empty((2 * m, 1), dtype=dtype)
+    passo_tempo[consciente] = dt
+    passo_tempo[inerte] = 1.0  # A matéria inerte soma a aceleração sem dt
+
+    for passo in range(1, steps + 1):
+        r = np.sqrt(np.einsum('ij,ij->i', posicao, posicao))
+        vetor_radial = -posicao / r[:, None]
+        ruido = aleatorio.normal(1.0, posicao.shape).astype(dtype, copy=False)
+        ruido *= escala_ruido
+
+        # Decisão consciente vetorizada (ver decidir_movimento_consciente)
+        pos_futura = posicao[consciente] + velocidade[consciente] * horizonte_previsao
+        r_futuro2 = np.einsum('ij,ij->i', pos_futura, pos_futura)
+        r_c = r[consciente]
+        entropia_atual = np.where(r_c < 1.0, 1000.0, 1.0 / r_c ** 2)
+        entropia_futura = np.where(r_futuro2 < 1.0, 1000.0, 1.0 / r_futuro2)
+
+        tangencial = direcao_tangencial(posicao[consciente], velocidade[consciente])
+        norma_tangencial = np.linalg.norm(tangencial, axis=1)
+        norma_tangencial[norma_tangencial == 0.0] = 1.0  # Velocidade nula: sem força tangencial
+        tangencial /= norma_tangencial[:, None]
+        delta_v[consciente] = np.where((entropia_futura > entropia_atual)[:, None],
+                                       vetor_radial[consciente] * forca_consciente,
+                                       tangencial * forca_consciente * 0.5)
+
+        # Matéria inerte: atração entrópica simples
+        delta_v[inerte] = vetor_radial[inerte] * 0.05
+
+        delta_v += ruido
+        delta_v *= passo_tempo
+        delta_v[~ativo] = 0.0
+
+        velocidade += delta_v
+        posicao += velocidade * dt * ativo[:, None]
+
+        # Eventos de absorção e escape (comparação com r², sem raiz)
+        r2 = np.einsum('ij,ij->i', posicao, posicao)
+        absorvido = ativo & (r2 < RAIO_ABSORCAO ** 2)
+        escapou = ativo & (r2 > RAIO_ESCAPE ** 2)
+        encerrado = absorvido | escapou
+        if encerrado.any():
+            desfecho[absorvido] = DESFECHO_ABSORVIDO
+            desfecho[escapou] = DESFECHO_ESCAPOU
+            tempo_vida[encerrado] = passo
+            ativo &= ~encerrado
+            if not ativo.any():
+                break
+
+    raio_final = np.linalg.norm(posicao, axis=1)
+    return {
+        'raio_final_consciente': raio_final[consciente],
+        'tempo_vida_consciente': tempo_vida[consciente],
+        'desfecho_consciente': desfecho[consciente],
+        'raio_final_inerte': raio_final[inerte],
+        'tempo_vida_inerte': tempo_vida[inerte],
+        'desfecho_inerte': desfecho[inerte],
+    }
+
+def mapa_comparacao(raios: np.ndarray,
+                    velocidades_tangenciais: np.ndarray,
+                    steps: int = 500,
+                    repeticoes: int = 1,
+                    **kwargs) -> Dict[str, np.ndarray]:
+    """
+    Mapeia onde a consciência "vence" sobre uma grade de condições iniciais.
+
+    Cada célula (raio, v) parte da posição (raio, 0) com velocidade (0, v),
+    repetida `repeticoes` vezes com ruído independente.
+
+    Parameters:
+    -----------
+    raios : np.ndarray
+        Raios iniciais (eixo 0 do mapa)
+    velocidades_tangenciais : np.ndarray
+        Velocidades tangenciais iniciais (eixo 1 do mapa)
+    steps : int
+        Passos da simulação
+    repeticoes : int
+        Realizações por célula
+    **kwargs
+        Repassados a comparar_agente_vs_materia_inerte_lote
+
+    Returns:
+    --------
+    dict
+        Mapas de shape (len(raios), len(velocidades)): raios finais médios,
+        probabilidades de escape/absorção e 'vitoria_consciente' (fração de
+        realizações em que o agente termina mais longe que a matéria inerte)
+    """
+    raios = np.asarray(raios, dtype=float)
+    velocidades_tangenciais = np.asarray(velocidades_tangenciais, dtype=float)
+    grade_r, grade_v = np.meshgrid(raios, velocidades_tangenciais, indexing='ij')
+    forma = grade_r.shape + (repeticoes,)
+
+    r0 = np.repeat(grade_r.ravel(), repeticoes)
+    v0 = np.repeat(grade_v.ravel(), repeticoes)
+    posicoes = np.stack([r0, np.zeros_like(r0)], axis=1)
+    velocidades = np.stack([np.zeros_like(v0), v0], axis=1)
+
+    lote = comparar_agente_vs_materia_inerte_lote(posicoes, velocidades, steps, **kwargs)
+    em_grade = {nome: valores.reshape(forma) for nome, valores in lote.items()}
+
+    return {
+        'raios': raios,
+        'velocidades_tangenciais': velocidades_tangenciais,
+        'raio_final_consciente': em_grade['raio_final_consciente'].mean(axis=-1),
+        'raio_final_inerte': em_grade['raio_final_inerte'].mean(axis=-1),
+        'prob_escape_consciente': (em_grade['desfecho_consciente'] == DESFECHO_ESCAPOU).mean(axis=-1),
+        'prob_absorcao_consciente': (em_grade['desfecho_consciente'] == DESFECHO_ABSORVIDO).mean(axis=-1),
+        'prob_absorcao_inerte': (em_grade['desfecho_inerte'] == DESFECHO_ABSORVIDO).mean(axis=-1),
+        'vitoria_consciente': (em_grade['raio_final_consciente'] >
+                               em_grade['raio_final_inerte']).mean(axis=-1),
+    }
+
 def plotar_comparacao(traj_consciente: List[Tuple[float, float]],
                       traj_inerte: List[Tuple[float, float]],
-                      salvar: bool = True):
+                      salvar: bool = True,
+                      dpi: int = DPI_PADRAO):
     """
-    Plota comparação entre agente consciente e matéria inerte.
+    Plota comparação entre agente consciente e matéria inerte
+    (trajetórias 3D são projetadas no plano xy).
+
+    Parameters:
+    -----------
+    traj_consciente, traj_inerte : list
+        Trajetórias de comparar_agente_vs_materia_inerte
+    salvar : bool
+        Se deve salvar a figura
+    dpi : int
+        Resolução da figura salva
     """
+    plt = pyplot()
     fig, ax = plt.subplots(figsize=(10, 8))
 
     # Centro (buraco negro entrópico)
@@ -233,12 +533,12 @@ def plotar_comparacao(traj_consciente: List[Tuple[float, float]],
     ax.add_patch(centro)
 
     # Trajetória consciente
-    x_c, y_c = zip(*traj_consciente)
-    ax.plot(x_c, y_c, 'b-', linewidth=2, label='Agente Consciente (Anti-Gravidade)', alpha=0.8)
+    linha_lod(ax, obter_piramide(traj_consciente), color='b', linewidth=2,
+              label='Agente Consciente (Anti-Gravidade)', alpha=0.8)
 
     # Trajetória inerte
-    x_i, y_i = zip(*traj_inerte)
-    ax.plot(x_i, y_i, 'r-', linewidth=2, label='Matéria Inerte (Gravidade)', alpha=0.8)
+    linha_lod(ax, obter_piramide(traj_inerte), color='r', linewidth=2,
+              label='Matéria Inerte (Gravidade)', alpha=0.8)
 
     ax.set_xlabel('Posição X')
     ax.set_ylabel('Posição Y')
@@ -248,10 +548,10 @@ def plotar_comparacao(traj_consciente: List[Tuple[float, float]],
     ax.axis('equal')
 
     if salvar:
-        plt.savefig('images/comparacao_consciente_inerte.png', dpi=300, bbox_inches='tight')
+        fig.savefig('images/comparacao_consciente_inerte.png', dpi=dpi, bbox_inches='tight')
         print("Figura salva como 'images/comparacao_consciente_inerte.png'")
 
-    plt.show()
+    mostrar(fig)
 
 if __name__ == "__main__":
     # Demonstração
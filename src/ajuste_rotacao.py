@@ -0,0 +1,327 @@
+"""
+Módulo de Ajuste de Curvas de Rotação: Verlinde contra Observações
+
+Este módulo ajusta a lei de Verlinde de rotacao_galactica a curvas de
+rotação observadas, guardadas localmente em arquivos CSV/ASCII com as
+colunas (raio, velocidade, sigma). Por galáxia são ajustados:
+
+- massa: escala de massa (massa total do modelo de massa, ou a massa
+  pontual central quando nenhum perfil é dado)
+- a0: aceleração de transição (A_0 em rotacao_galactica)
+- n: nitidez da transição
+
+A transição abrupta de forca_verlinde é generalizada por
+
+    g = (a_N^n + (a0 a_N)^(n/2))^(1/n)
+
+que tende a max(a_N, sqrt(a0 a_N)) quando n -> infinito. Os parâmetros
+são ajustados em escala logarítmica com scipy.optimize.least_squares,
+usando Jacobiano analítico (ou diferenças finitas em lote), a partir do
+melhor ponto de uma pré-varredura vetorizada em grade. Várias galáxias
+são ajustadas em paralelo em um pool de processos.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy.optimize import least_squares
+
+from src.rotacao_galactica import G_NEWTON, A_0
+
+PARAMETROS = ('massa', 'a0', 'n')
+
+# Limites (em log) de cada parâmetro durante o ajuste
+LIMITES_LOG = {
+    'massa': (-np.inf, np.inf),
+    'a0': (-np.inf, np.inf),
+    'n': (np.log(0.25), np.log(64.0)),
+}
+
+
+def carregar_curva_observada(caminho: str) -> Dict[str, np.ndarray]:
+    """
+    Lê uma curva de rotação de um arquivo CSV ou ASCII local.
+
+    Linhas vazias ou iniciadas por '#' são ignoradas, assim como uma linha
+    de cabeçalho não numérica. Colunas: raio, velocidade e (opcional)
+    sigma; sem sigma, todos os pontos têm peso 1.
+
+    Parameters:
+    -----------
+    caminho : str
+        Arquivo com a curva observada
+
+    Returns:
+    --------
+    dict
+        'nome', 'raio', 'velocidade' e 'sigma'
+    """
+    linhas = []
+    with open(caminho, encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            linha = linha.split('#', 1)[0].strip()
+            if not linha:
+                continue
+            campos = linha.replace(',', ' ').replace(';', ' ').split()
+            try:
+                linhas.append([float(c) for c in campos])
+            except ValueError:
+                if linhas:
+                    raise ValueError(f"Linha não numérica em {caminho}: {linha!r}")
+                # Cabeçalho com nomes de colunas
+
+    dados = np.array(linhas, dtype=float)
+    if dados.ndim != 2 or dados.shape[1] < 2:
+        raise ValueError(f"{caminho}: esperadas colunas (raio, velocidade[, sigma])")
+
+    sigma = dados[:, 2] if dados.shape[1] > 2 else np.ones(len(dados))
+    return {
+        'nome': os.path.splitext(os.path.basename(caminho))[0],
+        'raio': dados[:, 0],
+        'velocidade': dados[:, 1],
+        'sigma': sigma,
+    }
+
+
+def _fracao_massa(raio: np.ndarray, modelo_massa=None) -> np.ndarray:
+    """Fração da massa total encerrada em cada raio (1 para massa pontual)."""
+    if modelo_massa is None:
+        return np.ones_like(raio)
+    return np.asarray(modelo_massa.massa_encerrada(raio), dtype=float) / modelo_massa.massa
+
+
+def _componentes_log(raio, log_massa, log_a0, log_n, log_fracao):
+    """Logaritmos de a_N, dos dois termos da transição e da soma."""
+    n = np.exp(log_n)
+    log_an = np.log(G_NEWTON) + log_massa + log_fracao - 2.0 * np.log(raio)
+    log_u = n * log_an
+    log_w = 0.5 * n * (log_a0 + log_an)
+    log_soma = np.logaddexp(log_u, log_w)
+    return n, log_an, log_u, log_w, log_soma
+
+
+def velocidade_verlinde_parametrica(raio: np.ndarray,
+                                    massa: float,
+                                    a0: float = A_0,
+                                    n: float = 8.0,
+                                    modelo_massa=None) -> np.ndarray:
+    """
+    Velocidade circular da lei de Verlinde com transição suave.
+
+    Os parâmetros podem ser arrays (broadcast com o raio), o que permite
+    avaliar uma grade inteira de parâmetros em uma única chamada.
+
+    Parameters:
+    -----------
+    raio : np.ndarray
+        Raios
+    massa : float or np.ndarray
+        Escala de massa
+    a0 : float or np.ndarray
+        Aceleração de transição
+    n : float or np.ndarray
+        Nitidez da transição
+    modelo_massa : PerfilMassa, optional
+        Distribuição radial da massa (padrão: massa pontual)
+
+    Returns:
+    --------
+    np.ndarray
+        Velocidades orbitais
+    """
+    raio = np.asarray(raio, dtype=float)
+    log_fracao = np.log(_fracao_massa(raio, modelo_massa))
+    n, _, _, _, log_soma = _componentes_log(raio, np.log(massa), np.log(a0),
+                                            np.log(n), log_fracao)
+    return np.exp(0.5 * (log_soma / n + np.log(raio)))
+
+
+class _ProblemaAjuste:
+    """Resíduos e Jacobiano de uma galáxia para least_squares."""
+
+    def __init__(self, curva: Dict[str, np.ndarray], modelo_massa,
+                 livres: Sequence[str], log_fixos: Dict[str, float]):
+        self.raio = curva['raio']
+        self.velocidade = curva['velocidade']
+        self.sigma = curva['sigma']
+        self.log_fracao = np.log(_fracao_massa(self.raio, modelo_massa))
+        self.livres = list(livres)
+        self.log_fixos = log_fixos
+        self.indices = [PARAMETROS.index(p) for p in self.livres]
+
+    def completar(self, x: np.ndarray) -> np.ndarray:
+        """Vetor (ln massa, ln a0, ln n) a partir dos parâmetros livres."""
+        theta = np.array([self.log_fixos.get(p, 0.0) for p in PARAMETROS])
+        theta[self.indices] = x
+        return theta
+
+    def velocidade_modelo(self, theta: np.ndarray) -> np.ndarray:
+        """theta: (..., 3) em log; retorna velocidades (..., N)."""
+        theta = np.asarray(theta)[..., None, :]
+        n, _, _, _, log_soma = _componentes_log(self.raio, theta[..., 0], theta[..., 1],
+                                                theta[..., 2], self.log_fracao)
+        return np.exp(0.5 * (log_soma / n + np.log(self.raio)))
+
+    def residuos(self, x: np.ndarray) -> np.ndarray:
+        return (self.velocidade_modelo(self.completar(x)) - self.velocidade) / self.sigma
+
+    def jacobiano_analitico(self, x: np.ndarray) -> np.ndarray:
+        ln_m, ln_a0, ln_n = self.completar(x)
+        n, log_an, log_u, log_w, log_soma = _componentes_log(
+            self.raio, ln_m, ln_a0, ln_n, self.log_fracao)
+        log_g = log_soma / n
+        v = np.exp(0.5 * (log_g + np.log(self.raio)))
+
+        pu = np.exp(log_u - log_soma)
+        pw = np.exp(log_w - log_soma)
+        derivadas_log_g = np.stack([
+            pu + 0.5 * pw,                                          # d ln g / d ln massa
+            0.5 * pw,                                               # d ln g / d ln a0
+            -log_g + pu * log_an + 0.5 * pw * (ln_a0 + log_an),     # d ln g / d ln n
+        ], axis=1)
+        jac = 0.5 * (v / self.sigma)[:, None] * derivadas_log_g
+        return jac[:, self.indices]
+
+    def jacobiano_diferencas(self, x: np.ndarray, passo: float = 1e-6) -> np.ndarray:
+        """Diferenças finitas avaliadas em lote (todas as perturbações juntas)."""
+        pontos = np.vstack([x, x + passo * np.eye(len(x))])
+        thetas = np.stack([self.completar(p) for p in pontos])
+        v = self.velocidade_modelo(thetas)
+        return ((v[1:] - v[0]) / passo / self.sigma).T
+
+
+def _grade_padrao(curva: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Grade de pré-varredura centrada na massa dinâmica da curva."""
+    massa_dinamica = np.max(curva['velocidade'] ** 2 * curva['raio']) / G_NEWTON
+    return {
+        'massa': massa_dinamica * np.logspace(-2.0, 0.5, 26),
+        'a0': A_0 * np.logspace(-2.0, 2.0, 21),
+        'n': np.array([1.0, 2.0, 4.0, 8.0]),
+    }
+
+
+def ajustar_curva(curva: Dict[str, np.ndarray],
+                  modelo_massa=None,
+                  livres: Sequence[str] = PARAMETROS,
+                  fixos: Optional[Dict[str, float]] = None,
+                  grade: Optional[Dict[str, np.ndarray]] = None,
+                  jacobiano: str = 'analitico') -> Dict:
+    """
+    Ajusta a lei de Verlinde a uma curva de rotação.
+
+    Parameters:
+    -----------
+    curva : dict
+        Curva observada (ver carregar_curva_observada)
+    modelo_massa : PerfilMassa, optional
+        Distribuição radial da massa visível (padrão: massa pontual)
+    livres : sequence
+        Parâmetros ajustados, subconjunto de ('massa', 'a0', 'n')
+    fixos : dict, optional
+        Valores dos parâmetros não ajustados (padrão: a0=A_0, n=8)
+    grade : dict, optional
+        Valores de pré-varredura por parâmetro livre (padrão: automática)
+    jacobiano : str
+        'analitico' ou 'diferencas' (diferenças finitas em lote)
+
+    Returns:
+    --------
+    dict
+        Parâmetros ajustados, incertezas (1σ, em escala relativa),
+        chi2, chi2_reduzido, sucesso, avaliacoes e tempo (s)
+    """
+    inicio = time.perf_counter()
+    livres = list(livres)
+    desconhecidos = set(livres) - set(PARAMETROS)
+    if desconhecidos or not livres:
+        raise ValueError(f"Parâmetros livres devem ser um subconjunto de {PARAMETROS}")
+
+    valores_fixos = {'massa': 1.0, 'a0': A_0, 'n': 8.0}
+    valores_fixos.update(fixos or {})
+    log_fixos = {p: np.log(v) for p, v in valores_fixos.items()}
+    problema = _ProblemaAjuste(curva, modelo_massa, livres, log_fixos)
+
+    # Pré-varredura vetorizada: chi² de todos os pontos da grade de uma vez
+    grade = dict(_grade_padrao(curva), **(grade or {}))
+    eixos = [np.log(grade[p]) for p in livres]
+    candidatos = np.stack(np.meshgrid(*eixos, indexing='ij'), axis=-1).reshape(-1, len(livres))
+    thetas = np.tile([log_fixos[p] for p in PARAMETROS], (len(candidatos), 1))
+    thetas[:, problema.indices] = candidatos
+    chi2_grade = np.sum(((problema.velocidade_modelo(thetas) - problema.velocidade)
+                         / problema.sigma) ** 2, axis=1)
+    x0 = candidatos[np.nanargmin(chi2_grade)]
+
+    if jacobiano == 'analitico':
+        jac = problema.jacobiano_analitico
+    elif jacobiano == 'diferencas':
+        jac = problema.jacobiano_diferencas
+    else:
+        raise ValueError("jacobiano deve ser 'analitico' ou 'diferencas'")
+
+    limites = ([LIMITES_LOG[p][0] for p in livres], [LIMITES_LOG[p][1] for p in livres])
+    x0 = np.clip(x0, *limites)
+    solucao = least_squares(problema.residuos, x0, jac=jac, bounds=limites,
+                            method='trf', x_scale='jac')
+
+    graus_liberdade = max(len(problema.raio) - len(livres), 1)
+    chi2 = float(2.0 * solucao.cost)
+    try:
+        covariancia = np.linalg.inv(solucao.jac.T @ solucao.jac) * chi2 / graus_liberdade
+        erros = np.sqrt(np.diag(covariancia))
+    except np.linalg.LinAlgError:
+        erros = np.full(len(livres), np.nan)
+
+    theta = problema.completar(solucao.x)
+    resultado = {'nome': curva.get('nome', '')}
+    resultado.update({p: float(np.exp(theta[i])) for i, p in enumerate(PARAMETROS)})
+    resultado.update({
+        'livres': livres,
+        'erros_relativos': {p: float(e) for p, e in zip(livres, erros)},
+        'chi2': chi2,
+        'chi2_reduzido': chi2 / graus_liberdade,
+        'sucesso': bool(solucao.success),
+        'avaliacoes': int(solucao.nfev),
+        'tempo': time.perf_counter() - inicio,
+    })
+    return resultado
+
+
+def _ajustar_arquivo(tarefa: tuple) -> Dict:
+    """Carrega e ajusta uma galáxia (função de topo, serializável para o pool)."""
+    caminho, kwargs = tarefa
+    resultado = ajustar_curva(carregar_curva_observada(caminho), **kwargs)
+    resultado['arquivo'] = caminho
+    return resultado
+
+
+def ajustar_galaxias(caminhos: Sequence[str],
+                     workers: Optional[int] = None,
+                     **kwargs) -> List[Dict]:
+    """
+    Ajusta várias galáxias em paralelo, uma por arquivo.
+
+    Parameters:
+    -----------
+    caminhos : sequence
+        Arquivos CSV/ASCII com as curvas observadas
+    workers : int, optional
+        Número de processos (padrão: todos os núcleos; 1 = execução serial)
+    **kwargs
+        Repassados a ajustar_curva (modelo_massa, livres, fixos, ...)
+
+    Returns:
+    --------
+    list
+        Resultado de cada ajuste, na ordem dos arquivos
+    """
+    tarefas = [(caminho, kwargs) for caminho in caminhos]
+    if workers == 1 or len(tarefas) <= 1:
+        return [_ajustar_arquivo(t) for t in tarefas]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Lotes grandes amortizam o custo de comunicação de ajustes curtos
+        lote = max(1, len(tarefas) // (4 * (workers or os.cpu_count() or 1)))
+        return list(pool.map(_ajustar_arquivo, tarefas, chunksize=lote))
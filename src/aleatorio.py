@@ -0,0 +1,144 @@
+"""
+Módulo Aleatório: Números Aleatórios em Blocos
+
+Os laços passo a passo sorteiam poucos números por vez
+(np.random.choice([-1, 1]), np.random.rand(), np.random.normal(0, σ, 2)),
+e o custo de cada chamada ao gerador global é muitas vezes maior que o
+da aritmética do passo. ProvedorAleatorio sorteia blocos grandes com um
+np.random.Generator e entrega os valores por um cursor, sorteando o
+próximo bloco quando o atual acaba.
+
+Cada distribuição tem o seu próprio fluxo (filhos de uma SeedSequence),
+e blocos consecutivos de um fluxo continuam a mesma sequência: com a
+mesma semente, os valores entregues não dependem do tamanho do bloco
+nem da ordem em que as distribuições são pedidas.
+
+obter_provedor é o padrão dos simuladores: sem provedor explícito, cria
+um com semente tirada do gerador global, de modo que np.random.seed
+continua reproduzindo as execuções.
+"""
+
+import math
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+# Valores sorteados de cada vez, por distribuição
+TAMANHO_BLOCO = 4096
+
+Forma = Union[int, Tuple[int, ...]]
+
+
+class ProvedorAleatorio:
+    """
+    Fonte de números aleatórios sorteados em blocos.
+
+    Atributos:
+    - semente: Semente (SeedSequence) dos fluxos
+    - tamanho_bloco: Valores sorteados por bloco
+    """
+
+    def __init__(self, semente=None, tamanho_bloco: int = TAMANHO_BLOCO):
+        """
+        Parameters:
+        -----------
+        semente : int or np.random.SeedSequence, optional
+            Semente dos fluxos (None: entropia do sistema)
+        tamanho_bloco : int
+            Valores sorteados de cada vez, por distribuição
+        """
+        if tamanho_bloco < 1:
+            raise ValueError("O tamanho do bloco deve ser >= 1")
+        if not isinstance(semente, np.random.SeedSequence):
+            semente = np.random.SeedSequence(semente)
+        self.semente = semente
+        self.tamanho_bloco = tamanho_bloco
+        fluxos = semente.spawn(3)
+        self._geradores = {
+            'uniforme': np.random.default_rng(fluxos[0]),
+            'normal': np.random.default_rng(fluxos[1]),
+            'sinal': np.random.default_rng(fluxos[2]),
+        }
+        # Escalares saem de listas (floats do Python); vetores, de arrays
+        self._uniformes: list = []
+        self._cursor_uniforme = 0
+        self._sinais: list = []
+        self._cursor_sinal = 0
+        self._normais = np.empty(0)
+        self._cursor_normal = 0
+        # Bloco já multiplicado pelo último desvio (multiplicar fatias de
+        # dois valores custa mais que o sorteio)
+        self._desvio = 1.0
+        self._escalados = self._normais
+
+    def uniforme(self) -> float:
+        """Um valor uniforme em [0, 1) (como np.random.rand())."""
+        i = self._cursor_uniforme
+        if i == len(self._uniformes):
+            self._uniformes = self._geradores['uniforme'].random(self.tamanho_bloco).tolist()
+            i = 0
+        self._cursor_uniforme = i + 1
+        return self._uniformes[i]
+
+    def sinal(self) -> float:
+        """-1.0 ou 1.0 com igual probabilidade (como np.random.choice([-1, 1]))."""
+        i = self._cursor_sinal
+        if i == len(self._sinais):
+            sorteio = self._geradores['sinal'].random(self.tamanho_bloco)
+            self._sinais = np.where(sorteio < 0.5, -1.0, 1.0).tolist()
+            i = 0
+        self._cursor_sinal = i + 1
+        return self._sinais[i]
+
+    def normal(self, desvio: float = 1.0, forma: Forma = 2) -> np.ndarray:
+        """
+        Valores normais de média zero (como np.random.normal(0, desvio, forma)).
+
+        Parameters:
+        -----------
+        desvio : float
+            Desvio padrão
+        forma : int or tuple
+            Forma do resultado
+
+        Returns:
+        --------
+        np.ndarray
+            Novo array com a forma pedida
+        """
+        if isinstance(forma, int):
+            forma = (forma,)
+        quantidade = math.prod(forma)
+        i = self._cursor_normal
+        if i + quantidade > len(self._normais):
+            # O que restou do bloco é mantido à frente do novo bloco
+            novos = max(self.tamanho_bloco, quantidade)
+            self._normais = np.concatenate([self._normais[i:],
+                                            self._geradores['normal'].standard_normal(novos)])
+            self._escalados = self._normais * self._desvio
+            i = 0
+        if desvio != self._desvio:
+            self._desvio = desvio
+            self._escalados = self._normais * desvio
+        self._cursor_normal = i + quantidade
+        valores = self._escalados[i:i + quantidade].copy()
+        return valores if len(forma) == 1 else valores.reshape(forma)
+
+
+def obter_provedor(aleatorio: Optional[ProvedorAleatorio] = None) -> ProvedorAleatorio:
+    """
+    O provedor dado ou um novo, com semente tirada do gerador global.
+
+    Parameters:
+    -----------
+    aleatorio : ProvedorAleatorio, optional
+        Provedor a usar
+
+    Returns:
+    --------
+    ProvedorAleatorio
+        O próprio aleatorio ou um provedor reproduzível por np.random.seed
+    """
+    if aleatorio is not None:
+        return aleatorio
+    return ProvedorAleatorio(np.random.randint(2 ** 32))
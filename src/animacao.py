@@ -0,0 +1,430 @@
+"""
+Módulo de Animação: Vídeos da Galáxia em Streaming
+
+Montar uma animação com matplotlib.animation guardaria as posições de
+todas as estrelas em todos os quadros. Aqui os quadros são consumidos
+um a um, e a memória fica constante:
+
+- fontes de quadros: a própria simulação (quadros_galaxia, sobre
+  GalaxiaConsciente.iterar_passos, sem histórico), um arquivo de
+  trajetórias em disco (quadros_arquivo: .npy ou o memmap do
+  cache_estrelas) ou a comparação agente vs matéria inerte
+  (quadros_comparacao);
+- renderização com blitting (AnimadorTrajetorias): eixos, grade e
+  textos são desenhados uma vez; a cada quadro só os artistas animados
+  (scatter das estrelas, rastro e posição dos corpos, rótulo) são
+  atualizados in-place e redesenhados sobre o fundo guardado;
+- escrita incremental: cada quadro RGBA vai direto para o ffmpeg por um
+  pipe (EscritorVideo) ou para um PNG (EscritorPNG).
+
+A figura é uma matplotlib.figure.Figure com canvas Agg, sem pyplot nem
+backend interativo (o visualizador ao vivo passa a sua própria janela).
+"""
+
+import os
+import shutil
+import subprocess
+import time
+from collections import deque
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.galaxia_consciente import FATOR_ESCAPE
+from src.graficos import DPI_PADRAO
+
+# Extensões escritas pelo ffmpeg; qualquer outro destino é um diretório de PNGs
+EXTENSOES_VIDEO = ('.mp4', '.mkv', '.webm', '.avi', '.mov')
+
+# Pontos mantidos no rastro de cada corpo
+RASTRO_PADRAO = 200
+
+
+def quadros_galaxia(galaxia, passos: int, dt: float = 0.1,
+                    intervalo: int = 1,
+                    integrador_agente=None) -> Iterator[Dict]:
+    """
+    Quadros da galáxia simulada passo a passo.
+
+    O histórico das estrelas é desativado (galaxia.registrar_historico =
+    False): a memória não cresce com o número de passos.
+
+    Parameters:
+    -----------
+    galaxia : GalaxiaConsciente
+        Galáxia a simular
+    passos, dt, integrador_agente
+        Como em simular_galaxia
+    intervalo : int
+        Passos entre quadros
+
+    Returns:
+    --------
+    iterator
+        Quadros: dicts com 'passo', 'estrelas' (N, d) e 'corpos'
+        ({nome: posição})
+    """
+    galaxia.registrar_historico = False
+
+    def quadro(estrelas):
+        corpos = {}
+        if galaxia.agente_consciente is not None:
+            corpos['agente'] = galaxia.agente_consciente.posicao
+        return {'passo': galaxia.passo_atual, 'estrelas': estrelas, 'corpos': corpos}
+
+    yield quadro(galaxia.posicoes)
+    ultimo = galaxia.passo_atual
+    for estrelas in galaxia.iterar_passos(passos, dt, integrador_agente):
+        ultimo = galaxia.passo_atual
+        if ultimo % intervalo == 0:
+            yield quadro(estrelas)
+    if ultimo % intervalo:
+        yield quadro(galaxia.posicoes)
+
+
+def quadros_arquivo(posicoes, intervalo: int = 1,
+                    corpos: Optional[Dict[str, np.ndarray]] = None) -> Iterator[Dict]:
+    """
+    Quadros de um arquivo de trajetórias em disco.
+
+    Parameters:
+    -----------
+    posicoes : str or np.ndarray
+        Caminho de um .npy (T, N, d), aberto como memmap, ou um array
+        (por exemplo, o memmap de CacheCampoEstelar.obter)
+    intervalo : int
+        Passos entre quadros
+    corpos : dict, optional
+        Trajetórias (T, d) de outros corpos (por exemplo, o agente)
+
+    Returns:
+    --------
+    iterator
+        Quadros como em quadros_galaxia
+    """
+    if isinstance(posicoes, str):
+        posicoes = np.load(posicoes, mmap_mode='r')
+    corpos = {nome: np.asarray(trajetoria) for nome, trajetoria in (corpos or {}).items()}
+    for passo in range(0, len(posicoes), intervalo):
+        yield {
+            'passo': passo,
+            'estrelas': posicoes[passo],
+            'corpos': {nome: trajetoria[min(passo, len(trajetoria) - 1)]
+                       for nome, trajetoria in corpos.items()},
+        }
+
+
+def quadros_comparacao(traj_consciente: Sequence, traj_inerte: Sequence,
+                       intervalo: int = 1) -> Iterator[Dict]:
+    """
+    Quadros da comparação agente consciente vs matéria inerte.
+
+    Parameters:
+    -----------
+    traj_consciente, traj_inerte : sequence
+        Trajetórias de comparar_agente_vs_materia_inerte (a mais curta
+        fica parada no último ponto)
+    intervalo : int
+        Passos entre quadros
+
+    Returns:
+    --------
+    iterator
+        Quadros como em quadros_galaxia (sem estrelas)
+    """
+    consciente, inerte = np.asarray(traj_consciente), np.asarray(traj_inerte)
+    for passo in range(0, max(len(consciente), len(inerte)), intervalo):
+        yield {
+            'passo': passo,
+            'estrelas': None,
+            'corpos': {'consciente': consciente[min(passo, len(consciente) - 1)],
+                       'inerte': inerte[min(passo, len(inerte) - 1)]},
+        }
+
+
+class EscritorPNG:
+    """Grava cada quadro como <diretorio>/<prefixo>_00000.png."""
+
+    def __init__(self, diretorio: str, prefixo: str = 'quadro'):
+        os.makedirs(diretorio, exist_ok=True)
+        self.diretorio = diretorio
+        self.prefixo = prefixo
+        self.quadros = 0
+
+    def escrever(self, rgba: np.ndarray) -> None:
+        from PIL import Image
+
+        caminho = os.path.join(self.diretorio, f'{self.prefixo}_{self.quadros:05d}.png')
+        Image.fromarray(rgba, 'RGBA').save(caminho, compress_level=1)
+        self.quadros += 1
+
+    def fechar(self) -> None:
+        pass
+
+
+class EscritorVideo:
+    """Envia quadros RGBA brutos ao ffmpeg por um pipe."""
+
+    def __init__(self, caminho: str, largura: int, altura: int, fps: int = 30,
+                 ffmpeg: Optional[str] = None):
+        """
+        Parameters:
+        -----------
+        caminho : str
+            Arquivo de vídeo (o formato vem da extensão)
+        largura, altura : int
+            Tamanho dos quadros em pixels
+        fps : int
+            Quadros por segundo
+        ffmpeg : str, optional
+            Executável do ffmpeg (padrão: o do PATH)
+        """
+        ffmpeg = ffmpeg or shutil.which('ffmpeg')
+        if ffmpeg is None:
+            raise RuntimeError("Exportar vídeo requer o ffmpeg no PATH "
+                               "(ou use um diretório de destino para PNGs)")
+        self.caminho = caminho
+        self.quadros = 0
+        self._processo = subprocess.Popen(
+            [ffmpeg, '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{largura}x{altura}', '-r', str(fps),
+             '-i', '-',
+             # yuv420p exige dimensões pares
+             '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', caminho],
+            stdin=subprocess.PIPE)
+
+    def escrever(self, rgba: np.ndarray) -> None:
+        self._processo.stdin.write(np.ascontiguousarray(rgba).data)
+        self.quadros += 1
+
+    def fechar(self) -> None:
+        self._processo.stdin.close()
+        if self._processo.wait() != 0:
+            raise RuntimeError(f"ffmpeg terminou com código {self._processo.returncode}")
+
+
+class AnimadorTrajetorias:
+    """
+    Renderiza quadros (estrelas e corpos) com blitting sobre uma figura Agg
+    (ou sobre a janela de uma figura do pyplot).
+
+    Os artistas são criados uma vez e atualizados in-place; o fundo
+    (eixos, grade, centro) é desenhado só no primeiro quadro e após cada
+    redesenho completo (por exemplo, ao redimensionar a janela).
+    """
+
+    CORES_CORPOS = {'agente': 'red', 'consciente': 'blue', 'inerte': 'red'}
+
+    def __init__(self, raio: float, nomes_corpos: Iterable[str] = (),
+                 tamanho: Tuple[float, float] = (8.0, 8.0),
+                 dpi: int = DPI_PADRAO,
+                 rastro: int = RASTRO_PADRAO,
+                 titulo: str = '',
+                 figura=None):
+        """
+        Parameters:
+        -----------
+        raio : float
+            Os eixos cobrem [-raio, raio] em x e y (limites fixos)
+        nomes_corpos : iterable of str
+            Corpos com rastro (chaves de quadro['corpos'])
+        tamanho : tuple
+            Tamanho da figura em polegadas
+        dpi : int
+            Resolução (pixels = tamanho * dpi)
+        rastro : int
+            Pontos do rastro de cada corpo (0 desativa)
+        titulo : str
+            Título fixo dos eixos
+        figura : matplotlib.figure.Figure, optional
+            Figura com janela (pyplot) em que desenhar; renderizar então
+            atualiza a janela em vez de devolver a imagem
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self._janela = figura is not None
+        if figura is None:
+            figura = Figure(figsize=tamanho, dpi=dpi)
+            FigureCanvasAgg(figura)
+        self.figura = figura
+        self.canvas = figura.canvas
+        ax = self.figura.add_subplot()
+        ax.set_xlim(-raio, raio)
+        ax.set_ylim(-raio, raio)
+        ax.set_aspect('equal')
+        ax.grid(True, alpha=0.3)
+        ax.scatter([0], [0], color='black', s=60, marker='*')
+        if titulo:
+            ax.set_title(titulo)
+        self.ax = ax
+
+        self._estrelas = ax.scatter(np.empty(0), np.empty(0), s=2, color='tab:blue',
+                                    alpha=0.6, animated=True)
+        self._rastros = {}
+        self._marcadores = {}
+        self._historicos = {}
+        for nome in nomes_corpos:
+            cor = self.CORES_CORPOS.get(nome, 'black')
+            self._rastros[nome], = ax.plot([], [], '-', color=cor, lw=1.5, animated=True)
+            self._marcadores[nome], = ax.plot([], [], 'o', color=cor, ms=6, label=nome,
+                                              animated=True)
+            self._historicos[nome] = deque(maxlen=max(rastro, 1))
+        if self._marcadores:
+            ax.legend(handles=list(self._marcadores.values()), loc='upper right')
+        self._rotulo = ax.text(0.02, 0.97, '', transform=ax.transAxes, va='top', animated=True)
+        self._fundo = None
+        # Um redesenho completo invalida o fundo guardado
+        self.canvas.mpl_connect('draw_event', self._invalidar_fundo)
+
+    def _invalidar_fundo(self, evento) -> None:
+        self._fundo = None
+
+    @property
+    def tamanho_pixels(self) -> Tuple[int, int]:
+        """(largura, altura) dos quadros em pixels."""
+        largura, altura = self.canvas.get_width_height()
+        return largura, altura
+
+    def renderizar(self, quadro: Dict) -> Optional[np.ndarray]:
+        """
+        Desenha um quadro e devolve a imagem.
+
+        Returns:
+        --------
+        np.ndarray or None
+            RGBA (altura, largura, 4), uma view do buffer do canvas
+            (válida até o próximo quadro); None ao desenhar numa janela
+        """
+        if self._fundo is None:
+            self.canvas.draw()
+            self._fundo = self.canvas.copy_from_bbox(self.figura.bbox)
+
+        if quadro.get('estrelas') is not None:
+            self._estrelas.set_offsets(np.asarray(quadro['estrelas'])[:, :2])
+        for nome, posicao in quadro['corpos'].items():
+            if nome not in self._rastros:
+                continue
+            historico = self._historicos[nome]
+            historico.append((posicao[0], posicao[1]))
+            x, y = zip(*historico)
+            self._rastros[nome].set_data(x, y)
+            self._marcadores[nome].set_data([posicao[0]], [posicao[1]])
+        self._rotulo.set_text(f"passo {quadro['passo']}")
+
+        self.canvas.restore_region(self._fundo)
+        for artista in (self._estrelas, *self._rastros.values(),
+                        *self._marcadores.values(), self._rotulo):
+            self.ax.draw_artist(artista)
+        if self._janela:
+            self.canvas.blit(self.figura.bbox)
+            self.canvas.flush_events()
+            return None
+        return np.asarray(self.canvas.buffer_rgba())
+
+
+def exportar_animacao(quadros: Iterable[Dict], destino: str, raio: float,
+                      fps: int = 30, **opcoes) -> Dict:
+    """
+    Renderiza quadros e os grava incrementalmente.
+
+    Parameters:
+    -----------
+    quadros : iterable of dict
+        Fonte de quadros (quadros_galaxia, quadros_arquivo,
+        quadros_comparacao)
+    destino : str
+        Arquivo de vídeo (EXTENSOES_VIDEO, via ffmpeg) ou diretório de PNGs
+    raio : float
+        Meia largura da vista
+    fps : int
+        Quadros por segundo do vídeo
+    **opcoes
+        Repassadas a AnimadorTrajetorias (tamanho, dpi, rastro, titulo)
+
+    Returns:
+    --------
+    dict
+        'destino', 'quadros', 'tempo_s' e 'quadros_por_segundo'
+    """
+    quadros = iter(quadros)
+    primeiro = next(quadros, None)
+    if primeiro is None:
+        raise ValueError("Nenhum quadro para exportar")
+
+    animador = AnimadorTrajetorias(raio, primeiro['corpos'].keys(), **opcoes)
+    if destino.lower().endswith(EXTENSOES_VIDEO):
+        escritor = EscritorVideo(destino, *animador.tamanho_pixels, fps=fps)
+    else:
+        escritor = EscritorPNG(destino)
+
+    inicio = time.perf_counter()
+    try:
+        escritor.escrever(animador.renderizar(primeiro))
+        for quadro in quadros:
+            escritor.escrever(animador.renderizar(quadro))
+    finally:
+        escritor.fechar()
+    tempo = time.perf_counter() - inicio
+    return {
+        'destino': destino,
+        'quadros': escritor.quadros,
+        'tempo_s': tempo,
+        'quadros_por_segundo': escritor.quadros / tempo if tempo > 0 else float('inf'),
+    }
+
+
+def animar_galaxia(galaxia, passos: int, destino: str, dt: float = 0.1,
+                   intervalo: int = 1, fps: int = 30, **opcoes) -> Dict:
+    """
+    Simula a galáxia e exporta a animação ao mesmo tempo.
+
+    Parameters:
+    -----------
+    galaxia : GalaxiaConsciente
+        Galáxia a simular (o histórico das estrelas é desativado)
+    passos, dt : int, float
+        Como em simular_galaxia
+    destino : str
+        Arquivo de vídeo ou diretório de PNGs
+    intervalo : int
+        Passos entre quadros
+    fps : int
+        Quadros por segundo do vídeo
+    **opcoes
+        Repassadas a AnimadorTrajetorias
+
+    Returns:
+    --------
+    dict
+        Como em exportar_animacao
+    """
+    opcoes.setdefault('titulo', f'Galáxia Consciente ({galaxia.num_estrelas} estrelas)')
+    return exportar_animacao(quadros_galaxia(galaxia, passos, dt, intervalo), destino,
+                             galaxia.raio_galaxia * FATOR_ESCAPE, fps, **opcoes)
+
+
+def animar_comparacao(traj_consciente: Sequence, traj_inerte: Sequence, destino: str,
+                      intervalo: int = 1, fps: int = 30, **opcoes) -> Dict:
+    """
+    Exporta a animação da comparação agente consciente vs matéria inerte.
+
+    Parameters:
+    -----------
+    traj_consciente, traj_inerte : sequence
+        Trajetórias de comparar_agente_vs_materia_inerte
+    destino : str
+        Arquivo de vídeo ou diretório de PNGs
+    intervalo, fps, **opcoes
+        Como em animar_galaxia
+
+    Returns:
+    --------
+    dict
+        Como em exportar_animacao
+    """
+    extremos = np.abs(np.concatenate([np.asarray(traj_consciente)[:, :2].ravel(),
+                                      np.asarray(traj_inerte)[:, :2].ravel()]))
+    opcoes.setdefault('titulo', 'Agente Consciente vs Matéria Inerte')
+    return exportar_animacao(quadros_comparacao(traj_consciente, traj_inerte, intervalo),
+                             destino, 1.05 * extremos.max(), fps, **opcoes)
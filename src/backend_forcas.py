@@ -0,0 +1,326 @@
+"""
+Módulo de Backends de Força: Kernels Centrais para Grandes Arrays
+
+Avaliar forca_verlinde (raiz, divisão e desvio) para 10^6–10^7 partículas
+por passo em NumPy puro é monothread e cria vários arrays temporários.
+Este módulo define backends intercambiáveis para o kernel de força
+central usado pelas estrelas da galáxia e pela integração de órbitas:
+
+- 'numpy': NumPy com buffers de saída reutilizados entre passos
+- 'numexpr': expressão inteira avaliada em uma passada, multithread e
+  sem temporários (requer o pacote opcional numexpr)
+
+obter_backend('auto') usa numexpr quando disponível e volta ao NumPy
+caso contrário.
+
+A aceleração é escrita como fator radial f(r) aplicado à posição,
+a = f(r) * x, com
+- newtoniano (G M > A_0 r²): f = -G M / r³
+- entrópico  (G M <= A_0 r²): f = -sqrt(A_0 G M) / r²
+que é algebricamente idêntico a forca_verlinde.
+
+Integradores (ver INTEGRADORES): Euler semi-implícito, o esquema das
+estrelas da galáxia, e leapfrog (deriva-chute-deriva), simplético de
+segunda ordem com o mesmo custo de uma avaliação de força por passo.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src import rotacao_galactica
+from src.precisao import obter_dtype
+
+try:
+    import numexpr
+except ImportError:  # Dependência opcional
+    numexpr = None
+
+LEIS_SUPORTADAS = ('verlinde', 'newton')
+
+# Integrador -> método do backend que dá um passo in-place
+INTEGRADOR_PADRAO = 'euler_semi_implicito'
+INTEGRADORES = {
+    'euler_semi_implicito': 'passo_euler',
+    'leapfrog': 'passo_leapfrog',
+}
+
+
+def _constantes(massa) -> Tuple:
+    """
+    G*M e A_0 lidos no momento da chamada (permitem ajustes em tempo de execução).
+
+    massa pode ser um array (N,), com uma massa central por partícula.
+    """
+    if massa is None:
+        massa = rotacao_galactica.M_BURACO_NEGRO
+    return rotacao_galactica.G_NEWTON * massa, rotacao_galactica.A_0
+
+
+class BackendNumpy:
+    """
+    Kernel de força central em NumPy com buffers reutilizados.
+
+    Os buffers intermediários são alocados uma vez por tamanho de array e
+    reaproveitados nos passos seguintes.
+    """
+
+    nome = 'numpy'
+
+    def __init__(self):
+        self._buffers: Dict[tuple, np.ndarray] = {}
+
+    def _buffer(self, nome: str, forma: tuple, dtype) -> np.ndarray:
+        chave = (nome, forma, np.dtype(dtype))
+        buffer = self._buffers.get(chave)
+        if buffer is None:
+            buffer = self._buffers[chave] = np.empty(forma, dtype=dtype)
+        return buffer
+
+    def fator_radial(self, posicoes: np.ndarray, massa: Optional[float] = None,
+                     lei: str = 'verlinde') -> np.ndarray:
+        """
+        Calcula f(r) tal que a aceleração é f(r) * posição.
+
+        Parameters:
+        -----------
+        posicoes : np.ndarray
+            Posições, shape (N, d)
+        massa : float or np.ndarray, optional
+            Massa central, ou uma por partícula, shape (N,)
+            (padrão: M_BURACO_NEGRO)
+        lei : str
+            'verlinde' ou 'newton'
+
+        Returns:
+        --------
+        np.ndarray
+            Fator radial, shape (N,) (buffer interno reutilizado)
+        """
+        gm, a0 = _constantes(massa)
+        n = len(posicoes)
+        r2 = self._buffer('r2', (n,), posicoes.dtype)
+        fator = self._buffer('fator', (n,), posicoes.dtype)
+        auxiliar = self._buffer('auxiliar', (n,), posicoes.dtype)
+
+        np.einsum('ij,ij->i', posicoes, posicoes, out=r2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Newton: -G M / r³
+            np.sqrt(r2, out=fator)
+            np.multiply(fator, r2, out=fator)
+            np.divide(-gm, fator, out=fator)
+            if lei == 'verlinde':
+                # Regime entrópico: -sqrt(A_0 G M) / r²
+                np.divide(-np.sqrt(a0 * gm), r2, out=auxiliar)
+                np.copyto(fator, auxiliar, where=gm <= a0 * r2)
+        fator[r2 < 1e-20] = 0.0
+        return fator
+
+    def aceleracao(self, posicoes: np.ndarray, massa: Optional[float] = None,
+                   lei: str = 'verlinde', saida: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Vetores aceleração centrais, shape (N, d).
+
+        Parameters:
+        -----------
+        saida : np.ndarray, optional
+            Array de saída reutilizável (padrão: novo array)
+        """
+        fator = self.fator_radial(posicoes, massa, lei)
+        if saida is None:
+            saida = np.empty_like(posicoes)
+        np.multiply(posicoes, fator[:, None], out=saida)
+        return saida
+
+    def passo_euler(self, posicoes: np.ndarray, velocidades: np.ndarray, dt: float,
+                    massa: Optional[float] = None, lei: str = 'verlinde') -> None:
+        """
+        Passo de Euler semi-implícito in-place: v += a dt; x += v dt.
+
+        dt pode ser um array (N, 1) com um passo por partícula (0 congela).
+        """
+        aceleracao = self._buffer('aceleracao', posicoes.shape, posicoes.dtype)
+        self.aceleracao(posicoes, massa, lei, saida=aceleracao)
+        aceleracao *= dt
+        velocidades += aceleracao
+        np.multiply(velocidades, dt, out=aceleracao)
+        posicoes += aceleracao
+
+    def passo_leapfrog(self, posicoes: np.ndarray, velocidades: np.ndarray, dt: float,
+                       massa: Optional[float] = None, lei: str = 'verlinde') -> None:
+        """
+        Passo leapfrog in-place (deriva-chute-deriva):
+        x += v dt/2; v += a(x) dt; x += v dt/2.
+
+        dt pode ser um array (N, 1) com um passo por partícula (0 congela).
+        """
+        meio_dt = 0.5 * dt
+        deriva = self._buffer('deriva', posicoes.shape, posicoes.dtype)
+        np.multiply(velocidades, meio_dt, out=deriva)
+        posicoes += deriva
+        aceleracao = self._buffer('aceleracao', posicoes.shape, posicoes.dtype)
+        self.aceleracao(posicoes, massa, lei, saida=aceleracao)
+        aceleracao *= dt
+        velocidades += aceleracao
+        np.multiply(velocidades, meio_dt, out=deriva)
+        posicoes += deriva
+
+
+class BackendNumexpr(BackendNumpy):
+    """
+    Kernel de força central avaliado por numexpr: uma passada por array,
+    multithread, escrevendo diretamente nos buffers de saída.
+    """
+
+    nome = 'numexpr'
+
+    def __init__(self, threads: Optional[int] = None):
+        """
+        Parameters:
+        -----------
+        threads : int, optional
+            Número de threads do numexpr (padrão: definido pelo numexpr)
+        """
+        if numexpr is None:
+            raise ImportError("O backend 'numexpr' requer o pacote numexpr")
+        super().__init__()
+        if threads is not None:
+            numexpr.set_num_threads(threads)
+
+    @staticmethod
+    def _expressao_r2(dimensao: int) -> str:
+        return '(' + ' + '.join(f'c{k}*c{k}' for k in range(dimensao)) + ')'
+
+    def fator_radial(self, posicoes: np.ndarray, massa: Optional[float] = None,
+                     lei: str = 'verlinde') -> np.ndarray:
+        gm, a0 = _constantes(massa)
+        dimensao = posicoes.shape[1]
+        fator = self._buffer('fator', (len(posicoes),), posicoes.dtype)
+        variaveis = {f'c{k}': posicoes[:, k] for k in range(dimensao)}
+        variaveis.update(gm=gm, a0=a0, raiz_a0gm=np.sqrt(a0 * gm))
+
+        r2 = self._expressao_r2(dimensao)
+        if lei == 'verlinde':
+            forca = f'where(gm > a0*{r2}, -gm/({r2}**1.5), -raiz_a0gm/{r2})'
+        else:
+            forca = f'-gm/({r2}**1.5)'
+        expressao = f'where({r2} < 1e-20, 0.0, {forca})'
+        numexpr.evaluate(expressao, local_dict=variaveis, out=fator, casting='same_kind')
+        return fator
+
+    def aceleracao(self, posicoes: np.ndarray, massa: Optional[float] = None,
+                   lei: str = 'verlinde', saida: Optional[np.ndarray] = None) -> np.ndarray:
+        fator = self.fator_radial(posicoes, massa, lei)[:, None]
+        if saida is None:
+            saida = np.empty_like(posicoes)
+        numexpr.evaluate('p * f', local_dict={'p': posicoes, 'f': fator}, out=saida)
+        return saida
+
+    def passo_euler(self, posicoes: np.ndarray, velocidades: np.ndarray, dt: float,
+                    massa: Optional[float] = None, lei: str = 'verlinde') -> None:
+        fator = self.fator_radial(posicoes, massa, lei)[:, None]
+        variaveis = {'p': posicoes, 'v': velocidades, 'f': fator, 'dt': dt}
+        numexpr.evaluate('v + p*f*dt', local_dict=variaveis, out=velocidades,
+                         casting='same_kind')
+        numexpr.evaluate('p + v*dt', local_dict=variaveis, out=posicoes,
+                         casting='same_kind')
+
+
+def backends_disponiveis() -> Tuple[str, ...]:
+    """Nomes dos backends utilizáveis neste ambiente."""
+    return ('numpy', 'numexpr') if numexpr is not None else ('numpy',)
+
+
+def obter_backend(nome: str = 'auto', threads: Optional[int] = None) -> BackendNumpy:
+    """
+    Cria um backend de força pelo nome.
+
+    Parameters:
+    -----------
+    nome : str
+        'auto' (numexpr se disponível, senão numpy), 'numpy' ou 'numexpr'
+    threads : int, optional
+        Número de threads (apenas numexpr)
+
+    Returns:
+    --------
+    BackendNumpy
+        Backend com fator_radial, aceleracao e passo_euler
+    """
+    if nome == 'auto':
+        nome = 'numexpr' if numexpr is not None else 'numpy'
+    if nome == 'numpy':
+        return BackendNumpy()
+    if nome == 'numexpr':
+        return BackendNumexpr(threads)
+    raise ValueError(f"Backend desconhecido: {nome!r}. Use 'auto', 'numpy' ou 'numexpr'")
+
+
+def integrar_orbitas(posicoes: np.ndarray,
+                     velocidades: np.ndarray,
+                     passos: int = 1000,
+                     dt: float = 0.1,
+                     lei: str = 'verlinde',
+                     massa: Optional[float] = None,
+                     backend: Optional[BackendNumpy] = None,
+                     integrador: str = INTEGRADOR_PADRAO,
+                     diagnostico=None,
+                     monitor=None,
+                     precisao: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integra muitas órbitas independentes no campo central (vetorizado).
+
+    Por padrão usa o mesmo esquema de simular_orbita (Euler
+    semi-implícito), mas para N corpos por passo através do backend.
+
+    Parameters:
+    -----------
+    posicoes, velocidades : np.ndarray
+        Estado inicial, shape (N, d); não são modificados
+    passos : int
+        Número de passos
+    dt : float
+        Passo de tempo
+    lei : str
+        'verlinde' ou 'newton'
+    massa : float, optional
+        Massa central (padrão: M_BURACO_NEGRO)
+    backend : BackendNumpy, optional
+        Backend de força (padrão: obter_backend('auto'))
+    integrador : str
+        'euler_semi_implicito' ou 'leapfrog'
+    diagnostico : DiagnosticoConservacao, optional
+        Recebe o estado inicial e o de cada intervalo de passos (ver
+        diagnosticos); deve usar a mesma lei e massa
+    monitor : MonitorOrbital, optional
+        Recebe o estado de cada passo; a integração termina antes de
+        passos se monitor.concluido (ver monitor_orbital)
+    precisao : str, optional
+        'float64' ou 'float32' para o estado e os buffers do kernel
+        (padrão: a precisão padrão, ver precisao)
+
+    Returns:
+    --------
+    tuple
+        (posicoes_finais, velocidades_finais), na precisão do estado
+    """
+    if lei not in LEIS_SUPORTADAS:
+        raise ValueError(f"Lei deve ser uma de {LEIS_SUPORTADAS}")
+    if integrador not in INTEGRADORES:
+        raise ValueError(f"Integrador deve ser um de {tuple(INTEGRADORES)}")
+    backend = backend or obter_backend()
+    passo_integrador = getattr(backend, INTEGRADORES[integrador])
+    dtype = obter_dtype(precisao)
+    posicoes = np.array(posicoes, dtype=dtype)
+    velocidades = np.array(velocidades, dtype=dtype)
+    if diagnostico is not None:
+        diagnostico.registrar(0, 0.0, posicoes, velocidades)
+    if monitor is not None and monitor.atualizar(0.0, posicoes):
+        return posicoes, velocidades
+    for passo in range(1, passos + 1):
+        passo_integrador(posicoes, velocidades, dt, massa, lei)
+        if diagnostico is not None and diagnostico.deve_registrar(passo):
+            diagnostico.registrar(passo, passo * dt, posicoes, velocidades)
+        if monitor is not None and monitor.atualizar(passo * dt, posicoes):
+            break
+    return posicoes, velocidades
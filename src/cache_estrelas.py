@@ -0,0 +1,198 @@
+"""
+Módulo de Cache do Campo Estelar: Evolução das Estrelas Inertes em Disco
+
+As estrelas inertes de GalaxiaConsciente seguem uma lei de força central
+determinista e não interagem com o agente. Em varreduras que mudam
+apenas parâmetros do agente, reintegrar todas as estrelas a cada
+execução é trabalho repetido.
+
+Este módulo guarda a evolução completa das estrelas (posições e
+velocidades em cada passo) em arquivos .npy, com chave de conteúdo
+(semente, num_estrelas, raio_galaxia, centro_massa, dimensão, inclinação,
+dt, passos, integrador, precisão e versão do código). As execuções seguintes abrem os arquivos
+como memmap e apenas reproduzem o campo: o custo passa a ser só o do
+agente.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.backend_forcas import BackendNumpy
+from src.conjunto_ativo import ConjuntoAtivo
+from src.galaxia_consciente import (FATOR_ESCAPE, RAIO_BURACO_NEGRO,
+                                    condicoes_iniciais_estrelas)
+from src.precisao import nome_precisao
+from src.versao_codigo import VERSAO_CODIGO
+
+# Integradores de estrelas suportados (parte da chave)
+INTEGRADOR_PADRAO = 'euler_semi_implicito'
+INTEGRADORES = (INTEGRADOR_PADRAO,)
+
+# Versão do campo armazenado: a de todo o código do pacote
+VERSAO_CAMPO = VERSAO_CODIGO
+
+
+class CacheCampoEstelar:
+    """
+    Cache em disco de evoluções do campo estelar, lidas como memmap.
+
+    Cada entrada é um diretório <diretorio>/<ab>/<chave>/ com
+    posicoes.npy e velocidades.npy, ambos de shape (passos + 1, N, d), e
+    eventos.json (capturas e escapes de estrelas).
+    """
+
+    def __init__(self, diretorio: str = '.cache_estrelas'):
+        """
+        Parameters:
+        -----------
+        diretorio : str
+            Diretório raiz do cache
+        """
+        self.diretorio = diretorio
+
+    @staticmethod
+    def chave(semente: int, num_estrelas: int, raio_galaxia: float,
+              centro_massa: float, dt: float, passos: int,
+              integrador: str = INTEGRADOR_PADRAO,
+              versao: str = VERSAO_CAMPO,
+              dimensao: int = 2,
+              inclinacao_maxima: float = 0.0,
+              precisao: Optional[str] = None) -> str:
+        """
+        Calcula a chave de conteúdo de um campo estelar.
+
+        Returns:
+        --------
+        str
+            Hash SHA-256 hexadecimal
+        """
+        conteudo = json.dumps({
+            'semente': int(semente), 'num_estrelas': int(num_estrelas),
+            'raio_galaxia': float(raio_galaxia), 'centro_massa': float(centro_massa),
+            'dimensao': int(dimensao), 'inclinacao_maxima': float(inclinacao_maxima),
+            'dt': float(dt), 'passos': int(passos),
+            'integrador': integrador, 'versao': versao,
+            'precisao': nome_precisao(precisao),
+        }, sort_keys=True)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave[:2], chave)
+
+    def contem(self, chave: str) -> bool:
+        return os.path.isdir(self._caminho(chave))
+
+    def carregar(self, chave: str) -> Optional[Tuple[np.ndarray, np.ndarray, List[Dict]]]:
+        """
+        Abre um campo do cache como memmap somente leitura.
+
+        Returns:
+        --------
+        tuple or None
+            (posicoes, velocidades, eventos), com arrays de shape
+            (passos + 1, N, d), ou None se a chave não existir
+        """
+        caminho = self._caminho(chave)
+        if not os.path.isdir(caminho):
+            return None
+        with open(os.path.join(caminho, 'eventos.json'), encoding='utf-8') as arquivo:
+            eventos = json.load(arquivo)
+        for evento in eventos:
+            evento['posicao'] = np.array(evento['posicao'])
+            evento['velocidade'] = np.array(evento['velocidade'])
+        return (np.load(os.path.join(caminho, 'posicoes.npy'), mmap_mode='r'),
+                np.load(os.path.join(caminho, 'velocidades.npy'), mmap_mode='r'),
+                eventos)
+
+    def obter(self, semente: int, num_estrelas: int, raio_galaxia: float,
+              centro_massa: float, dt: float, passos: int,
+              integrador: str = INTEGRADOR_PADRAO,
+              dimensao: int = 2,
+              inclinacao_maxima: float = 0.0,
+              precisao: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, List[Dict]]:
+        """
+        Retorna o campo estelar, integrando-o apenas se não estiver em cache.
+
+        As estrelas partem de condicoes_iniciais_estrelas com a semente,
+        dimensão e inclinação dadas, exatamente como GalaxiaConsciente;
+        os arquivos ficam na precisão do estado (float32 ocupa metade).
+
+        Returns:
+        --------
+        tuple
+            (posicoes, velocidades, eventos); arrays memmap de shape
+            (passos + 1, N, d)
+        """
+        if integrador not in INTEGRADORES:
+            raise ValueError(f"Integrador deve ser um de {INTEGRADORES}")
+        chave = self.chave(semente, num_estrelas, raio_galaxia, centro_massa,
+                           dt, passos, integrador, dimensao=dimensao,
+                           inclinacao_maxima=inclinacao_maxima, precisao=precisao)
+        campo = self.carregar(chave)
+        if campo is None:
+            self._calcular(chave, semente, num_estrelas, raio_galaxia,
+                           centro_massa, dt, passos, dimensao, inclinacao_maxima, precisao)
+            campo = self.carregar(chave)
+        return campo
+
+    def _calcular(self, chave: str, semente: int, num_estrelas: int,
+                  raio_galaxia: float, centro_massa: float, dt: float, passos: int,
+                  dimensao: int = 2, inclinacao_maxima: float = 0.0,
+                  precisao: Optional[str] = None) -> None:
+        """
+        Integra o campo direto em arquivos .npy de um diretório temporário,
+        renomeado atomicamente ao final (vários processos podem calcular a
+        mesma chave; o primeiro a terminar vence).
+        """
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = tempfile.mkdtemp(dir=os.path.dirname(caminho), suffix='.tmp')
+        try:
+            _, posicoes, velocidades = condicoes_iniciais_estrelas(
+                num_estrelas, raio_galaxia, centro_massa, semente, dimensao, inclinacao_maxima,
+                precisao)
+            forma = (passos + 1,) + posicoes.shape
+            historico_posicoes = np.lib.format.open_memmap(
+                os.path.join(temporario, 'posicoes.npy'), mode='w+', dtype=posicoes.dtype,
+                shape=forma)
+            historico_velocidades = np.lib.format.open_memmap(
+                os.path.join(temporario, 'velocidades.npy'), mode='w+', dtype=posicoes.dtype,
+                shape=forma)
+
+            # Mesmo kernel, esquema e conjunto ativo de
+            # GalaxiaConsciente.atualizar_fisica_estrelas
+            backend = BackendNumpy()
+            conjunto = ConjuntoAtivo(posicoes, velocidades, RAIO_BURACO_NEGRO,
+                                     raio_galaxia * FATOR_ESCAPE)
+            historico_posicoes[0] = posicoes
+            historico_velocidades[0] = velocidades
+            tempo = 0.0
+            for passo in range(1, passos + 1):
+                tempo += dt
+                conjunto.passo(backend, dt, centro_massa, 'verlinde', passo, tempo)
+                historico_posicoes[passo] = posicoes
+                historico_velocidades[passo] = velocidades
+            historico_posicoes.flush()
+            historico_velocidades.flush()
+            del historico_posicoes, historico_velocidades
+
+            with open(os.path.join(temporario, 'eventos.json'), 'w', encoding='utf-8') as arquivo:
+                json.dump([dict(evento, posicao=evento['posicao'].tolist(),
+                                velocidade=evento['velocidade'].tolist())
+                           for evento in conjunto.eventos], arquivo)
+
+            try:
+                os.replace(temporario, caminho)
+            except OSError:
+                # Outro processo salvou a mesma chave antes
+                if not os.path.isdir(caminho):
+                    raise
+        finally:
+            if os.path.exists(temporario):
+                shutil.rmtree(temporario)
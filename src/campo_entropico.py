@@ -0,0 +1,294 @@
+"""
+Módulo do Campo Entrópico: Grades Pré-calculadas com Interpolação Rápida
+
+Avaliar a densidade entrópica ponto a ponto é o caminho crítico de mapas
+de calor e de agentes que consultam o campo várias vezes por passo. Este
+módulo pré-calcula o campo e seu gradiente em uma grade regular 2D ou 3D
+e responde consultas por interpolação bilinear/trilinear vetorizada
+(scipy.ndimage.map_coordinates de ordem 1).
+
+Perfis analíticos e perfis customizados (não analíticos, ou dados
+tabulados) passam a ter o mesmo custo: uma consulta à tabela.
+
+A interpolação linear não representa saltos: a densidade entrópica vale
+1000 dentro de r = 1 e 1/r² fora, e tanto o campo interpolado quanto o
+gradiente por diferenças centrais ficam sem sentido perto de r = 1. Em
+uma faixa de CELULAS_DESCONTINUIDADE células em torno de cada raio de
+descontinuidade, e fora da grade, campo e gradiente vêm do perfil
+original (e do seu gradiente analítico, se conhecido).
+"""
+
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.ndimage import map_coordinates
+
+from src.agente_consciente import RAIO_ABSORCAO, densidade_entropica_vetorizada
+
+# Células em torno de uma descontinuidade avaliadas pelo perfil original
+CELULAS_DESCONTINUIDADE = 3
+
+# Grades mantidas em memória (as menos usadas recentemente saem primeiro)
+TAMANHO_CACHE = 8
+
+_CACHE_GRADES: 'OrderedDict' = OrderedDict()
+
+
+def gradiente_densidade_entropica(posicoes: np.ndarray) -> np.ndarray:
+    """
+    Gradiente analítico de densidade_entropica_vetorizada.
+
+    Parameters:
+    -----------
+    posicoes : np.ndarray
+        Pontos de shape (..., d)
+
+    Returns:
+    --------
+    np.ndarray
+        Gradiente de shape (..., d): zero dentro de r = 1, -2 x / r⁴ fora
+    """
+    posicoes = np.asarray(posicoes, dtype=float)
+    r2 = np.einsum('...i,...i->...', posicoes, posicoes)[..., None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(r2 < 1.0, 0.0, -2.0 * posicoes / r2 ** 2)
+
+
+# Perfis conhecidos: (gradiente analítico, raios de descontinuidade)
+PERFIS_ANALITICOS = {
+    densidade_entropica_vetorizada: (gradiente_densidade_entropica, (RAIO_ABSORCAO,)),
+}
+
+
+class GradeCampoEntropico:
+    """
+    Campo entrópico e gradiente tabelados em uma grade regular.
+
+    Atributos:
+    - limites: Tupla de (min, max) por dimensão
+    - resolucao: Número de nós por dimensão
+    - valores: Campo nos nós, shape (n_1, ..., n_d)
+    - gradientes: Gradiente nos nós, shape (n_1, ..., n_d, d)
+    - raios_descontinuidade: Raios (em torno da origem) onde o campo salta
+    """
+
+    def __init__(self, valores: np.ndarray,
+                 limites: Sequence[Tuple[float, float]],
+                 perfil: Optional[Callable] = None,
+                 gradientes: Optional[np.ndarray] = None,
+                 gradiente_perfil: Optional[Callable] = None,
+                 raios_descontinuidade: Optional[Sequence[float]] = None):
+        """
+        Constrói a grade a partir de valores já calculados nos nós.
+
+        Parameters:
+        -----------
+        valores : np.ndarray
+            Campo nos nós da grade, shape (n_1, ..., n_d)
+        limites : sequence
+            (min, max) de cada dimensão
+        perfil : callable, optional
+            Perfil original (pontos (N, d) -> (N,)), usado fora da grade;
+            sem perfil, pontos externos usam o valor da borda
+        gradientes : np.ndarray, optional
+            Gradiente nos nós; se ausente, é obtido por diferenças centrais
+        gradiente_perfil : callable, optional
+            Gradiente analítico do perfil (pontos (N, d) -> (N, d)), usado
+            fora da grade e perto das descontinuidades; sem ele, diferenças
+            centrais do perfil com o passo da grade
+        raios_descontinuidade : sequence of float, optional
+            Raios de saltos do perfil; a até CELULAS_DESCONTINUIDADE
+            células deles, o perfil substitui a interpolação
+
+        Para os perfis de PERFIS_ANALITICOS (como a densidade entrópica
+        padrão), gradiente_perfil e raios_descontinuidade têm os valores
+        conhecidos como padrão.
+        """
+        valores = np.asarray(valores, dtype=float)
+        self.dimensao = valores.ndim
+        if len(limites) != self.dimensao:
+            raise ValueError("Número de limites deve ser igual à dimensão da grade")
+        if min(valores.shape) < 2:
+            raise ValueError("A grade precisa de pelo menos 2 nós por dimensão")
+
+        self.limites = tuple((float(a), float(b)) for a, b in limites)
+        self.resolucao = valores.shape
+        self.perfil = perfil
+        gradiente_conhecido, raios_conhecidos = PERFIS_ANALITICOS.get(perfil, (None, ()))
+        self.gradiente_perfil = gradiente_perfil or gradiente_conhecido
+        if raios_descontinuidade is None:
+            raios_descontinuidade = raios_conhecidos
+        self.raios_descontinuidade = tuple(float(r) for r in raios_descontinuidade)
+
+        self._origem = np.array([a for a, _ in self.limites])
+        self._fim = np.array([b for _, b in self.limites])
+        self._passo = (self._fim - self._origem) / (np.array(self.resolucao) - 1)
+        self._faixa = CELULAS_DESCONTINUIDADE * float(self._passo.max())
+
+        if gradientes is None:
+            gradientes = np.stack(np.gradient(valores, *self._passo), axis=-1)
+        self.valores = valores
+        self.gradientes = np.asarray(gradientes, dtype=float)
+
+    @classmethod
+    def de_perfil(cls, perfil: Callable = densidade_entropica_vetorizada,
+                  limites: Sequence[Tuple[float, float]] = ((-100.0, 100.0), (-100.0, 100.0)),
+                  resolucao: int = 401,
+                  gradiente_perfil: Optional[Callable] = None,
+                  raios_descontinuidade: Optional[Sequence[float]] = None
+                  ) -> 'GradeCampoEntropico':
+        """
+        Amostra um perfil (pontos (N, d) -> (N,)) nos nós da grade.
+
+        Parameters:
+        -----------
+        perfil : callable
+            Função do campo entrópico (padrão: densidade do AgenteConsciente)
+        limites : sequence
+            (min, max) por dimensão; 2 ou 3 dimensões
+        resolucao : int
+            Número de nós por dimensão
+        gradiente_perfil, raios_descontinuidade
+            Ver o construtor
+
+        Returns:
+        --------
+        GradeCampoEntropico
+            Grade pronta para consultas
+        """
+        eixos = [np.linspace(a, b, resolucao) for a, b in limites]
+        nos = np.stack(np.meshgrid(*eixos, indexing='ij'), axis=-1)
+        valores = np.asarray(perfil(nos.reshape(-1, len(limites))), dtype=float)
+        return cls(valores.reshape(nos.shape[:-1]), limites, perfil=perfil,
+                   gradiente_perfil=gradiente_perfil,
+                   raios_descontinuidade=raios_descontinuidade)
+
+    def _coordenadas(self, pontos: np.ndarray):
+        """
+        Converte pontos em coordenadas contínuas de índice da grade.
+
+        Returns:
+        --------
+        tuple
+            (coordenadas shape (d, N), máscara dos pontos avaliados pelo
+             perfil, fora da grade ou perto de uma descontinuidade (None
+             sem perfil), pontos (N, d), shape original)
+        """
+        pontos = np.asarray(pontos, dtype=float)
+        forma = pontos.shape[:-1]
+        pontos = pontos.reshape(-1, self.dimensao)
+        coordenadas = ((pontos - self._origem) / self._passo).T
+        exatos = None
+        if self.perfil is not None:
+            exatos = np.any((pontos < self._origem) | (pontos > self._fim), axis=1)
+            if self.raios_descontinuidade:
+                r = np.sqrt(np.einsum('ij,ij->i', pontos, pontos))
+                for raio in self.raios_descontinuidade:
+                    exatos |= np.abs(r - raio) < self._faixa
+        return coordenadas, exatos, pontos, forma
+
+    def _gradiente_perfil(self, pontos: np.ndarray) -> np.ndarray:
+        """Gradiente do perfil original em pontos (N, d)."""
+        if self.gradiente_perfil is not None:
+            return np.asarray(self.gradiente_perfil(pontos), dtype=float).reshape(pontos.shape)
+        colunas = []
+        for k, h in enumerate(self._passo):
+            deslocamento = np.zeros(self.dimensao)
+            deslocamento[k] = h
+            colunas.append((self.perfil(pontos + deslocamento)
+                            - self.perfil(pontos - deslocamento)) / (2.0 * h))
+        return np.stack(colunas, axis=-1)
+
+    def avaliar(self, pontos: np.ndarray) -> np.ndarray:
+        """
+        Campo entrópico interpolado.
+
+        Parameters:
+        -----------
+        pontos : np.ndarray
+            Pontos de shape (..., d)
+
+        Returns:
+        --------
+        np.ndarray
+            Campo de shape (...)
+        """
+        coordenadas, exatos, pontos, forma = self._coordenadas(pontos)
+        valores = map_coordinates(self.valores, coordenadas, order=1,
+                                  mode='nearest', prefilter=False)
+        if exatos is not None and exatos.any():
+            valores[exatos] = self.perfil(pontos[exatos])
+        return valores.reshape(forma)
+
+    def gradiente(self, pontos: np.ndarray) -> np.ndarray:
+        """
+        Gradiente do campo interpolado.
+
+        Fora da grade e perto das descontinuidades, usa o gradiente do
+        perfil; sem perfil, o valor da borda.
+
+        Parameters:
+        -----------
+        pontos : np.ndarray
+            Pontos de shape (..., d)
+
+        Returns:
+        --------
+        np.ndarray
+            Gradiente de shape (..., d)
+        """
+        coordenadas, exatos, pontos, forma = self._coordenadas(pontos)
+        gradientes = np.stack([
+            map_coordinates(self.gradientes[..., k], coordenadas, order=1,
+                            mode='nearest', prefilter=False)
+            for k in range(self.dimensao)
+        ], axis=-1)
+        if exatos is not None and exatos.any():
+            gradientes[exatos] = self._gradiente_perfil(pontos[exatos])
+        return gradientes.reshape(forma + (self.dimensao,))
+
+    def salvar(self, caminho: str) -> None:
+        """Salva a grade (campo, gradiente e limites) em um arquivo .npz."""
+        np.savez_compressed(caminho, valores=self.valores, gradientes=self.gradientes,
+                            limites=np.array(self.limites))
+
+    @classmethod
+    def carregar(cls, caminho: str, perfil: Optional[Callable] = None) -> 'GradeCampoEntropico':
+        """Carrega uma grade salva com salvar()."""
+        with np.load(caminho) as dados:
+            return cls(dados['valores'], [tuple(l) for l in dados['limites']],
+                       perfil=perfil, gradientes=dados['gradientes'])
+
+
+def obter_grade_campo(perfil: Callable = densidade_entropica_vetorizada,
+                      limites: Sequence[Tuple[float, float]] = ((-100.0, 100.0), (-100.0, 100.0)),
+                      resolucao: int = 401) -> GradeCampoEntropico:
+    """
+    Retorna a grade do perfil, construindo-a apenas na primeira chamada.
+
+    Parameters:
+    -----------
+    perfil : callable
+        Função do campo entrópico (pontos (N, d) -> (N,))
+    limites : sequence
+        (min, max) por dimensão
+    resolucao : int
+        Número de nós por dimensão
+
+    Returns:
+    --------
+    GradeCampoEntropico
+        Grade em cache (no máximo TAMANHO_CACHE grades são mantidas)
+    """
+    chave = (perfil, tuple(tuple(float(v) for v in l) for l in limites), resolucao)
+    grade = _CACHE_GRADES.get(chave)
+    if grade is not None:
+        _CACHE_GRADES.move_to_end(chave)
+        return grade
+
+    grade = GradeCampoEntropico.de_perfil(perfil, limites, resolucao)
+    _CACHE_GRADES[chave] = grade
+    while len(_CACHE_GRADES) > TAMANHO_CACHE:
+        _CACHE_GRADES.popitem(last=False)
+    return grade
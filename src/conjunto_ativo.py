@@ -0,0 +1,196 @@
+"""
+Módulo de Conjunto Ativo: Remoção de Corpos Capturados e Ejetados
+
+Estrelas que caem no centro ou saem da galáxia continuariam a ser
+integradas a cada passo. ConjuntoAtivo acompanha quais corpos ainda estão
+ativos:
+
+- a cada passo, captura (r < raio_captura) e escape (r > raio_escape)
+  são detectados pelo raio ao quadrado, sem np.linalg.norm;
+- cada evento é registrado com passo, tempo e estado do corpo, e o corpo
+  fica congelado na posição do evento;
+- periodicamente os arrays de trabalho são compactados, de modo que o
+  kernel de força só percorra os corpos ativos.
+
+Os arrays completos (N, d) continuam sendo o estado canônico: após cada
+passo, as linhas ativas são copiadas de volta para eles.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Passos entre compactações dos arrays de trabalho
+INTERVALO_COMPACTACAO = 50
+
+EVENTO_CAPTURA = 'capturada'
+EVENTO_ESCAPE = 'escapou'
+
+
+class ConjuntoAtivo:
+    """
+    Corpos ativos de um conjunto (N, d), com compactação periódica.
+
+    Atributos:
+    - posicoes, velocidades: Arrays completos (N, d), atualizados in-place
+    - eventos: Lista de eventos (dicts com 'passo', 'tempo', 'id', 'tipo',
+      'posicao' e 'velocidade'), em ordem de ocorrência
+    """
+
+    def __init__(self, posicoes: np.ndarray,
+                 velocidades: np.ndarray,
+                 raio_captura: float,
+                 raio_escape: float,
+                 intervalo_compactacao: int = INTERVALO_COMPACTACAO):
+        """
+        Parameters:
+        -----------
+        posicoes, velocidades : np.ndarray
+            Estado completo dos corpos, shape (N, d)
+        raio_captura : float
+            Corpos com r < raio_captura são capturados pelo centro
+        raio_escape : float
+            Corpos com r > raio_escape escaparam
+        intervalo_compactacao : int
+            Passos entre compactações (0 desativa a compactação)
+        """
+        self.raio_captura = raio_captura
+        self.raio_escape = raio_escape
+        self._raio_captura2 = raio_captura ** 2
+        self._raio_escape2 = raio_escape ** 2
+        self.intervalo_compactacao = intervalo_compactacao
+        self.eventos: List[Dict] = []
+        self.vincular(posicoes, velocidades)
+
+    def vincular(self, posicoes: np.ndarray, velocidades: np.ndarray) -> None:
+        """
+        Passa a usar novos arrays completos (mesmo estado), descompactando.
+
+        Corpos já removidos continuam inativos.
+        """
+        ativos = np.ones(len(posicoes), dtype=bool)
+        if hasattr(self, '_vivos'):
+            ativos[:] = False
+            ativos[self.ids_ativos] = True
+        self.posicoes = posicoes
+        self.velocidades = velocidades
+        self._ids = None            # None: trabalho direto nos arrays completos
+        self._vivos = ativos        # por linha de trabalho
+        self._passos_desde_compactacao = 0
+
+    @property
+    def ids_ativos(self) -> np.ndarray:
+        """Índices (nos arrays completos) dos corpos ativos."""
+        ids = np.arange(len(self.posicoes)) if self._ids is None else self._ids
+        return ids[self._vivos]
+
+    @property
+    def num_ativos(self) -> int:
+        return int(np.count_nonzero(self._vivos))
+
+    @property
+    def mascara_ativos(self) -> np.ndarray:
+        """Máscara (N,) dos corpos ativos."""
+        mascara = np.zeros(len(self.posicoes), dtype=bool)
+        mascara[self.ids_ativos] = True
+        return mascara
+
+    def _trabalho(self):
+        if self._ids is None:
+            return self.posicoes, self.velocidades
+        return self._posicoes_trabalho, self._velocidades_trabalho
+
+    def passo(self, backend, dt: float, massa: Optional[float] = None,
+              lei: str = 'verlinde', passo: int = 0, tempo: float = 0.0) -> List[Dict]:
+        """
+        Avança os corpos ativos um passo pelo backend e trata os eventos.
+
+        Parameters:
+        -----------
+        backend : BackendNumpy
+            Backend do kernel de força (ver backend_forcas)
+        dt : float
+            Passo de tempo
+        massa : float, optional
+            Massa central
+        lei : str
+            'verlinde' ou 'newton'
+        passo, tempo : int, float
+            Índice e tempo do passo, registrados nos eventos
+
+        Returns:
+        --------
+        list
+            Eventos novos deste passo
+        """
+        posicoes, velocidades = self._trabalho()
+        if len(posicoes) == 0:
+            return []
+        # Corpos removidos desde a última compactação ficam congelados
+        dt_linhas = dt if self._vivos.all() else (dt * self._vivos)[:, None]
+        backend.passo_euler(posicoes, velocidades, dt_linhas, massa, lei)
+        if self._ids is not None:
+            self.posicoes[self._ids] = posicoes
+            self.velocidades[self._ids] = velocidades
+
+        novos = self.detectar(passo, tempo)
+        self._passos_desde_compactacao += 1
+        if (self.intervalo_compactacao
+                and self._passos_desde_compactacao >= self.intervalo_compactacao
+                and not self._vivos.all()):
+            self.compactar()
+        return novos
+
+    def detectar(self, passo: int = 0, tempo: float = 0.0) -> List[Dict]:
+        """
+        Detecta capturas e escapes entre os corpos ativos e os remove.
+
+        Returns:
+        --------
+        list
+            Eventos novos
+        """
+        posicoes, velocidades = self._trabalho()
+        r2 = np.einsum('ij,ij->i', posicoes, posicoes)
+        capturados = self._vivos & (r2 < self._raio_captura2)
+        escaparam = self._vivos & (r2 > self._raio_escape2)
+        if not (capturados.any() or escaparam.any()):
+            return []
+
+        ids = np.arange(len(self.posicoes)) if self._ids is None else self._ids
+        novos = []
+        for tipo, mascara in ((EVENTO_CAPTURA, capturados), (EVENTO_ESCAPE, escaparam)):
+            linhas = np.flatnonzero(mascara)
+            # Um único gather por tipo; cada evento guarda uma linha dele
+            novos.extend(
+                {'passo': passo, 'tempo': tempo, 'id': i, 'tipo': tipo,
+                 'posicao': posicao, 'velocidade': velocidade}
+                for i, posicao, velocidade in zip(ids[linhas].tolist(), posicoes[linhas],
+                                                  velocidades[linhas])
+            )
+        self._vivos &= ~(capturados | escaparam)
+        self.eventos.extend(novos)
+        return novos
+
+    def registrar(self, eventos: List[Dict]) -> None:
+        """
+        Registra eventos ocorridos fora deste objeto (por exemplo, lidos de
+        um campo em cache), removendo os corpos correspondentes.
+        """
+        if not eventos:
+            return
+        ids = np.arange(len(self.posicoes)) if self._ids is None else self._ids
+        removidos = np.isin(ids, [e['id'] for e in eventos])
+        self._vivos &= ~removidos
+        self.eventos.extend(eventos)
+
+    def compactar(self) -> None:
+        """Remove dos arrays de trabalho os corpos inativos."""
+        posicoes, velocidades = self._trabalho()
+        manter = np.flatnonzero(self._vivos)
+        ids = np.arange(len(self.posicoes)) if self._ids is None else self._ids
+        self._ids = ids[manter]
+        self._posicoes_trabalho = posicoes[manter]
+        self._velocidades_trabalho = velocidades[manter]
+        self._vivos = np.ones(len(manter), dtype=bool)
+        self._passos_desde_compactacao = 0
@@ -0,0 +1,163 @@
+"""
+Módulo de Diagnósticos: Conservação durante a Integração
+
+Um campo central conserva, para cada corpo, a energia e o momento
+angular; o quanto um integrador (e seu dt) os deixa derivar mede a
+confiabilidade de uma execução longa. DiagnosticoConservacao acumula,
+a cada k passos e de forma vetorizada sobre os corpos ativos:
+
+- energia total, com o potencial da lei de força tabelado uma única vez
+  (tabelas_forca.compilar_potencial);
+- momento angular total (escalar em 2D, vetor em 3D);
+- razão virial 2K / Σ r g(r), igual a 1 em órbitas circulares;
+- a maior deriva relativa, por corpo, de energia e momento angular.
+
+O custo de um registro é O(N), cerca de três passos do kernel de força;
+com intervalo k, a sobrecarga por passo fica em torno de 3/k.
+"""
+
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.rotacao_galactica import obter_modelo_forca
+from src.tabelas_forca import compilar_potencial
+
+INTERVALO_PADRAO = 50
+
+
+class DiagnosticoConservacao:
+    """
+    Acumula diagnósticos de conservação de um conjunto (N, d) de corpos.
+
+    As derivas são relativas ao primeiro registro: a de energia é dividida
+    pela energia cinética inicial de cada corpo (o potencial de Verlinde
+    não tem zero natural) e a de momento angular pelo seu módulo inicial.
+
+    Atributos:
+    - intervalo: Passos entre registros
+    - historico: Listas 'passo', 'tempo', 'energia', 'momento_angular',
+      'razao_virial', 'deriva_energia' e 'deriva_momento_angular'
+    - tempo_gasto: Segundos gastos nos registros
+    """
+
+    def __init__(self, intervalo: int = INTERVALO_PADRAO,
+                 lei='verlinde',
+                 modelo_massa=None):
+        """
+        Parameters:
+        -----------
+        intervalo : int
+            Passos entre registros (ver deve_registrar)
+        lei : str or callable
+            Lei de força da integração (nome registrado ou a própria lei)
+        modelo_massa : float or PerfilMassa, optional
+            Modelo de massa da integração (padrão: M_BURACO_NEGRO)
+        """
+        if intervalo < 1:
+            raise ValueError("O intervalo deve ser >= 1")
+        self.intervalo = intervalo
+        self.lei = obter_modelo_forca(lei)
+        self.modelo_massa = modelo_massa
+        self.potencial = compilar_potencial(self.lei, modelo_massa=modelo_massa)
+        self.historico = {chave: [] for chave in ('passo', 'tempo', 'energia', 'momento_angular',
+                                                  'razao_virial', 'deriva_energia',
+                                                  'deriva_momento_angular')}
+        self.tempo_gasto = 0.0
+        self._energia_inicial = None
+
+    def deve_registrar(self, passo: int) -> bool:
+        """Se o passo cai no intervalo de registro."""
+        return passo % self.intervalo == 0
+
+    def registrar(self, passo: int, tempo: float,
+                  posicoes: np.ndarray,
+                  velocidades: np.ndarray,
+                  ativos: Optional[np.ndarray] = None) -> Dict:
+        """
+        Registra os diagnósticos do estado atual.
+
+        O primeiro registro define a referência das derivas.
+
+        Parameters:
+        -----------
+        passo, tempo : int, float
+            Passo e tempo do estado
+        posicoes, velocidades : np.ndarray
+            Estado dos corpos, shape (N, d)
+        ativos : np.ndarray, optional
+            Máscara (N,) dos corpos considerados (padrão: todos)
+
+        Returns:
+        --------
+        dict
+            Valores deste registro
+        """
+        inicio = time.perf_counter()
+        posicoes = np.asarray(posicoes, dtype=float)
+        velocidades = np.asarray(velocidades, dtype=float)
+        r = np.sqrt(np.einsum('ij,ij->i', posicoes, posicoes))
+        cinetica = 0.5 * np.einsum('ij,ij->i', velocidades, velocidades)
+        potencial, virial = self.potencial.avaliar(r)   # Φ(r) e r g(r)
+        energia = cinetica + potencial
+        if posicoes.shape[1] == 2:
+            momento = posicoes[:, 0] * velocidades[:, 1] - posicoes[:, 1] * velocidades[:, 0]
+        else:
+            momento = np.cross(posicoes, velocidades)
+
+        if self._energia_inicial is None:
+            self._energia_inicial = energia
+            self._escala_energia = np.maximum(cinetica, 1e-300)
+            self._momento_inicial = momento
+            self._escala_momento = np.maximum(np.abs(momento) if momento.ndim == 1
+                                              else np.linalg.norm(momento, axis=1), 1e-300)
+
+        if ativos is None or ativos.all():
+            ativos = slice(None)  # Sem cópias
+        deriva_momento = momento[ativos] - self._momento_inicial[ativos]
+        deriva_momento = (np.abs(deriva_momento) if deriva_momento.ndim == 1
+                          else np.linalg.norm(deriva_momento, axis=1))
+        deriva_energia = (np.abs(energia[ativos] - self._energia_inicial[ativos])
+                          / self._escala_energia[ativos])
+        soma_virial = virial[ativos].sum()
+
+        valores = {
+            'passo': passo,
+            'tempo': tempo,
+            'energia': float(energia[ativos].sum()),
+            'momento_angular': momento[ativos].sum(axis=0),
+            'razao_virial': float(2.0 * cinetica[ativos].sum() / soma_virial) if soma_virial > 0
+                            else float('nan'),
+            'deriva_energia': float(deriva_energia.max(initial=0.0)),
+            'deriva_momento_angular': float((deriva_momento / self._escala_momento[ativos])
+                                            .max(initial=0.0)),
+        }
+        for chave, valor in valores.items():
+            self.historico[chave].append(valor)
+        self.tempo_gasto += time.perf_counter() - inicio
+        return valores
+
+    def resumo(self) -> Dict:
+        """
+        Histórico como arrays e as maiores derivas.
+
+        Returns:
+        --------
+        dict
+            Arrays do histórico, 'deriva_energia_maxima',
+            'deriva_momento_angular_maxima', 'registros' e 'tempo_gasto'
+        """
+        resumo = {chave: np.array(valores) for chave, valores in self.historico.items()}
+        resumo['deriva_energia_maxima'] = float(resumo['deriva_energia'].max(initial=0.0))
+        resumo['deriva_momento_angular_maxima'] = float(
+            resumo['deriva_momento_angular'].max(initial=0.0))
+        resumo['registros'] = len(self.historico['passo'])
+        resumo['tempo_gasto'] = self.tempo_gasto
+        return resumo
+
+    def dentro_da_tolerancia(self, tolerancia: float) -> bool:
+        """Se as derivas de energia e momento angular ficaram <= tolerancia."""
+        resumo = self.resumo()
+        return (resumo['deriva_energia_maxima'] <= tolerancia
+                and resumo['deriva_momento_angular_maxima'] <= tolerancia)
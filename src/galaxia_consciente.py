@@ -9,11 +9,140 @@ Objetivo: Mostrar que a consciência permite escapar do determinismo cósmico.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import List, Tuple, Optional, Dict
-from src.agente_consciente import AgenteConsciente
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.agente_consciente import AgenteConsciente, RAIO_ABSORCAO
+from src.aleatorio import ProvedorAleatorio
+from src.backend_forcas import obter_backend
+from src.conjunto_ativo import ConjuntoAtivo, EVENTO_CAPTURA, EVENTO_ESCAPE
+from src.diagnosticos import DiagnosticoConservacao, INTERVALO_PADRAO
+from src.graficos import DPI_PADRAO, colecao_trajetorias, linha_lod, mostrar, pyplot
+from src.instrumentacao import INSTRUMENTACAO_NULA, Instrumentacao
+from src.monitor_orbital import MonitorOrbital
+from src.passo_paralelo import ExecutorParaleloEstrelas
+from src.piramide_trajetorias import obter_piramide
+from src.precisao import nome_precisao, obter_dtype
 from src.rotacao_galactica import forca_verlinde, velocidade_orbital_estavel
 
+# Corpos com r < RAIO_BURACO_NEGRO são capturados pelo centro; com
+# r > FATOR_ESCAPE * raio_galaxia, saíram da galáxia
+RAIO_BURACO_NEGRO = 2.0
+FATOR_ESCAPE = 1.2
+
+DIMENSOES_SUPORTADAS = (2, 3)
+
+
+class _TrajetoriaEstrela(Sequence):
+    """
+    Trajetória de uma estrela como vista sobre o histórico compartilhado.
+
+    O estado das estrelas é guardado em arrays (N, d); a cada passo um
+    único instantâneo de todas as posições é registrado. Esta sequência
+    expõe a linha de uma estrela sem copiar o histórico.
+    """
+
+    def __init__(self, historico: List[np.ndarray], indice: int):
+        self._historico = historico
+        self._indice = indice
+
+    def __len__(self) -> int:
+        return len(self._historico)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [posicoes[self._indice] for posicoes in self._historico[k]]
+        return self._historico[k][self._indice]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array([posicoes[self._indice] for posicoes in self._historico], dtype=dtype)
+
+
+def completar_dimensao(vetores, dimensao: int) -> np.ndarray:
+    """
+    Completa vetores (..., k) com zeros até (..., dimensao).
+
+    Permite passar estados 2D, como (20.0, 0.0), a uma simulação 3D: o
+    vetor fica no plano do disco (z = 0).
+    """
+    vetores = np.asarray(vetores, dtype=float)
+    faltam = dimensao - vetores.shape[-1]
+    if faltam < 0:
+        raise ValueError(f"Vetor de dimensão {vetores.shape[-1]} em simulação {dimensao}D")
+    if faltam == 0:
+        return vetores.copy()
+    return np.concatenate([vetores, np.zeros(vetores.shape[:-1] + (faltam,))], axis=-1)
+
+
+def condicoes_iniciais_estrelas(num_estrelas: int,
+                                raio_galaxia: float = 100.0,
+                                centro_massa: float = 1000.0,
+                                semente: Optional[int] = None,
+                                dimensao: int = 2,
+                                inclinacao_maxima: float = 0.0,
+                                precisao: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Estrelas em órbitas circulares estáveis (Verlinde), raios logarítmicos.
+
+    Em 3D as estrelas partem do plano do disco (z = 0) com a velocidade
+    orbital inclinada de um ângulo uniforme em [-inclinacao_maxima,
+    inclinacao_maxima] em torno do raio: as órbitas continuam circulares,
+    mas em planos inclinados (disco espesso).
+
+    Parameters:
+    -----------
+    num_estrelas : int
+        Número de estrelas
+    raio_galaxia : float
+        Raio da estrela mais externa
+    centro_massa : float
+        Massa no centro galáctico
+    semente : int, optional
+        Semente dos ângulos iniciais; sem semente, usa o gerador global
+    dimensao : int
+        2 ou 3
+    inclinacao_maxima : float
+        Inclinação máxima das órbitas em radianos (apenas 3D)
+    precisao : str, optional
+        'float64' ou 'float32' para posições e velocidades (padrão: a
+        precisão padrão, ver precisao); as condições são calculadas em
+        float64 e arredondadas no fim
+
+    Returns:
+    --------
+    tuple
+        (raios (N,), posicoes (N, d), velocidades (N, d))
+    """
+    dtype = obter_dtype(precisao)
+    if dimensao not in DIMENSOES_SUPORTADAS:
+        raise ValueError(f"Dimensão deve ser uma de {DIMENSOES_SUPORTADAS}")
+
+    # Raios distribuídos logaritmicamente
+    raios = np.logspace(np.log10(5), np.log10(raio_galaxia), num_estrelas)
+
+    # Ângulo inicial aleatório
+    gerador = np.random if semente is None else np.random.RandomState(semente)
+    angulos = gerador.uniform(0, 2*np.pi, num_estrelas)
+    cos, sin = np.cos(angulos), np.sin(angulos)
+
+    # Velocidade orbital estável (Verlinde), tangencial à posição
+    v_orbital = velocidade_orbital_estavel(raios, 'verlinde', centro_massa)
+
+    if dimensao == 2:
+        posicoes = np.column_stack([raios * cos, raios * sin])
+        velocidades = np.column_stack([-v_orbital * sin, v_orbital * cos])
+        return raios, posicoes.astype(dtype, copy=False), velocidades.astype(dtype, copy=False)
+
+    # 3D: inclinações sorteadas depois dos ângulos (com inclinação nula,
+    # o disco reproduz o caso 2D com z = 0)
+    inclinacoes = np.zeros(num_estrelas)
+    if inclinacao_maxima > 0:
+        inclinacoes = gerador.uniform(-inclinacao_maxima, inclinacao_maxima, num_estrelas)
+    v_plano = v_orbital * np.cos(inclinacoes)
+    posicoes = np.column_stack([raios * cos, raios * sin, np.zeros(num_estrelas)])
+    velocidades = np.column_stack([-v_plano * sin, v_plano * cos, v_orbital * np.sin(inclinacoes)])
+    return raios, posicoes.astype(dtype, copy=False), velocidades.astype(dtype, copy=False)
+
+
 class GalaxiaConsciente:
     """
     Simulação de galáxia com agentes conscientes navegando contra fluxo entrópico.
@@ -24,7 +153,12 @@ class GalaxiaConsciente:
 
     def __init__(self, raio_galaxia: float = 100.0,
                  num_estrelas: int = 50,
-                 centro_massa: float = 1000.0):
+                 centro_massa: float = 1000.0,
+                 backend: str = 'numpy',
+                 semente: Optional[int] = None,
+                 dimensao: int = 2,
+                 inclinacao_maxima: float = 0.0,
+                 precisao: Optional[str] = None):
         """
         Inicializa galáxia consciente.
 
@@ -35,11 +169,46 @@ class GalaxiaConsciente:
         num_estrelas : int
             Número de estrelas orbitando
         centro_massa : float
-            Massa no centro galáctico
+            Massa no centro galáctico (usada na gravidade das estrelas e
+            do agente)
+        backend : str
+            Backend do kernel de força das estrelas: 'numpy', 'numexpr'
+            ou 'auto' (ver backend_forcas)
+        semente : int, optional
+            Semente das posições iniciais das estrelas (necessária para
+            reutilizar o campo estelar com usar_campo_estelar)
+        dimensao : int
+            2 (disco plano) ou 3; estrelas e agente usam estados (N, d)
+        inclinacao_maxima : float
+            Inclinação máxima das órbitas das estrelas em radianos (3D)
+        precisao : str, optional
+            'float64' ou 'float32' para o estado das estrelas, o histórico
+            e o agente (padrão: a precisão padrão, ver precisao); os
+            diagnósticos acumulam em float64
         """
+        if dimensao not in DIMENSOES_SUPORTADAS:
+            raise ValueError(f"Dimensão deve ser uma de {DIMENSOES_SUPORTADAS}")
         self.raio_galaxia = raio_galaxia
         self.num_estrelas = num_estrelas
         self.centro_massa = centro_massa
+        self.semente = semente
+        self.dimensao = dimensao
+        self.inclinacao_maxima = inclinacao_maxima
+        self.precisao = nome_precisao(precisao)
+        self.definir_backend(backend)
+        self._executor_paralelo = None
+        self._campo_estelar = None
+        self.diagnosticos = None
+        self.monitor_orbital = None
+        self.instrumentacao = INSTRUMENTACAO_NULA
+        # Sem histórico (por exemplo, ao animar em streaming), a memória
+        # fica constante, mas as trajetórias das estrelas param de crescer
+        self.registrar_historico = True
+
+        # Passo e tempo simulados, e eventos de captura/escape
+        self.passo_atual = 0
+        self.tempo = 0.0
+        self.eventos: List[Dict] = []
 
         # Criar estrelas em órbitas estáveis (matéria inerte)
         self.estrelas = self._criar_estrelas_inertes()
@@ -47,51 +216,230 @@ class GalaxiaConsciente:
         # Agente consciente (único por enquanto)
         self.agente_consciente = None
 
-    def _criar_estrelas_inertes(self) -> List[Dict]:
+    def definir_backend(self, nome: str = 'auto', threads: Optional[int] = None) -> None:
         """
-        Cria estrelas que seguem leis físicas deterministas (matéria inerte).
+        Seleciona o backend do kernel de força das estrelas.
+
+        Pode ser chamado entre passos; o estado das estrelas não muda.
+
+        Parameters:
+        -----------
+        nome : str
+            'numpy', 'numexpr' ou 'auto' (numexpr se disponível)
+        threads : int, optional
+            Número de threads (apenas numexpr)
+        """
+        self.backend = obter_backend(nome, threads)
+
+    def definir_paralelismo(self, workers: Optional[int] = None) -> None:
+        """
+        Ativa (ou desativa) o passo das estrelas em vários processos.
+
+        O estado das estrelas passa para memória compartilhada e cada
+        worker atualiza uma fatia in-place; o agente continua no processo
+        principal, em paralelo com o passo das estrelas. Use
+        encerrar_paralelismo() (ou workers=1) para voltar ao modo serial.
+
+        Parameters:
+        -----------
+        workers : int, optional
+            Número de processos (padrão: núcleos disponíveis); 1 desativa
+        """
+        self.encerrar_paralelismo()
+        if workers == 1:
+            return
+        self._executor_paralelo = ExecutorParaleloEstrelas(
+            self.posicoes, self.velocidades, workers, lei='verlinde',
+            massa=self.centro_massa, ativas=self._conjunto_ativo.mascara_ativos)
+        self._vincular_estado(self._executor_paralelo.posicoes,
+                              self._executor_paralelo.velocidades)
+
+    def encerrar_paralelismo(self) -> None:
+        """Encerra os workers, trazendo o estado das estrelas de volta."""
+        if self._executor_paralelo is None:
+            return
+        self._executor_paralelo.aguardar_passo()
+        self._vincular_estado(self.posicoes.copy(), self.velocidades.copy())
+        self._executor_paralelo.fechar()
+        self._executor_paralelo = None
+
+    def usar_campo_estelar(self, cache, passos: int, dt: float = 0.1) -> None:
+        """
+        Reproduz as estrelas a partir de um campo estelar pré-calculado.
+
+        As estrelas deixam de ser integradas: cada passo apenas avança no
+        campo (memmap) obtido de cache_estrelas.CacheCampoEstelar, que o
+        calcula na primeira vez. O resultado é idêntico ao da integração
+        com o backend NumPy.
+
+        Parameters:
+        -----------
+        cache : CacheCampoEstelar
+            Cache do campo estelar
+        passos : int
+            Número máximo de passos que serão simulados
+        dt : float
+            Passo de tempo (o mesmo de simular_galaxia)
+        """
+        if self.semente is None:
+            raise ValueError("usar_campo_estelar requer GalaxiaConsciente(semente=...)")
+        if self.passo_atual > 0:
+            raise ValueError("O campo estelar deve ser definido antes do primeiro passo")
+        self.encerrar_paralelismo()
+        posicoes, velocidades, eventos = cache.obter(
+            self.semente, self.num_estrelas, self.raio_galaxia, self.centro_massa, dt, passos,
+            dimensao=self.dimensao, inclinacao_maxima=self.inclinacao_maxima,
+            precisao=self.precisao)
+        self._campo_estelar = (posicoes, velocidades, dt)
+        self._eventos_campo = {}
+        for evento in eventos:
+            self._eventos_campo.setdefault(evento['passo'], []).append(evento)
+
+    def ativar_diagnosticos(self, intervalo: int = INTERVALO_PADRAO) -> DiagnosticoConservacao:
+        """
+        Passa a registrar energia, momento angular e razão virial das
+        estrelas ativas a cada intervalo passos (ver diagnosticos).
+
+        O estado atual é a referência das derivas; o resumo aparece em
+        'diagnosticos' nos resultados de simular_galaxia.
+
+        Parameters:
+        -----------
+        intervalo : int
+            Passos entre registros
 
         Returns:
         --------
-        list
-            Lista de dicionários com estado de cada estrela
+        DiagnosticoConservacao
+            Diagnóstico em uso
         """
-        estrelas = []
+        self.diagnosticos = DiagnosticoConservacao(intervalo, 'verlinde', self.centro_massa)
+        self._registrar_diagnosticos(forcar=True)
+        return self.diagnosticos
 
-        # Raios distribuídos logaritmicamente
-        raios = np.logspace(np.log10(5), np.log10(self.raio_galaxia), self.num_estrelas)
+    def instrumentar(self, instrumentacao: Optional[Instrumentacao] = None) -> Instrumentacao:
+        """
+        Passa a cronometrar as fases de simular_galaxia ('estrelas',
+        'agente', 'trajetorias', 'diagnosticos', 'monitor_orbital' e
+        'terminacao') e a contar 'avaliacoes_forca' e 'decisoes_agente'.
+
+        Os observadores da instrumentação recebem (passo, galaxia); o
+        relatório aparece em 'instrumentacao' nos resultados.
+
+        Parameters:
+        -----------
+        instrumentacao : Instrumentacao, optional
+            Instrumentação a usar (padrão: uma nova)
+
+        Returns:
+        --------
+        Instrumentacao
+            Instrumentação em uso
+        """
+        self.instrumentacao = instrumentacao if instrumentacao is not None else Instrumentacao()
+        return self.instrumentacao
+
+    def _registrar_diagnosticos(self, forcar: bool = False) -> None:
+        if self.diagnosticos is None or not (forcar or
+                                             self.diagnosticos.deve_registrar(self.passo_atual)):
+            return
+        posicoes, velocidades = self._estado_estrelas()
+        self.diagnosticos.registrar(self.passo_atual, self.tempo, posicoes, velocidades,
+                                    self._conjunto_ativo.mascara_ativos)
+
+    def ativar_monitor_orbital(self, orbitas: Optional[float] = None,
+                               tolerancia: Optional[float] = None,
+                               intervalo: int = 1) -> MonitorOrbital:
+        """
+        Passa a acompanhar revoluções, período, precessão e faixa de raios
+        das estrelas (ver monitor_orbital).
+
+        Sem agente consciente, simular_galaxia termina assim que todas as
+        estrelas ativas completarem orbitas revoluções ou suas medidas
+        convergirem; as medidas aparecem em 'orbitas' nos resultados.
 
-        for i, r in enumerate(raios):
-            # Ângulo inicial aleatório
-            angulo = np.random.uniform(0, 2*np.pi)
+        Parameters:
+        -----------
+        orbitas : float, optional
+            Revoluções após as quais a simulação pode terminar
+        tolerancia : float, optional
+            Variação relativa entre revoluções que caracteriza convergência
+        intervalo : int
+            Passos entre registros (a estrela mais interna deve girar
+            menos de meia volta por intervalo)
 
-            # Posição inicial
-            x = r * np.cos(angulo)
-            y = r * np.sin(angulo)
+        Returns:
+        --------
+        MonitorOrbital
+            Monitor em uso
+        """
+        self.monitor_orbital = MonitorOrbital(orbitas, tolerancia)
+        self._intervalo_monitor = intervalo
+        self.monitor_orbital.atualizar(self.tempo, self._estado_estrelas()[0],
+                                       self._conjunto_ativo.mascara_ativos)
+        return self.monitor_orbital
+
+    def _registrar_monitor_orbital(self) -> None:
+        if self.monitor_orbital is None or self.passo_atual % self._intervalo_monitor:
+            return
+        self.monitor_orbital.atualizar(self.tempo, self._estado_estrelas()[0],
+                                       self._conjunto_ativo.mascara_ativos)
+
+    def _estado_estrelas(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Posições e velocidades do passo atual (do campo em cache, se em uso)."""
+        if self._campo_estelar is not None:
+            return (self._campo_estelar[0][self.passo_atual],
+                    self._campo_estelar[1][self.passo_atual])
+        return self.posicoes, self.velocidades
+
+    def _vincular_estado(self, posicoes: np.ndarray, velocidades: np.ndarray) -> None:
+        """Troca os arrays de estado, atualizando as views nas estrelas."""
+        self.posicoes = posicoes
+        self.velocidades = velocidades
+        self._conjunto_ativo.vincular(posicoes, velocidades)
+        for i, estrela in enumerate(self.estrelas):
+            estrela['posicao'] = posicoes[i]
+            estrela['velocidade'] = velocidades[i]
 
-            # Velocidade orbital estável (Verlinde)
-            v_orbital = velocidade_orbital_estavel(r, 'verlinde')
+    def _criar_estrelas_inertes(self) -> List[Dict]:
+        """
+        Cria estrelas que seguem leis físicas deterministas (matéria inerte).
 
-            # Velocidade tangencial
-            vx = -v_orbital * np.sin(angulo)  # perpendicular à posição
-            vy = v_orbital * np.cos(angulo)
+        O estado fica em self.posicoes e self.velocidades, shape (N, d);
+        os dicionários das estrelas referenciam linhas desses arrays.
+        Estrelas capturadas pelo centro ou que saem da galáxia são
+        removidas do conjunto ativo (ver conjunto_ativo).
 
-            estrela = {
+        Returns:
+        --------
+        list
+            Lista de dicionários com estado de cada estrela
+        """
+        raios, self.posicoes, self.velocidades = condicoes_iniciais_estrelas(
+            self.num_estrelas, self.raio_galaxia, self.centro_massa, self.semente,
+            self.dimensao, self.inclinacao_maxima, self.precisao)
+        self._historico_estrelas = [self.posicoes.copy()]
+        self._conjunto_ativo = ConjuntoAtivo(self.posicoes, self.velocidades,
+                                             RAIO_BURACO_NEGRO,
+                                             self.raio_galaxia * FATOR_ESCAPE)
+
+        return [
+            {
                 'id': i,
-                'posicao': np.array([x, y]),
-                'velocidade': np.array([vx, vy]),
+                'posicao': self.posicoes[i],
+                'velocidade': self.velocidades[i],
                 'raio_orbital': r,
-                'trajetoria': [np.array([x, y])],
+                'trajetoria': _TrajetoriaEstrela(self._historico_estrelas, i),
                 'tipo': 'inerte'
             }
-            estrelas.append(estrela)
-
-        return estrelas
+            for i, r in enumerate(raios)
+        ]
 
     def adicionar_agente_consciente(self,
                                    posicao_inicial: Tuple[float, float] = (20.0, 0.0),
                                    velocidade_inicial: Tuple[float, float] = (0.0, 2.0),
-                                   objetivo: Optional[Tuple[float, float]] = None):
+                                   objetivo: Optional[Tuple[float, float]] = None,
+                                   aleatorio: Optional[ProvedorAleatorio] = None):
         """
         Adiciona agente consciente à galáxia.
 
@@ -103,12 +451,23 @@ class GalaxiaConsciente:
             Velocidade inicial
         objetivo : tuple, optional
             Objetivo do agente (estrela específica ou saída da galáxia)
+        aleatorio : ProvedorAleatorio, optional
+            Fonte do ruído das decisões do agente (ver AgenteConsciente)
+
+        Em 3D, vetores 2D são completados com z = 0.
         """
+        posicao_inicial = completar_dimensao(posicao_inicial, self.dimensao)
+        velocidade_inicial = completar_dimensao(velocidade_inicial, self.dimensao)
+        if objetivo is not None:
+            objetivo = tuple(completar_dimensao(objetivo, self.dimensao))
+
         self.agente_consciente = AgenteConsciente(
             posicao_inicial=posicao_inicial,
             velocidade_inicial=velocidade_inicial,
             horizonte_previsao=10,  # Maior previsão para navegação consciente
-            forca_consciente=0.5    # Força consciente aumentada
+            forca_consciente=0.5,   # Força consciente aumentada
+            aleatorio=aleatorio,
+            precisao=self.precisao
         )
 
         self.objetivo_agente = objetivo
@@ -116,7 +475,7 @@ class GalaxiaConsciente:
         # Se não especificado, objetivo é sair da galáxia (raio > raio_galaxia)
         if objetivo is None:
             # Objetivo: escapar para 1.5x o raio galáctico
-            direcao = np.array(posicao_inicial) / np.linalg.norm(posicao_inicial)
+            direcao = posicao_inicial / np.linalg.norm(posicao_inicial)
             self.objetivo_agente = tuple(direcao * self.raio_galaxia * 1.5)
 
     def _calcular_aceleracao_consciente(self, agente: AgenteConsciente) -> np.ndarray:
@@ -143,14 +502,14 @@ class GalaxiaConsciente:
         distancia_objetivo = np.linalg.norm(vetor_objetivo)
 
         if distancia_objetivo < 5.0:  # Chegou ao objetivo
-            return np.zeros(2)  # Parar
+            return np.zeros_like(agente.posicao)  # Parar
 
         # Direção para o objetivo
         direcao_objetivo = vetor_objetivo / distancia_objetivo
 
         # Força gravitacional entrópica (que tenta manter em órbita)
         r = np.linalg.norm(agente.posicao)
-        aceleracao_gravitacional = forca_verlinde(r)
+        aceleracao_gravitacional = forca_verlinde(r, self.centro_massa)
         vetor_radial = -agente.posicao / r
         forca_grav = aceleracao_gravitacional * vetor_radial
 
@@ -162,38 +521,95 @@ class GalaxiaConsciente:
         aceleracao_total = forca_contra_grav + forca_para_objetivo
 
         # Adicionar ruído para simular tomada de decisão
-        ruido = np.random.normal(0, 0.1, 2)
+        ruido = agente.aleatorio.normal(agente.temperatura, agente.posicao.shape)
         return aceleracao_total + ruido
 
     def atualizar_fisica_estrelas(self, dt: float = 0.1):
         """
         Atualiza física das estrelas inertes (deterministas).
-        """
-        for estrela in self.estrelas:
-            pos = estrela['posicao']
-            vel = estrela['velocidade']
 
-            r = np.linalg.norm(pos)
-
-            # Aceleração gravitacional (Verlinde)
-            aceleracao = forca_verlinde(r)
-            vetor_radial = -pos / r
-            acel = aceleracao * vetor_radial
-
-            # Atualizar velocidade e posição
-            vel += acel * dt
-            pos += vel * dt
+        Todas as estrelas avançam juntas pelo kernel do backend, em place
+        sobre self.posicoes e self.velocidades (ou pelos workers, se o
+        paralelismo estiver ativo, ou pelo campo estelar em cache).
+        """
+        self._iniciar_passo_estrelas(dt)
+        self._concluir_passo_estrelas()
+        self._sincronizar_campo_estelar()
+
+    def _iniciar_passo_estrelas(self, dt: float) -> None:
+        self._dt_em_andamento = dt
+        if self._campo_estelar is not None:
+            posicoes, _, dt_campo = self._campo_estelar
+            if dt != dt_campo:
+                raise ValueError(f"Campo estelar calculado com dt={dt_campo}, não {dt}")
+            if self.passo_atual + 1 >= len(posicoes):
+                raise ValueError(f"Campo estelar cobre apenas {len(posicoes) - 1} passos")
+        elif self._executor_paralelo is not None:
+            # Retorna imediatamente; os workers avançam suas fatias
+            self._executor_paralelo.iniciar_passo(dt)
+        else:
+            # Aceleração gravitacional (Verlinde) e Euler semi-implícito,
+            # apenas sobre as estrelas ativas
+            novos = self._conjunto_ativo.passo(self.backend, dt, self.centro_massa, 'verlinde',
+                                               self.passo_atual + 1, self.tempo + dt)
+            self.eventos.extend(novos)
+
+    def _concluir_passo_estrelas(self) -> None:
+        self.passo_atual += 1
+        self.tempo += self._dt_em_andamento
+
+        if self._campo_estelar is not None:
+            novos = self._eventos_campo.get(self.passo_atual, [])
+            self._conjunto_ativo.registrar(novos)
+            self.eventos.extend(novos)
+            # Sem cópia: o histórico referencia as linhas do memmap
+            if self.registrar_historico:
+                self._historico_estrelas.append(self._campo_estelar[0][self.passo_atual])
+        else:
+            if self._executor_paralelo is not None:
+                with self.instrumentacao.fase('estrelas'):
+                    self._executor_paralelo.aguardar_passo()
+                    novos = self._conjunto_ativo.detectar(self.passo_atual, self.tempo)
+                    if novos:
+                        self._executor_paralelo.congelar([e['id'] for e in novos])
+                    self.eventos.extend(novos)
 
             # Registrar trajetória
-            estrela['trajetoria'].append(pos.copy())
-
-    def atualizar_agente_consciente(self, dt: float = 0.1):
+            if self.registrar_historico:
+                with self.instrumentacao.fase('trajetorias'):
+                    self._historico_estrelas.append(self.posicoes.copy())
+        with self.instrumentacao.fase('diagnosticos'):
+            self._registrar_diagnosticos()
+        with self.instrumentacao.fase('monitor_orbital'):
+            self._registrar_monitor_orbital()
+
+    def _sincronizar_campo_estelar(self) -> None:
+        """Copia o estado atual do campo em cache para self.posicoes/velocidades."""
+        if self._campo_estelar is not None:
+            self.posicoes[:] = self._campo_estelar[0][self.passo_atual]
+            self.velocidades[:] = self._campo_estelar[1][self.passo_atual]
+
+    def atualizar_agente_consciente(self, dt: float = 0.1, integrador=None):
         """
         Atualiza agente consciente com livre arbítrio.
+
+        Parameters:
+        -----------
+        dt : float
+            Passo de tempo (o mesmo das estrelas)
+        integrador : IntegradorAdaptativo, optional
+            Se fornecido, cobre o intervalo dt com subpassos adaptativos,
+            mantendo o agente sincronizado com as estrelas
         """
         if self.agente_consciente is None:
             return
 
+        if integrador is not None:
+            integrador.avancar(self.agente_consciente, dt,
+                               self._calcular_aceleracao_consciente)
+            self.agente_consciente.trajetoria.append(tuple(self.agente_consciente.posicao))
+            return
+
         # Calcular aceleração consciente (livre arbítrio)
         aceleracao_consciente = self._calcular_aceleracao_consciente(self.agente_consciente)
 
@@ -204,7 +620,8 @@ class GalaxiaConsciente:
         # Registrar trajetória
         self.agente_consciente.trajetoria.append(tuple(self.agente_consciente.posicao))
 
-    def simular_galaxia(self, passos: int = 1000, dt: float = 0.1) -> Dict:
+    def simular_galaxia(self, passos: int = 1000, dt: float = 0.1,
+                        integrador_agente=None) -> Dict:
         """
         Simula evolução da galáxia com agente consciente.
 
@@ -214,6 +631,9 @@ class GalaxiaConsciente:
             Número de passos da simulação
         dt : float
             Passo de tempo
+        integrador_agente : IntegradorAdaptativo, optional
+            Integrador de passo adaptativo para o agente (subpassos dentro
+            de cada dt das estrelas); o histórico de dt fica no integrador
 
         Returns:
         --------
@@ -221,32 +641,110 @@ class GalaxiaConsciente:
             Resultados da simulação
         """
         print(f"Simulando galáxia com {self.num_estrelas} estrelas inertes...")
+        for _ in self.iterar_passos(passos, dt, integrador_agente):
+            pass
+        return self._analisar_resultados()
 
-        for passo in range(passos):
-            # Atualizar estrelas deterministas
-            self.atualizar_fisica_estrelas(dt)
+    def iterar_passos(self, passos: int = 1000, dt: float = 0.1,
+                      integrador_agente=None) -> Iterator[np.ndarray]:
+        """
+        Avança a galáxia um passo por iteração (o laço de simular_galaxia).
 
-            # Atualizar agente consciente (livre arbítrio)
-            self.atualizar_agente_consciente(dt)
+        Permite consumir a simulação em streaming, por exemplo para animar
+        sem guardar os quadros (ver animacao). A iteração termina após
+        passos ou quando o agente escapa, é capturado ou chega ao
+        objetivo (ou, só com estrelas, quando o monitor orbital conclui).
 
-            # Verificar se agente conseguiu escapar
-            if self.agente_consciente:
-                r_agente = np.linalg.norm(self.agente_consciente.posicao)
-                if r_agente > self.raio_galaxia * 1.2:  # Escapou
-                    print(f"✅ Agente consciente ESCAPOU da galáxia no passo {passo}!")
-                    break
+        Parameters:
+        -----------
+        passos, dt, integrador_agente
+            Como em simular_galaxia
 
-                # Verificar se chegou ao objetivo
-                if self.objetivo_agente:
-                    dist_objetivo = np.linalg.norm(
-                        np.array(self.objetivo_agente) - self.agente_consciente.posicao
-                    )
-                    if dist_objetivo < 5.0:
-                        print(f"🎯 Agente consciente CHEGOU ao objetivo no passo {passo}!")
-                        break
+        Returns:
+        --------
+        iterator
+            Posições (N, d) das estrelas após cada passo; pode ser o
+            próprio estado da galáxia (copie para guardar)
+        """
+        raio_escape2 = (self.raio_galaxia * FATOR_ESCAPE) ** 2
+        objetivo = None
+        if self.agente_consciente and self.objetivo_agente:
+            objetivo = np.array(self.objetivo_agente, dtype=float)
+
+        instrumentacao = self.instrumentacao
+        instrumentacao.iniciar()
+        try:
+            for passo in range(passos):
+                # Atualizar estrelas deterministas (em paralelo com o agente,
+                # se os workers estiverem ativos)
+                with instrumentacao.fase('estrelas'):
+                    self._iniciar_passo_estrelas(dt)
+
+                # Atualizar agente consciente (livre arbítrio)
+                with instrumentacao.fase('agente'):
+                    self.atualizar_agente_consciente(dt, integrador_agente)
+                self._concluir_passo_estrelas()
+
+                if instrumentacao.ativo:
+                    instrumentacao.contar('avaliacoes_forca', self._conjunto_ativo.num_ativos)
+                    if self.agente_consciente:
+                        instrumentacao.contar('decisoes_agente')
+                instrumentacao.registrar_passo(self.passo_atual, self)
+
+                with instrumentacao.fase('terminacao'):
+                    terminou = self._verificar_termino(passo, raio_escape2, objetivo)
+                yield self._estado_estrelas()[0]
+                if terminou:
+                    break
+        finally:
+            instrumentacao.finalizar()
+            self._sincronizar_campo_estelar()
 
+    def resultados(self) -> Dict:
+        """Resultados do estado atual (os mesmos de simular_galaxia)."""
         return self._analisar_resultados()
 
+    def _verificar_termino(self, passo: int, raio_escape2: float,
+                           objetivo: Optional[np.ndarray]) -> bool:
+        """Se a simulação deve terminar após este passo."""
+        # Verificar se agente conseguiu escapar (raios ao quadrado)
+        if self.agente_consciente:
+            posicao = self.agente_consciente.posicao
+            r2_agente = posicao @ posicao
+            if r2_agente > raio_escape2:  # Escapou
+                self._registrar_evento_agente(EVENTO_ESCAPE)
+                print(f"✅ Agente consciente ESCAPOU da galáxia no passo {passo}!")
+                return True
+
+            if r2_agente < RAIO_ABSORCAO ** 2:  # Capturado pelo centro
+                self._registrar_evento_agente(EVENTO_CAPTURA)
+                print(f"⚫ Agente consciente foi CAPTURADO pelo centro no passo {passo}.")
+                return True
+
+            # Verificar se chegou ao objetivo
+            if objetivo is not None:
+                vetor_objetivo = objetivo - posicao
+                if vetor_objetivo @ vetor_objetivo < 25.0:  # distância < 5
+                    print(f"🎯 Agente consciente CHEGOU ao objetivo no passo {passo}!")
+                    return True
+
+        # Só estrelas: parar quando as órbitas estiverem determinadas
+        elif self.monitor_orbital is not None and self.monitor_orbital.concluido:
+            print(f"🔁 Órbitas das estrelas determinadas no passo {passo}.")
+            return True
+        return False
+
+    def _registrar_evento_agente(self, tipo: str) -> None:
+        """Registra captura ou escape do agente consciente."""
+        self.eventos.append({
+            'passo': self.passo_atual,
+            'tempo': self.tempo,
+            'id': 'agente',
+            'tipo': tipo,
+            'posicao': self.agente_consciente.posicao.copy(),
+            'velocidade': self.agente_consciente.velocidade.copy(),
+        })
+
     def _analisar_resultados(self) -> Dict:
         """
         Analisa resultados da simulação.
@@ -258,11 +756,17 @@ class GalaxiaConsciente:
         """
         resultados = {
             'estrelas_inertes': len(self.estrelas),
+            'precisao': self.precisao,
             'trajetorias_inertes': [estrela['trajetoria'] for estrela in self.estrelas],
             'agente_consciente': None,
             'sucesso_escape': False,
             'sucesso_objetivo': False,
-            'livre_arbitrio_demonstrado': False
+            'livre_arbitrio_demonstrado': False,
+            'estrelas_ativas': self._conjunto_ativo.num_ativos,
+            'eventos': list(self.eventos),
+            'diagnosticos': None if self.diagnosticos is None else self.diagnosticos.resumo(),
+            'orbitas': None if self.monitor_orbital is None else self.monitor_orbital.resultados(),
+            'instrumentacao': self.instrumentacao.relatorio()
         }
 
         if self.agente_consciente:
@@ -274,7 +778,7 @@ class GalaxiaConsciente:
 
             # Verificar sucesso
             r_final = np.linalg.norm(self.agente_consciente.posicao)
-            resultados['sucesso_escape'] = r_final > self.raio_galaxia * 1.2
+            resultados['sucesso_escape'] = r_final > self.raio_galaxia * FATOR_ESCAPE
 
             if self.objetivo_agente:
                 dist_obj = np.linalg.norm(
@@ -289,39 +793,49 @@ class GalaxiaConsciente:
 
         return resultados
 
-    def plotar_galaxia_consciente(self, salvar: bool = True) -> None:
+    def plotar_galaxia_consciente(self, salvar: bool = True,
+                                  dpi: int = DPI_PADRAO,
+                                  passo_trajetoria: Optional[int] = None) -> None:
         """
-        Plota galáxia com agente consciente navegando.
+        Plota galáxia com agente consciente navegando (em 3D, a projeção
+        no plano do disco).
+
+        As trajetórias das estrelas formam uma única LineCollection e as
+        posições finais um único scatter, de modo que milhares de estrelas
+        são desenhadas em segundos.
 
         Parameters:
         -----------
         salvar : bool
             Se deve salvar a figura
+        dpi : int
+            Resolução da figura salva
+        passo_trajetoria : int, optional
+            Desenha um ponto a cada passo_trajetoria passos das estrelas
         """
+        plt = pyplot()
         fig, ax = plt.subplots(figsize=(12, 12))
 
         # Centro galáctico
-        centro = plt.Circle((0, 0), 2.0, color='black', alpha=0.8, label='Buraco Negro Central')
+        centro = plt.Circle((0, 0), RAIO_BURACO_NEGRO, color='black', alpha=0.8, label='Buraco Negro Central')
         ax.add_patch(centro)
 
-        # Estrelas inertes (trajetórias)
-        for estrela in self.estrelas:
-            traj = estrela['trajetoria']
-            if len(traj) > 1:
-                x_traj, y_traj = zip(*traj)
-                ax.plot(x_traj, y_traj, 'b-', alpha=0.3, linewidth=1)
+        # Estrelas inertes: histórico (T, N, d) -> trajetórias (N, T, 2)
+        historico = np.asarray(self._historico_estrelas)
+        if len(historico) > 1:
+            colecao_trajetorias(ax, historico[:, :, :2].transpose(1, 0, 2), passo_trajetoria,
+                                color='blue', alpha=0.3, linewidth=1)
 
         # Posições finais das estrelas
-        for estrela in self.estrelas:
-            pos_final = estrela['trajetoria'][-1]
-            ax.scatter(pos_final[0], pos_final[1], color='blue', s=20, alpha=0.6)
+        ax.scatter(historico[-1, :, 0], historico[-1, :, 1], color='blue', s=20, alpha=0.6)
 
         # Agente consciente
         if self.agente_consciente:
             traj_agente = self.agente_consciente.trajetoria
             if len(traj_agente) > 1:
-                x_agent, y_agent = zip(*traj_agente)
-                ax.plot(x_agent, y_agent, 'r-', linewidth=3, label='Agente Consciente', alpha=0.8)
+                # Resolução da vista, a partir da pirâmide da trajetória
+                linha_lod(ax, obter_piramide(traj_agente), color='r', linewidth=3,
+                          label='Agente Consciente', alpha=0.8)
 
                 # Posição inicial
                 pos_inicial = traj_agente[0]
@@ -353,10 +867,10 @@ class GalaxiaConsciente:
         ax.add_patch(galaxia_circle)
 
         if salvar:
-            plt.savefig('images/galaxia_consciente_livre_arbitrio.png', dpi=300, bbox_inches='tight')
+            fig.savefig('images/galaxia_consciente_livre_arbitrio.png', dpi=dpi, bbox_inches='tight')
             print("💾 Figura salva: 'images/galaxia_consciente_livre_arbitrio.png'")
 
-        plt.show()
+        mostrar(fig)
 
 def demonstracao_livre_arbitrio():
     """
@@ -0,0 +1,253 @@
+"""
+Módulo de Galáxias em Lote: Ensembles de GalaxiaConsciente em um Array
+
+Estudos de ensemble precisam de centenas de realizações de
+GalaxiaConsciente (sementes e números de estrelas diferentes), cada uma
+com seu próprio objeto e laço Python. LoteGalaxias guarda G galáxias em
+arrays preenchidos (G, N_max, d), d = 2 ou 3, com parâmetros por galáxia
+(raio_galaxia, centro_massa), e avança todas em um único kernel
+vetorizado:
+
+- estrelas de todas as galáxias passam juntas pelo backend de força,
+  com massa central e passo de tempo por estrela;
+- estrelas capturadas pelo centro ou que saem da galáxia são congeladas
+  na posição do evento, com os raios de ConjuntoAtivo em GalaxiaConsciente
+  (dt = 0 pela máscara estrelas_ativas; os arrays preenchidos não são
+  compactados);
+- cada galáxia tem seu agente consciente (estado (G, d)) com a mesma
+  regra de GalaxiaConsciente._calcular_aceleracao_consciente;
+- máscaras de término por galáxia congelam as galáxias cujo agente
+  escapou, foi capturado pelo centro ou chegou ao objetivo, como o break
+  de simular_galaxia (mesmos raios, FATOR_ESCAPE e RAIO_ABSORCAO).
+
+O custo por passo cresce com o tamanho dos arrays, não com o número de
+objetos Python.
+"""
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from src.agente_consciente import RAIO_ABSORCAO
+from src.aleatorio import ProvedorAleatorio, obter_provedor
+from src.backend_forcas import obter_backend
+from src.galaxia_consciente import (FATOR_ESCAPE, RAIO_BURACO_NEGRO, completar_dimensao,
+                                    condicoes_iniciais_estrelas)
+
+ArrayOuFloat = Union[float, Sequence[float], np.ndarray]
+
+# Desfechos por galáxia
+DESFECHO_ATIVA = 0
+DESFECHO_ESCAPOU = 1
+DESFECHO_OBJETIVO = 2
+DESFECHO_CAPTURADO = 3
+
+DISTANCIA_OBJETIVO = 5.0
+
+
+class LoteGalaxias:
+    """
+    G galáxias conscientes simuladas em lote.
+
+    Atributos:
+    - posicoes, velocidades: Estrelas, shape (G, N_max, d)
+    - mascara_estrelas: Estrelas reais (False no preenchimento), (G, N_max)
+    - estrelas_ativas: Estrelas reais ainda não capturadas nem escapadas,
+      (G, N_max)
+    - posicoes_agente, velocidades_agente: Agentes, shape (G, d)
+    - objetivos: Objetivo de cada agente, shape (G, d)
+    - desfechos: DESFECHO_* por galáxia, shape (G,)
+    - passos_executados: Passos até o término de cada galáxia, shape (G,)
+    - aleatorio: Fonte do ruído dos agentes (ProvedorAleatorio)
+    """
+
+    def __init__(self, num_galaxias: int,
+                 num_estrelas: Union[int, Sequence[int]] = 50,
+                 raio_galaxia: ArrayOuFloat = 100.0,
+                 centro_massa: ArrayOuFloat = 1000.0,
+                 posicao_agente: Sequence = (20.0, 0.0),
+                 velocidade_agente: Sequence = (0.0, 2.0),
+                 forca_consciente: float = 0.5,
+                 temperatura: float = 0.1,
+                 sementes: Optional[Sequence[int]] = None,
+                 backend: str = 'numpy',
+                 dimensao: int = 2,
+                 inclinacao_maxima: float = 0.0,
+                 aleatorio: Optional[ProvedorAleatorio] = None):
+        """
+        Cria as galáxias com estrelas em órbitas estáveis e um agente cada.
+
+        Parameters:
+        -----------
+        num_galaxias : int
+            Número de galáxias G
+        num_estrelas : int or sequence
+            Estrelas por galáxia (escalar ou uma por galáxia)
+        raio_galaxia, centro_massa : float or sequence
+            Parâmetros por galáxia (escalar ou um por galáxia)
+        posicao_agente, velocidade_agente : sequence
+            Estado inicial dos agentes, shape (k,) ou (G, k), k <= d
+            (completado com z = 0 em 3D)
+        forca_consciente : float
+            Força consciente dos agentes (a de adicionar_agente_consciente)
+        temperatura : float
+            Desvio padrão do ruído de decisão dos agentes
+        sementes : sequence of int, optional
+            Semente dos ângulos iniciais de cada galáxia; sem sementes, os
+            ângulos vêm do gerador global em sequência (como criar G
+            GalaxiaConsciente uma após a outra)
+        backend : str
+            Backend do kernel de força ('numpy', 'numexpr' ou 'auto')
+        dimensao : int
+            2 ou 3 (ver GalaxiaConsciente)
+        inclinacao_maxima : float
+            Inclinação máxima das órbitas das estrelas em radianos (3D)
+        aleatorio : ProvedorAleatorio, optional
+            Fonte do ruído de decisão dos agentes (padrão: um provedor com
+            semente tirada de np.random, após as condições iniciais)
+        """
+        g = num_galaxias
+        self.num_galaxias = g
+        self.num_estrelas = np.broadcast_to(np.asarray(num_estrelas, dtype=int), (g,)).copy()
+        self.raio_galaxia = np.broadcast_to(np.asarray(raio_galaxia, dtype=float), (g,)).copy()
+        self.centro_massa = np.broadcast_to(np.asarray(centro_massa, dtype=float), (g,)).copy()
+        self.forca_consciente = forca_consciente
+        self.temperatura = temperatura
+        self.backend = obter_backend(backend)
+        self.dimensao = dimensao
+
+        n_max = int(self.num_estrelas.max())
+        self.mascara_estrelas = np.arange(n_max) < self.num_estrelas[:, None]
+        self.posicoes = np.zeros((g, n_max, dimensao))
+        self.velocidades = np.zeros((g, n_max, dimensao))
+
+        for k in range(g):
+            n = self.num_estrelas[k]
+            _, self.posicoes[k, :n], self.velocidades[k, :n] = condicoes_iniciais_estrelas(
+                n, self.raio_galaxia[k], float(self.centro_massa[k]),
+                None if sementes is None else sementes[k], dimensao, inclinacao_maxima)
+
+        # Massa central por estrela, para o kernel achatado (G*N_max, d)
+        self._massa_estrelas = np.repeat(self.centro_massa, n_max)
+        self.estrelas_ativas = self.mascara_estrelas.copy()
+        self._raio_escape2 = (self.raio_galaxia * FATOR_ESCAPE)[:, None] ** 2
+
+        self.posicoes_agente = np.array(np.broadcast_to(
+            completar_dimensao(posicao_agente, dimensao), (g, dimensao)))
+        self.velocidades_agente = np.array(np.broadcast_to(
+            completar_dimensao(velocidade_agente, dimensao), (g, dimensao)))
+
+        # Objetivo padrão: escapar para 1.5x o raio galáctico
+        direcao = self.posicoes_agente / np.linalg.norm(self.posicoes_agente, axis=1, keepdims=True)
+        self.objetivos = direcao * self.raio_galaxia[:, None] * 1.5
+
+        self.aleatorio = obter_provedor(aleatorio)
+        self.desfechos = np.full(g, DESFECHO_ATIVA)
+        self.passos_executados = np.zeros(g, dtype=int)
+        self.trajetorias_agente = [self.posicoes_agente.copy()]
+
+    @property
+    def ativas(self) -> np.ndarray:
+        """Máscara das galáxias ainda em simulação, shape (G,)."""
+        return self.desfechos == DESFECHO_ATIVA
+
+    def _aceleracao_agentes(self) -> np.ndarray:
+        """Aceleração consciente dos G agentes (regra de GalaxiaConsciente)."""
+        vetor_objetivo = self.objetivos - self.posicoes_agente
+        distancia_objetivo = np.linalg.norm(vetor_objetivo, axis=1, keepdims=True)
+        direcao_objetivo = vetor_objetivo / np.maximum(distancia_objetivo, 1e-300)
+
+        # Gravidade entrópica (vetor) e força consciente contra ela
+        forca_grav = self.backend.aceleracao(self.posicoes_agente, self.centro_massa)
+        forca_contra_grav = -forca_grav * self.forca_consciente
+        forca_para_objetivo = direcao_objetivo * self.forca_consciente * 0.5
+
+        ruido = self.aleatorio.normal(self.temperatura, self.posicoes_agente.shape)
+        aceleracao = forca_contra_grav + forca_para_objetivo + ruido
+        aceleracao[distancia_objetivo[:, 0] < DISTANCIA_OBJETIVO] = 0.0
+        return aceleracao
+
+    def passo(self, dt: float = 0.1) -> None:
+        """
+        Avança todas as galáxias ativas por dt; as terminadas ficam congeladas.
+        """
+        ativas = self.ativas
+        if not ativas.any():
+            return
+        dt_galaxias = dt * ativas
+
+        # Estrelas: um único kernel sobre (G*N_max, d), dt por estrela
+        # (zero nas galáxias terminadas e nas estrelas removidas)
+        dt_estrelas = dt_galaxias[:, None] * self.estrelas_ativas
+        self.backend.passo_euler(self.posicoes.reshape(-1, self.dimensao),
+                                 self.velocidades.reshape(-1, self.dimensao),
+                                 dt_estrelas.reshape(-1, 1),
+                                 self._massa_estrelas, lei='verlinde')
+
+        # Captura e escape de estrelas (regra de ConjuntoAtivo.detectar)
+        r2 = np.einsum('gnd,gnd->gn', self.posicoes, self.posicoes)
+        self.estrelas_ativas &= (r2 >= RAIO_BURACO_NEGRO ** 2) & (r2 <= self._raio_escape2)
+
+        # Agentes
+        aceleracao = self._aceleracao_agentes()
+        self.velocidades_agente += aceleracao * dt_galaxias[:, None]
+        self.posicoes_agente += self.velocidades_agente * dt_galaxias[:, None]
+        self.trajetorias_agente.append(self.posicoes_agente.copy())
+        self.passos_executados += ativas
+
+        # Término por galáxia
+        r_agente = np.linalg.norm(self.posicoes_agente, axis=1)
+        distancia = np.linalg.norm(self.objetivos - self.posicoes_agente, axis=1)
+        # Mesma ordem de GalaxiaConsciente._verificar_termino
+        escapou = ativas & (r_agente > self.raio_galaxia * FATOR_ESCAPE)
+        capturado = ativas & ~escapou & (r_agente < RAIO_ABSORCAO)
+        chegou = ativas & ~escapou & ~capturado & (distancia < DISTANCIA_OBJETIVO)
+        self.desfechos[escapou] = DESFECHO_ESCAPOU
+        self.desfechos[capturado] = DESFECHO_CAPTURADO
+        self.desfechos[chegou] = DESFECHO_OBJETIVO
+
+    def simular(self, passos: int = 1000, dt: float = 0.1) -> Dict:
+        """
+        Simula até passos ou até todas as galáxias terminarem.
+
+        Parameters:
+        -----------
+        passos : int
+            Número máximo de passos
+        dt : float
+            Passo de tempo
+
+        Returns:
+        --------
+        dict
+            Arrays por galáxia: 'sucesso_escape', 'sucesso_objetivo',
+            'livre_arbitrio_demonstrado', 'distancia_final',
+            'posicao_final_agente', 'passos_executados', 'estrelas_ativas'
+            (número por galáxia), 'desfechos' e
+            'trajetorias_agente' (T+1, G, d); após o término, a trajetória
+            de uma galáxia repete a posição final
+        """
+        for _ in range(passos):
+            if not self.ativas.any():
+                break
+            self.passo(dt)
+        return self.analisar_resultados()
+
+    def analisar_resultados(self) -> Dict:
+        """Resultados por galáxia no estado atual (ver simular)."""
+        r_final = np.linalg.norm(self.posicoes_agente, axis=1)
+        distancia = np.linalg.norm(self.objetivos - self.posicoes_agente, axis=1)
+        sucesso_escape = r_final > self.raio_galaxia * FATOR_ESCAPE
+        sucesso_objetivo = distancia < DISTANCIA_OBJETIVO
+        return {
+            'num_galaxias': self.num_galaxias,
+            'sucesso_escape': sucesso_escape,
+            'sucesso_objetivo': sucesso_objetivo,
+            'livre_arbitrio_demonstrado': sucesso_escape | sucesso_objetivo,
+            'distancia_final': r_final,
+            'posicao_final_agente': self.posicoes_agente.copy(),
+            'passos_executados': self.passos_executados.copy(),
+            'estrelas_ativas': self.estrelas_ativas.sum(axis=1),
+            'desfechos': self.desfechos.copy(),
+            'trajetorias_agente': np.array(self.trajetorias_agente),
+        }
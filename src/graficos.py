@@ -0,0 +1,171 @@
+"""
+Módulo de Gráficos: Importação Sob Demanda e Renderização Rápida
+
+O núcleo numérico (simulações, backends, workers de processos) não
+importa matplotlib: as funções de plotagem chamam pyplot(), que só então
+carrega matplotlib.pyplot. Assim, jobs em lote e workers que nunca
+plotam não pagam o tempo de importação nem dependem de um backend
+interativo.
+
+Para figuras com muitas trajetórias:
+- colecao_trajetorias desenha todas as trajetórias como uma única
+  LineCollection (um artista, em vez de um por estrela);
+- definir_modo_lote(True) força o backend Agg e faz mostrar() fechar a
+  figura em vez de abrir uma janela;
+- a resolução das figuras salvas é o parâmetro dpi das funções plotar_*
+  (padrão: DPI_PADRAO);
+- linha_lod desenha uma trajetória longa a partir da sua pirâmide de
+  níveis de detalhe (ver piramide_trajetorias), refazendo os vértices
+  na resolução da vista a cada zoom.
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+# Resolução padrão das figuras salvas
+DPI_PADRAO = 150
+
+_modo_lote = False
+
+
+def pyplot():
+    """
+    Importa matplotlib.pyplot na primeira chamada.
+
+    Returns:
+    --------
+    module
+        matplotlib.pyplot
+    """
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def definir_modo_lote(ativo: bool = True) -> None:
+    """
+    Ativa (ou desativa) o modo lote: backend Agg e nenhuma janela.
+
+    Parameters:
+    -----------
+    ativo : bool
+        Se True, mostrar() apenas fecha as figuras
+    """
+    global _modo_lote
+    _modo_lote = ativo
+    if ativo:
+        import matplotlib
+        matplotlib.use('Agg', force=True)
+
+
+def em_modo_lote() -> bool:
+    """Se o modo lote está ativo."""
+    return _modo_lote
+
+
+def mostrar(figura=None) -> None:
+    """
+    Mostra a figura (plt.show()) ou, no modo lote, apenas a fecha.
+
+    Parameters:
+    -----------
+    figura : matplotlib.figure.Figure, optional
+        Figura a fechar no modo lote (padrão: a figura atual)
+    """
+    plt = pyplot()
+    if _modo_lote:
+        plt.close(figura if figura is not None else plt.gcf())
+    else:
+        plt.show()
+
+
+def colecao_trajetorias(ax, trajetorias: Union[np.ndarray, Sequence[np.ndarray]],
+                        passo: Optional[int] = None, **estilo):
+    """
+    Desenha várias trajetórias como uma única LineCollection.
+
+    Parameters:
+    -----------
+    ax : matplotlib.axes.Axes
+        Eixos de destino
+    trajetorias : np.ndarray or sequence
+        Array (N, T, d) ou sequência de arrays (T_i, d); só x e y são
+        desenhados (trajetórias 3D são projetadas no plano xy)
+    passo : int, optional
+        Desenha apenas um ponto a cada passo (o último é mantido)
+    **estilo
+        Repassados à LineCollection (color, linewidth, alpha, label...)
+
+    Returns:
+    --------
+    matplotlib.collections.LineCollection
+        A coleção adicionada
+    """
+    from matplotlib.collections import LineCollection
+
+    if isinstance(trajetorias, np.ndarray):
+        segmentos = trajetorias[:, :, :2]
+        if passo is not None and passo > 1:
+            indices = np.unique(np.r_[np.arange(0, segmentos.shape[1], passo),
+                                      segmentos.shape[1] - 1])
+            segmentos = segmentos[:, indices]
+    else:
+        segmentos = []
+        for trajetoria in trajetorias:
+            trajetoria = np.asarray(trajetoria)[:, :2]
+            if passo is not None and passo > 1:
+                trajetoria = np.concatenate([trajetoria[:-1:passo], trajetoria[-1:]])
+            segmentos.append(trajetoria)
+
+    colecao = LineCollection(segmentos, **estilo)
+    ax.add_collection(colecao)
+    ax.autoscale_view()
+    return colecao
+
+
+def linha_lod(ax, piramide, pixels: Optional[int] = None, **estilo):
+    """
+    Desenha uma pirâmide de trajetória na resolução da vista.
+
+    A linha é atualizada quando os limites de x mudam (zoom, pan), com
+    custo proporcional aos pixels e não ao comprimento da trajetória.
+
+    Parameters:
+    -----------
+    ax : matplotlib.axes.Axes
+        Eixos de destino
+    piramide : PiramideSerie or PiramideCaminho
+        Pirâmide da trajetória (ver piramide_trajetorias.obter_piramide)
+    pixels : int, optional
+        Resolução pedida (padrão: largura dos eixos em pixels)
+    **estilo
+        Repassados a ax.plot
+
+    Returns:
+    --------
+    matplotlib.lines.Line2D
+        A linha desenhada
+    """
+    if pixels is None:
+        pixels = max(int(ax.get_window_extent().width), 1)
+    # Caminhos têm extensão 2D; séries são indexadas pelo passo
+    serie = not hasattr(piramide, 'extensao')
+
+    def vertices(xlim, ylim=None):
+        if serie:
+            return piramide.amostrar(*xlim, pixels)
+        janela = None if ylim is None else (*sorted(xlim), *sorted(ylim))
+        pontos = piramide.amostrar(abs(xlim[1] - xlim[0]) / pixels, janela)
+        return pontos[:, 0], pontos[:, 1]
+
+    if serie:
+        inicial = vertices((0, len(piramide)))
+    else:
+        inicial = vertices(piramide.extensao[:2])
+    linha, = ax.plot(*inicial, **estilo)
+
+    def atualizar(eixos):
+        linha.set_data(*vertices(eixos.get_xlim(), eixos.get_ylim()))
+
+    ax.callbacks.connect('xlim_changed', atualizar)
+    return linha
@@ -0,0 +1,204 @@
+"""
+Módulo de Instrumentação: Fases, Contadores e Observadores dos Laços
+
+Quando uma simulação fica lenta, é preciso saber para onde vai o tempo:
+passo das estrelas, decisões do agente, testes de término ou registro
+de trajetórias. Instrumentacao oferece:
+
+- cronômetros por fase (with instrumentacao.fase('estrelas'): ...);
+- contadores (avaliações de força, propostas e aceites de Metropolis);
+- passos por segundo entre iniciar() e finalizar();
+- observadores chamados a cada k passos (adicionar_observador);
+- cProfile ligado apenas durante as fases escolhidas.
+
+Os laços recebem por padrão INSTRUMENTACAO_NULA, cujos métodos não fazem
+nada: desativada, a instrumentação custa uma chamada vazia por fase.
+"""
+
+import contextlib
+import cProfile
+import io
+import pstats
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_CONTEXTO_NULO = contextlib.nullcontext()
+
+
+class Instrumentacao:
+    """
+    Tempos por fase, contadores e observadores de um laço de simulação.
+
+    Atributos:
+    - tempos: Segundos acumulados por fase
+    - chamadas: Entradas por fase
+    - contadores: Contadores por nome
+    - passos: Passos registrados (registrar_passo)
+    - perfil: cProfile.Profile das fases perfiladas (ou None)
+    """
+
+    ativo = True
+
+    def __init__(self, perfilar: Optional[Iterable[str]] = None):
+        """
+        Parameters:
+        -----------
+        perfilar : iterable of str, optional
+            Fases executadas sob cProfile (padrão: nenhuma)
+        """
+        self.tempos: Dict[str, float] = {}
+        self.chamadas: Dict[str, int] = {}
+        self.contadores: Dict[str, int] = {}
+        self.passos = 0
+        self.tempo_total = 0.0
+        self.fases_perfiladas = frozenset(perfilar or ())
+        self.perfil = cProfile.Profile() if self.fases_perfiladas else None
+        self._observadores: List[Tuple[int, Callable]] = []
+        self._inicio = None
+        self._perfilando = False
+
+    @contextlib.contextmanager
+    def fase(self, nome: str):
+        """Cronometra (e, se pedido, perfila) o bloco como a fase nome."""
+        perfilar = (self.perfil is not None and not self._perfilando
+                    and nome in self.fases_perfiladas)
+        if perfilar:
+            self._perfilando = True
+            self.perfil.enable()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            decorrido = time.perf_counter() - inicio
+            if perfilar:
+                self.perfil.disable()
+                self._perfilando = False
+            self.tempos[nome] = self.tempos.get(nome, 0.0) + decorrido
+            self.chamadas[nome] = self.chamadas.get(nome, 0) + 1
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        """Soma quantidade ao contador nome."""
+        self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def adicionar_observador(self, observador: Callable, intervalo: int = 1) -> None:
+        """
+        Registra um observador, chamado como observador(passo, contexto)
+        nos passos múltiplos de intervalo.
+
+        Parameters:
+        -----------
+        observador : callable
+            Recebe o passo e o objeto simulado (por exemplo, a galáxia)
+        intervalo : int
+            Passos entre chamadas
+        """
+        if intervalo < 1:
+            raise ValueError("O intervalo deve ser >= 1")
+        self._observadores.append((intervalo, observador))
+
+    def iniciar(self) -> None:
+        """Marca o início de uma execução (para passos por segundo)."""
+        self._inicio = time.perf_counter()
+
+    def finalizar(self) -> None:
+        """Marca o fim de uma execução; execuções sucessivas se acumulam."""
+        if self._inicio is not None:
+            self.tempo_total += time.perf_counter() - self._inicio
+            self._inicio = None
+
+    def registrar_passo(self, passo: int, contexto=None) -> None:
+        """Conta um passo e chama os observadores devidos."""
+        self.passos += 1
+        for intervalo, observador in self._observadores:
+            if passo % intervalo == 0:
+                observador(passo, contexto)
+
+    def relatorio(self) -> Dict:
+        """
+        Divisão do tempo por fase e contadores.
+
+        Returns:
+        --------
+        dict
+            'fases' (por fase: 'tempo_s', 'chamadas' e 'fracao' do tempo
+            total), 'contadores', 'passos', 'tempo_total_s',
+            'passos_por_segundo' e, se houver propostas de Metropolis,
+            'taxa_aceitacao'
+        """
+        total = self.tempo_total or sum(self.tempos.values())
+        fases = {
+            nome: {
+                'tempo_s': tempo,
+                'chamadas': self.chamadas[nome],
+                'fracao': tempo / total if total > 0 else 0.0,
+            }
+            for nome, tempo in sorted(self.tempos.items(), key=lambda item: -item[1])
+        }
+        relatorio = {
+            'fases': fases,
+            'contadores': dict(self.contadores),
+            'passos': self.passos,
+            'tempo_total_s': self.tempo_total,
+            'passos_por_segundo': self.passos / self.tempo_total if self.tempo_total > 0
+                                  else float('nan'),
+        }
+        propostas = self.contadores.get('metropolis_propostas', 0)
+        if propostas:
+            relatorio['taxa_aceitacao'] = self.contadores.get('metropolis_aceitos', 0) / propostas
+        return relatorio
+
+    def formatar_relatorio(self) -> str:
+        """Relatório como tabela de texto."""
+        relatorio = self.relatorio()
+        linhas = [f"{'fase':<20}{'tempo (s)':>12}{'chamadas':>10}{'fração':>9}"]
+        for nome, fase in relatorio['fases'].items():
+            linhas.append(f"{nome:<20}{fase['tempo_s']:>12.4f}{fase['chamadas']:>10}"
+                          f"{fase['fracao']:>9.1%}")
+        for nome, valor in relatorio['contadores'].items():
+            linhas.append(f"{nome:<30}{valor:>12}")
+        linhas.append(f"{'passos/s':<30}{relatorio['passos_por_segundo']:>12.4g}")
+        return '\n'.join(linhas)
+
+    def estatisticas_perfil(self, ordenar: str = 'cumulative', limite: int = 20) -> str:
+        """
+        Estatísticas do cProfile das fases perfiladas, como texto.
+
+        Parameters:
+        -----------
+        ordenar : str
+            Chave de ordenação do pstats
+        limite : int
+            Número de funções listadas
+        """
+        if self.perfil is None:
+            raise ValueError("Nenhuma fase perfilada (use Instrumentacao(perfilar=[...]))")
+        saida = io.StringIO()
+        pstats.Stats(self.perfil, stream=saida).sort_stats(ordenar).print_stats(limite)
+        return saida.getvalue()
+
+
+class _InstrumentacaoNula:
+    """Instrumentação desativada: todos os métodos são vazios."""
+
+    ativo = False
+
+    def fase(self, nome: str):
+        return _CONTEXTO_NULO
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        pass
+
+    def iniciar(self) -> None:
+        pass
+
+    def finalizar(self) -> None:
+        pass
+
+    def registrar_passo(self, passo: int, contexto=None) -> None:
+        pass
+
+    def relatorio(self) -> None:
+        return None
+
+
+INSTRUMENTACAO_NULA = _InstrumentacaoNula()
@@ -0,0 +1,173 @@
+"""
+Módulo de Integração Adaptativa: Passo de Tempo Variável para Agentes
+
+Perto do centro entrópico os termos 1/r² mudam rapidamente e o passo fixo
+de Euler ultrapassa a dinâmica real; longe do centro quase todos os
+passos são desperdiçados. Este módulo implementa um integrador de passo
+adaptativo para o AgenteConsciente com controle de erro:
+
+- Critério de aceleração: dt ≤ eta * sqrt(r / |a|)
+- Controle de erro: a variação relativa de densidade_entropica em um
+  passo não pode exceder a tolerância; passos rejeitados são refeitos
+  com dt menor (reaproveitando a mesma decisão consciente)
+
+Para manter o agente sincronizado com as estrelas da galáxia, o
+intervalo fixo das estrelas é dividido em subpassos adaptativos.
+"""
+
+import numpy as np
+from typing import Callable, List, Optional
+
+# Fatores de variação do passo entre passos consecutivos
+FATOR_CRESCIMENTO_MAX = 2.0
+FATOR_REDUCAO_REJEICAO = 0.5
+SEGURANCA = 0.9
+
+
+class IntegradorAdaptativo:
+    """
+    Integrador de Euler semi-implícito com passo de tempo adaptativo.
+
+    Atributos:
+    - historico_dt: Passos de tempo aceitos, em ordem
+    - passos_rejeitados: Número de tentativas rejeitadas pelo controle de erro
+    - tempo: Tempo total integrado
+    """
+
+    def __init__(self, tolerancia: float = 0.05,
+                 eta: float = 0.1,
+                 dt_min: float = 1e-4,
+                 dt_max: float = 1.0):
+        """
+        Inicializa o integrador adaptativo.
+
+        Parameters:
+        -----------
+        tolerancia : float
+            Variação relativa máxima de densidade_entropica por passo
+        eta : float
+            Fração do tempo dinâmico local sqrt(r/|a|) usada como passo
+        dt_min : float
+            Menor passo permitido (aceito mesmo acima da tolerância)
+        dt_max : float
+            Maior passo permitido
+        """
+        if not 0 < dt_min <= dt_max:
+            raise ValueError("É necessário 0 < dt_min <= dt_max")
+
+        self.tolerancia = tolerancia
+        self.eta = eta
+        self.dt_min = dt_min
+        self.dt_max = dt_max
+
+        self.historico_dt: List[float] = []
+        self.passos_rejeitados = 0
+        self.tempo = 0.0
+        self._dt_sugerido: Optional[float] = None
+
+    def _dt_por_aceleracao(self, posicao: np.ndarray, aceleracao: np.ndarray) -> float:
+        """Passo limitado pelo tempo dinâmico local sqrt(r/|a|)."""
+        modulo_a = np.linalg.norm(aceleracao)
+        if modulo_a == 0.0:
+            return self.dt_max
+        r = np.linalg.norm(posicao)
+        return self.eta * np.sqrt(max(r, self.dt_min) / modulo_a)
+
+    def passo(self, agente,
+              aceleracao_fn: Optional[Callable] = None,
+              dt_limite: Optional[float] = None) -> float:
+        """
+        Executa um único passo adaptativo do agente.
+
+        Parameters:
+        -----------
+        agente : AgenteConsciente
+            Agente a ser integrado (posição e velocidade atualizadas in-place)
+        aceleracao_fn : callable, optional
+            Função agente -> aceleração (padrão: decisão consciente do agente)
+        dt_limite : float, optional
+            Passo máximo para não ultrapassar um instante de sincronização
+
+        Returns:
+        --------
+        float
+            Passo de tempo efetivamente usado
+        """
+        if aceleracao_fn is None:
+            aceleracao = agente.decidir_movimento_consciente(agente.temperatura)
+        else:
+            aceleracao = aceleracao_fn(agente)
+
+        dt = self._dt_por_aceleracao(agente.posicao, aceleracao)
+        if self._dt_sugerido is not None:
+            dt = min(dt, self._dt_sugerido)
+        dt = min(max(dt, self.dt_min), self.dt_max)
+        # Passo encurtado só para chegar ao instante de sincronização
+        cortado = dt_limite is not None and dt_limite < dt
+        if cortado:
+            dt = dt_limite
+
+        entropia_atual = agente.densidade_entropica(agente.posicao)
+
+        # Controle de erro pela variação de densidade_entropica
+        while True:
+            nova_velocidade = agente.velocidade + aceleracao * dt
+            nova_posicao = agente.posicao + nova_velocidade * dt
+            entropia_nova = agente.densidade_entropica(nova_posicao)
+
+            escala = max(entropia_atual, entropia_nova)
+            erro = abs(entropia_nova - entropia_atual) / escala if escala > 0 else 0.0
+
+            if erro <= self.tolerancia or dt <= self.dt_min:
+                break
+            dt = max(dt * FATOR_REDUCAO_REJEICAO, self.dt_min)
+            self.passos_rejeitados += 1
+            cortado = False
+
+        agente.velocidade[:] = nova_velocidade
+        agente.posicao[:] = nova_posicao
+
+        # Sugestão para o próximo passo (controlador de ordem 1); um passo
+        # cortado por dt_limite mantém a sugestão anterior, senão o próximo
+        # intervalo recomeçaria do resto minúsculo até o instante sincronizado
+        if not cortado:
+            if erro > 0:
+                fator = SEGURANCA * (self.tolerancia / erro) ** 0.5
+                fator = min(fator, FATOR_CRESCIMENTO_MAX)
+            else:
+                fator = FATOR_CRESCIMENTO_MAX
+            self._dt_sugerido = dt * fator
+
+        self.historico_dt.append(dt)
+        self.tempo += dt
+        return dt
+
+    def avancar(self, agente, intervalo: float,
+                aceleracao_fn: Optional[Callable] = None) -> int:
+        """
+        Avança o agente exatamente por um intervalo, usando subpassos.
+
+        Usado para manter o agente sincronizado com o passo fixo das
+        estrelas da galáxia.
+
+        Parameters:
+        -----------
+        agente : AgenteConsciente
+            Agente a ser integrado
+        intervalo : float
+            Intervalo de tempo a cobrir
+        aceleracao_fn : callable, optional
+            Função agente -> aceleração
+
+        Returns:
+        --------
+        int
+            Número de subpassos executados
+        """
+        restante = intervalo
+        subpassos = 0
+        # Tolerância relativa para erros de arredondamento na soma dos dt
+        while restante > intervalo * 1e-12:
+            restante -= self.passo(agente, aceleracao_fn, dt_limite=restante)
+            subpassos += 1
+        return subpassos
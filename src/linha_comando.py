@@ -0,0 +1,432 @@
+"""
+Linha de Comando: Execuções em Lote sem Interface Gráfica
+
+Ponto de entrada único para as simulações, sem os textos e o plt.show()
+dos scripts de examples/:
+
+    python -m src.linha_comando galaxia --param num_estrelas=200 --saida resultados/
+    python -m src.linha_comando --config lote.toml --workers 8 --sem-grafico
+
+Simulações: 'queda_1d', 'orbita', 'curva_rotacao', 'comparacao_agente'
+e 'galaxia'. Os parâmetros vêm dos padrões (PARAMETROS_PADRAO), do
+arquivo de configuração (TOML ou JSON) e de --param chave=valor, nesta
+ordem de precedência crescente. O arquivo pode listar várias execuções:
+
+    simulacao = "orbita"
+    semente = 7
+
+    [parametros]
+    passos = 5000
+
+    [[execucoes]]
+    parametros = { modelo = "newton" }
+
+    [[execucoes]]
+    parametros = { modelo = "verlinde" }
+
+Cada execução grava, no diretório de saída, <rotulo>.npz (arrays),
+<rotulo>.json (simulação, semente, parâmetros, métricas e tempo) e, sem
+--sem-grafico, <rotulo>.png; resumo.json lista todas as execuções. As
+execuções são distribuídas em --workers processos; os gráficos são
+feitos no processo principal, com o backend Agg.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: apenas configurações JSON
+    tomllib = None
+
+from src.agente_consciente import comparar_agente_vs_materia_inerte
+from src.aleatorio import ProvedorAleatorio
+from src.galaxia_consciente import GalaxiaConsciente
+from src.graficos import DPI_PADRAO, definir_modo_lote, pyplot
+from src.instrumentacao import Instrumentacao
+from src.rotacao_galactica import calcular_curva_rotacao, simular_orbita
+from src.simulacao_1d import simular_queda_entropica
+
+# Parâmetros padrão de cada simulação
+PARAMETROS_PADRAO = {
+    'queda_1d': {
+        'posicao_inicial': 50.0,
+        'passos': 2000,
+        'temperatura': 0.1,
+    },
+    'orbita': {
+        'modelo': 'verlinde',
+        'raio_inicial': 50.0,
+        'passos': 1000,
+        'dt': 0.1,
+    },
+    'curva_rotacao': {
+        'raio_minimo': 5.0,
+        'raio_maximo': 100.0,
+        'pontos': 20,
+        'modelos': ['newton', 'verlinde'],
+    },
+    'comparacao_agente': {
+        'posicao_inicial': [10.0, 0.0],
+        'velocidade_inicial': [0.0, 1.0],
+        'passos': 500,
+    },
+    'galaxia': {
+        'raio_galaxia': 100.0,
+        'num_estrelas': 50,
+        'centro_massa': 1000.0,
+        'passos': 1000,
+        'dt': 0.1,
+        'dimensao': 2,
+        'inclinacao_maxima': 0.0,
+        'agente': True,
+        'posicao_agente': [20.0, 0.0],
+        'velocidade_agente': [0.0, 2.0],
+        'precisao': 'float64',
+    },
+}
+
+SEMENTE_PADRAO = 0
+
+
+def _executar_queda_1d(p: Dict[str, Any], semente: int) -> Tuple[Dict, Dict]:
+    instrumentacao = Instrumentacao()
+    trajetoria = simular_queda_entropica(p['posicao_inicial'], p['passos'], p['temperatura'],
+                                         instrumentacao=instrumentacao,
+                                         aleatorio=ProvedorAleatorio(semente))
+    relatorio = instrumentacao.relatorio()
+    return {'trajetoria': np.array(trajetoria)}, {
+        'passos_executados': len(trajetoria) - 1,
+        'posicao_final': float(trajetoria[-1]),
+        'taxa_aceitacao': relatorio.get('taxa_aceitacao'),
+    }
+
+
+def _executar_orbita(p: Dict[str, Any], semente: int) -> Tuple[Dict, Dict]:
+    x, y, velocidade_media = simular_orbita(p['modelo'], p['raio_inicial'], p['passos'], p['dt'])
+    return {'x': np.array(x), 'y': np.array(y)}, {
+        'velocidade_media': float(velocidade_media),
+        'raio_final': float(np.hypot(x[-1], y[-1])),
+    }
+
+
+def _executar_curva_rotacao(p: Dict[str, Any], semente: int) -> Tuple[Dict, Dict]:
+    raios = np.linspace(p['raio_minimo'], p['raio_maximo'], p['pontos'])
+    arrays = {'raios': raios}
+    metricas = {}
+    for modelo in p['modelos']:
+        velocidades = calcular_curva_rotacao(raios, modelo)
+        arrays[f'velocidade_{modelo}'] = velocidades
+        # Curva plana: razão próxima de 1
+        metricas[f'razao_borda_centro_{modelo}'] = float(velocidades[-1] / velocidades[0])
+    return arrays, metricas
+
+
+def _executar_comparacao_agente(p: Dict[str, Any], semente: int) -> Tuple[Dict, Dict]:
+    consciente, inerte = comparar_agente_vs_materia_inerte(
+        tuple(p['posicao_inicial']), tuple(p['velocidade_inicial']), p['passos'],
+        aleatorio=ProvedorAleatorio(semente))
+    consciente, inerte = np.array(consciente), np.array(inerte)
+    return {'trajetoria_consciente': consciente, 'trajetoria_inerte': inerte}, {
+        'distancia_final_consciente': float(np.linalg.norm(consciente[-1])),
+        'distancia_final_inerte': float(np.linalg.norm(inerte[-1])),
+    }
+
+
+def _executar_galaxia(p: Dict[str, Any], semente: int) -> Tuple[Dict, Dict]:
+    galaxia = GalaxiaConsciente(raio_galaxia=p['raio_galaxia'], num_estrelas=p['num_estrelas'],
+                                centro_massa=p['centro_massa'], semente=semente,
+                                dimensao=p['dimensao'], inclinacao_maxima=p['inclinacao_maxima'],
+                                precisao=p['precisao'])
+    if p['agente']:
+        galaxia.adicionar_agente_consciente(tuple(p['posicao_agente']),
+                                            tuple(p['velocidade_agente']),
+                                            aleatorio=ProvedorAleatorio(semente))
+    resultados = galaxia.simular_galaxia(passos=p['passos'], dt=p['dt'])
+
+    arrays = {'posicoes_finais': galaxia.posicoes.copy()}
+    metricas = {
+        'passos_executados': galaxia.passo_atual,
+        'estrelas_ativas': resultados['estrelas_ativas'],
+        'eventos': len(resultados['eventos']),
+    }
+    if resultados['agente_consciente'] is not None:
+        arrays['trajetoria_agente'] = np.array(resultados['agente_consciente']['trajetoria'])
+        metricas.update({
+            'distancia_final_agente': float(resultados['agente_consciente']['distancia_final']),
+            'sucesso_escape': bool(resultados['sucesso_escape']),
+            'sucesso_objetivo': bool(resultados['sucesso_objetivo']),
+        })
+    return arrays, metricas
+
+
+SIMULACOES: Dict[str, Callable[[Dict[str, Any], int], Tuple[Dict, Dict]]] = {
+    'queda_1d': _executar_queda_1d,
+    'orbita': _executar_orbita,
+    'curva_rotacao': _executar_curva_rotacao,
+    'comparacao_agente': _executar_comparacao_agente,
+    'galaxia': _executar_galaxia,
+}
+
+
+def carregar_configuracao(caminho: str) -> Dict[str, Any]:
+    """
+    Lê um arquivo de configuração TOML (.toml) ou JSON.
+
+    Parameters:
+    -----------
+    caminho : str
+        Caminho do arquivo
+
+    Returns:
+    --------
+    dict
+        Configuração: 'simulacao', 'semente', 'workers', 'saida',
+        'sem_grafico', 'dpi', 'parametros' e 'execucoes' (todos opcionais)
+    """
+    if caminho.endswith('.toml'):
+        if tomllib is None:
+            raise ValueError("Configurações TOML requerem Python >= 3.11; use JSON")
+        with open(caminho, 'rb') as arquivo:
+            return tomllib.load(arquivo)
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def montar_execucoes(configuracao: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expande uma configuração em execuções completas.
+
+    Cada item de 'execucoes' pode mudar 'simulacao', 'semente', 'rotulo'
+    e 'parametros'; sem semente própria, a execução i usa semente + i.
+
+    Parameters:
+    -----------
+    configuracao : dict
+        Configuração (ver carregar_configuracao)
+
+    Returns:
+    --------
+    list
+        Um dict por execução com 'rotulo', 'simulacao', 'semente' e
+        'parametros' (padrões completados)
+    """
+    semente_base = configuracao.get('semente', SEMENTE_PADRAO)
+    itens = configuracao.get('execucoes') or [{}]
+    execucoes = []
+    for i, item in enumerate(itens):
+        simulacao = item.get('simulacao', configuracao.get('simulacao'))
+        if simulacao not in SIMULACOES:
+            raise ValueError(f"Simulação desconhecida: {simulacao!r}. "
+                             f"Disponíveis: {list(SIMULACOES)}")
+        parametros = dict(PARAMETROS_PADRAO[simulacao])
+        for origem in (configuracao.get('parametros', {}), item.get('parametros', {})):
+            desconhecidos = set(origem) - set(parametros)
+            if desconhecidos:
+                raise ValueError(f"Parâmetros desconhecidos para {simulacao}: "
+                                 f"{sorted(desconhecidos)}")
+            parametros.update(origem)
+        execucoes.append({
+            'rotulo': item.get('rotulo', f'{simulacao}_{i:03d}'),
+            'simulacao': simulacao,
+            'semente': item.get('semente', semente_base + i),
+            'parametros': parametros,
+        })
+    return execucoes
+
+
+def executar(execucao: Dict[str, Any], verboso: bool = False) -> Dict[str, Any]:
+    """
+    Executa uma execução (função de topo, serializável para o pool).
+
+    Parameters:
+    -----------
+    execucao : dict
+        Item de montar_execucoes
+    verboso : bool
+        Se False, descarta o texto impresso pelas simulações
+
+    Returns:
+    --------
+    dict
+        A execução, com 'arrays', 'metricas' e 'tempo_s'
+    """
+    np.random.seed(execucao['semente'])
+    saida = contextlib.nullcontext() if verboso else contextlib.redirect_stdout(io.StringIO())
+    inicio = time.perf_counter()
+    with saida:
+        arrays, metricas = SIMULACOES[execucao['simulacao']](execucao['parametros'],
+                                                            execucao['semente'])
+    return dict(execucao, arrays=arrays, metricas=metricas,
+                tempo_s=time.perf_counter() - inicio)
+
+
+def _plotar(resultado: Dict[str, Any], caminho: str, dpi: int = DPI_PADRAO) -> None:
+    """Grava o gráfico de uma execução (backend Agg, sem janela)."""
+    definir_modo_lote()
+    plt = pyplot()
+
+    arrays = resultado['arrays']
+    simulacao = resultado['simulacao']
+    fig, ax = plt.subplots(figsize=(8, 6))
+    if simulacao == 'queda_1d':
+        ax.plot(arrays['trajetoria'])
+        ax.set_xlabel('Passo')
+        ax.set_ylabel('Posição')
+    elif simulacao == 'curva_rotacao':
+        for nome, valores in arrays.items():
+            if nome.startswith('velocidade_'):
+                ax.plot(arrays['raios'], valores, 'o-', label=nome[len('velocidade_'):])
+        ax.set_xlabel('Raio')
+        ax.set_ylabel('Velocidade orbital')
+        ax.legend()
+    else:
+        if simulacao == 'orbita':
+            ax.plot(arrays['x'], arrays['y'], lw=1)
+        elif simulacao == 'comparacao_agente':
+            for nome in ('trajetoria_consciente', 'trajetoria_inerte'):
+                ax.plot(*arrays[nome][:, :2].T, lw=1, label=nome[len('trajetoria_'):])
+            ax.legend()
+        else:
+            ax.scatter(*arrays['posicoes_finais'][:, :2].T, s=4, c='tab:blue')
+            if 'trajetoria_agente' in arrays:
+                ax.plot(*arrays['trajetoria_agente'][:, :2].T, 'r-', lw=1.5)
+        ax.scatter([0], [0], c='k', marker='x')
+        ax.set_aspect('equal')
+        ax.set_xlabel('x')
+        ax.set_ylabel('y')
+    ax.set_title(resultado['rotulo'])
+    ax.grid(True, alpha=0.3)
+    fig.savefig(caminho, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
+
+def _json_padrao(valor):
+    """Converte escalares NumPy para JSON."""
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def gravar_resultado(resultado: Dict[str, Any], diretorio: str, grafico: bool = True,
+                     dpi: int = DPI_PADRAO) -> Dict:
+    """
+    Grava os arquivos de uma execução no diretório de saída.
+
+    Parameters:
+    -----------
+    resultado : dict
+        Retorno de executar
+    diretorio : str
+        Diretório de saída
+    grafico : bool
+        Se grava também o gráfico
+    dpi : int
+        Resolução do gráfico
+
+    Returns:
+    --------
+    dict
+        Entrada do resumo: rótulo, simulação, semente, parâmetros,
+        métricas, tempo e arquivos gravados
+    """
+    base = os.path.join(diretorio, resultado['rotulo'])
+    np.savez_compressed(base + '.npz', **resultado['arrays'])
+    entrada = {chave: resultado[chave] for chave in ('rotulo', 'simulacao', 'semente',
+                                                     'parametros', 'metricas', 'tempo_s')}
+    entrada['arquivos'] = [base + '.npz', base + '.json']
+    if grafico:
+        _plotar(resultado, base + '.png', dpi)
+        entrada['arquivos'].append(base + '.png')
+    with open(base + '.json', 'w', encoding='utf-8') as arquivo:
+        json.dump(entrada, arquivo, indent=2, default=_json_padrao)
+    return entrada
+
+
+def _interpretar_valor(texto: str) -> Any:
+    """Valor de --param: JSON quando possível (números, listas, booleanos), senão texto."""
+    try:
+        return json.loads(texto)
+    except json.JSONDecodeError:
+        return texto
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Executa simulações em lote, sem interface gráfica.')
+    parser.add_argument('simulacao', nargs='?', choices=list(SIMULACOES),
+                        help='simulação (ou definida pela configuração)')
+    parser.add_argument('--config', help='arquivo de configuração TOML ou JSON')
+    parser.add_argument('--param', action='append', default=[], metavar='CHAVE=VALOR',
+                        help='sobrescreve um parâmetro (repetível)')
+    parser.add_argument('--semente', '--seed', type=int, help='semente base')
+    parser.add_argument('--workers', type=int,
+                        help='processos para as execuções (padrão: 1)')
+    parser.add_argument('--saida', '--output', help='diretório de saída (padrão: resultados_cli)')
+    parser.add_argument('--sem-grafico', '--no-plot', action='store_true', default=None,
+                        help='não gera gráficos')
+    parser.add_argument('--dpi', type=int, help=f'resolução dos gráficos (padrão: {DPI_PADRAO})')
+    parser.add_argument('--verboso', action='store_true',
+                        help='mostra o texto impresso pelas simulações')
+    args = parser.parse_args(argv)
+
+    configuracao = carregar_configuracao(args.config) if args.config else {}
+    if args.simulacao:
+        configuracao['simulacao'] = args.simulacao
+    if args.semente is not None:
+        configuracao['semente'] = args.semente
+    parametros = dict(configuracao.get('parametros', {}))
+    for atribuicao in args.param:
+        chave, separador, valor = atribuicao.partition('=')
+        if not separador:
+            parser.error(f"--param espera CHAVE=VALOR, não {atribuicao!r}")
+        parametros[chave.strip()] = _interpretar_valor(valor)
+    configuracao['parametros'] = parametros
+
+    try:
+        execucoes = montar_execucoes(configuracao)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    workers = args.workers or configuracao.get('workers', 1)
+    diretorio = args.saida or configuracao.get('saida', 'resultados_cli')
+    grafico = not (args.sem_grafico or configuracao.get('sem_grafico', False))
+    dpi = args.dpi or configuracao.get('dpi', DPI_PADRAO)
+    os.makedirs(diretorio, exist_ok=True)
+
+    if workers == 1 or len(execucoes) == 1:
+        resultados = (executar(e, args.verboso) for e in execucoes)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        resultados = pool.map(executar, execucoes, [args.verboso] * len(execucoes))
+
+    resumo = []
+    try:
+        for resultado in resultados:
+            entrada = gravar_resultado(resultado, diretorio, grafico, dpi)
+            resumo.append(entrada)
+            print(f"{entrada['rotulo']}: {json.dumps(entrada['metricas'], default=_json_padrao)} "
+                  f"({entrada['tempo_s']:.2f} s)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    caminho_resumo = os.path.join(diretorio, 'resumo.json')
+    with open(caminho_resumo, 'w', encoding='utf-8') as arquivo:
+        json.dump(resumo, arquivo, indent=2, default=_json_padrao)
+    print(f"Resumo: {caminho_resumo}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Módulo de Modelos de Massa: Perfis Radiais para Curvas de Rotação
+
+O módulo rotacao_galactica trata a galáxia como uma massa pontual
+(M_BURACO_NEGRO). Para comparar com curvas observadas, este módulo
+fornece perfis radiais de massa (disco exponencial, bojo de Hernquist ou
+Plummer, disco de gás e densidade tabulada pelo usuário).
+
+A massa encerrada M(<r) do modelo composto é calculada uma única vez em
+uma tabela em log r; depois disso, forca_newtoniana, forca_verlinde e a
+integração de órbitas consultam a tabela com custo de interpolação.
+
+Nota: os discos usam a aproximação esférica da massa encerrada no
+cilindro de raio r, M(<r) = M [1 - (1 + r/R_d) exp(-r/R_d)].
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+from scipy.integrate import cumulative_trapezoid
+from typing import Sequence, Union
+
+ArrayOuFloat = Union[float, np.ndarray]
+
+
+class PerfilMassa(ABC):
+    """
+    Componente de massa com simetria radial.
+
+    Subclasses implementam massa_encerrada(r) vetorizada.
+    """
+
+    @abstractmethod
+    def massa_encerrada(self, r: ArrayOuFloat) -> ArrayOuFloat:
+        """
+        Massa contida dentro do raio r.
+
+        Parameters:
+        -----------
+        r : float or np.ndarray
+            Distância do centro
+
+        Returns:
+        --------
+        float or np.ndarray
+            M(<r)
+        """
+
+    def __add__(self, outro: 'PerfilMassa') -> 'ModeloMassaComposto':
+        return ModeloMassaComposto([self, outro])
+
+
+class MassaPontual(PerfilMassa):
+    """Massa central concentrada em um ponto (buraco negro)."""
+
+    def __init__(self, massa: float = 1000.0):
+        self.massa = massa
+
+    def massa_encerrada(self, r: ArrayOuFloat) -> ArrayOuFloat:
+        return np.full_like(np.asarray(r, dtype=float), self.massa)[()]
+
+
+class DiscoExponencial(PerfilMassa):
+    """
+    Disco estelar exponencial, Σ(R) ∝ exp(-R/R_d).
+
+    Parameters:
+    -----------
+    massa : float
+        Massa total do disco
+    escala : float
+        Comprimento de escala R_d
+    """
+
+    def __init__(self, massa: float, escala: float):
+        self.massa = massa
+        self.escala = escala
+
+    def massa_encerrada(self, r: ArrayOuFloat) -> ArrayOuFloat:
+        x = np.asarray(r, dtype=float) / self.escala
+        return (self.massa * (1.0 - (1.0 + x) * np.exp(-x)))[()]
+
+
+class DiscoGas(DiscoExponencial):
+    """
+    Disco de gás: exponencial, tipicamente mais extenso que o estelar.
+
+    Parameters:
+    -----------
+    massa : float
+        Massa total de gás
+    escala : float
+        Comprimento de escala (padrão: 3x o de um disco estelar típico)
+    """
+
+    def __init__(self, massa: float, escala: float = 30.0):
+        super().__init__(massa, escala)
+
+
+class BojoHernquist(PerfilMassa):
+    """
+    Bojo de Hernquist, M(<r) = M r² / (r + a)².
+
+    Parameters:
+    -----------
+    massa : float
+        Massa total do bojo
+    escala : float
+        Raio de escala a
+    """
+
+    def __init__(self, massa: float, escala: float):
+        self.massa = massa
+        self.escala = escala
+
+    def massa_encerrada(self, r: ArrayOuFloat) -> ArrayOuFloat:
+        r = np.asarray(r, dtype=float)
+        return (self.massa * r ** 2 / (r + self.escala) ** 2)[()]
+
+
+class BojoPlummer(PerfilMassa):
+    """
+    Bojo de Plummer, M(<r) = M r³ / (r² + a²)^(3/2).
+
+    Parameters:
+    -----------
+    massa : float
+        Massa total do bojo
+    escala : float
+        Raio de escala a
+    """
+
+    def __init__(self, massa: float, escala: float):
+        self.massa = massa
+        self.escala = escala
+
+    def massa_encerrada(self, r: ArrayOuFloat) -> ArrayOuFloat:
+        r = np.asarray(r, dtype=float)
+        return (self.massa * r ** 3 / (r ** 2 + self.escala ** 2) ** 1.5)[()]
+
+
+class PerfilTabulado(PerfilMassa):
+    """
+    Densidade esférica ρ(r) fornecida pelo usuário em pontos tabulados.
+
+    A massa encerrada é integrada uma vez (4π r² ρ, regra do trapézio).
+    Abaixo do primeiro raio a densidade é suposta constante; acima do
+    último, a massa permanece constante.
+
+    Parameters:
+    -----------
+    raios : sequence
+        Raios tabulados (crescentes, positivos)
+    densidades : sequence
+        Densidade volumétrica em cada raio
+    """
+
+    def __init__(self, raios: Sequence[float], densidades: Sequence[float]):
+        raios = np.asarray(raios, dtype=float)
+        densidades = np.asarray(densidades, dtype=float)
+        if raios.ndim != 1 or raios.shape != densidades.shape or len(raios) < 2:
+            raise ValueError("raios e densidades devem ser vetores de mesmo tamanho (>= 2)")
+        if np.any(np.diff(raios) <= 0) or raios[0] <= 0:
+            raise ValueError("raios devem ser positivos e estritamente crescentes")
+
+        massa_nucleo = 4.0 / 3.0 * np.pi * raios[0] ** 3 * densidades[0]
+        self._raios = raios
+        self._massas = massa_nucleo + cumulative_trapezoid(
+            4.0 * np.pi * raios ** 2 * densidades, raios, initial=0.0)
+        self.massa = float(self._massas[-1])
+
+    def massa_encerrada(self, r: ArrayOuFloat) -> ArrayOuFloat:
+        r = np.asarray(r, dtype=float)
+        nucleo = self._massas[0] * (r / self._raios[0]) ** 3
+        return np.where(r < self._raios[0], nucleo,
+                        np.interp(r, self._raios, self._massas))[()]
+
+
+class ModeloMassaComposto(PerfilMassa):
+    """
+    Soma de componentes com M(<r) pré-calculada em uma tabela em log r.
+
+    A tabela é construída uma vez no construtor; consultas usam
+    interpolação linear em log r (monótona), sem reintegrar densidades.
+    Abaixo de r_min, a massa é a soma das massas encerradas dos próprios
+    componentes (cada um com a sua lei; uma MassaPontual continua
+    constante); acima de r_max, a massa é a total tabelada.
+    """
+
+    def __init__(self, componentes: Sequence[PerfilMassa],
+                 r_min: float = 1e-2,
+                 r_max: float = 1e4,
+                 pontos: int = 4096):
+        """
+        Parameters:
+        -----------
+        componentes : sequence
+            Perfis de massa a somar
+        r_min, r_max : float
+            Intervalo tabelado
+        pontos : int
+            Número de pontos da tabela (espaçamento uniforme em log r)
+        """
+        self.componentes = list(componentes)
+        self.r_min = r_min
+        self.r_max = r_max
+
+        self._log_raios = np.linspace(np.log(r_min), np.log(r_max), pontos)
+        raios = np.exp(self._log_raios)
+        self._massas = sum(np.asarray(c.massa_encerrada(raios), dtype=float)
+                           for c in self.componentes)
+        self.massa = float(self._massas[-1])
+
+    def massa_encerrada(self, r: ArrayOuFloat) -> ArrayOuFloat:
+        r = np.asarray(r, dtype=float)
+        with np.errstate(divide='ignore'):
+            log_r = np.log(r)
+        massas = np.interp(log_r, self._log_raios, self._massas)
+        abaixo = r < self.r_min
+        if np.any(abaixo):
+            proprias = sum(np.asarray(c.massa_encerrada(r), dtype=float)
+                           for c in self.componentes)
+            massas = np.where(abaixo, proprias, massas)
+        return np.asarray(massas)[()]
+
+    def __add__(self, outro: PerfilMassa) -> 'ModeloMassaComposto':
+        return ModeloMassaComposto(self.componentes + [outro],
+                                   self.r_min, self.r_max, len(self._log_raios))
@@ -0,0 +1,326 @@
+"""
+Módulo de Monitor Orbital: Revoluções, Período e Precessão em Tempo Real
+
+simular_orbita e as estrelas inertes sempre executam todos os passos,
+mesmo quando as órbitas já fecharam e nada novo vai acontecer.
+MonitorOrbital acompanha N órbitas (N, d) durante a integração:
+
+- o azimute de cada corpo é desenrolado passo a passo (incrementos por
+  atan2 no plano da órbita), contando revoluções completas;
+- pericentros e apocentros são detectados como extremos locais do raio,
+  com tempo e azimute refinados por uma parábola nos três últimos
+  registros;
+- a partir deles, período azimutal, período radial, precessão por
+  período radial e faixa de raios.
+
+A integração pode parar após um número pedido de órbitas ou quando essas
+medidas convergem de uma revolução para a seguinte (ver concluido).
+validar_curva_rotacao usa o monitor para medir a curva de rotação
+integrando órbitas só até a resposta estar determinada.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.backend_forcas import INTEGRADOR_PADRAO, integrar_orbitas, obter_backend
+from src.rotacao_galactica import velocidade_orbital_estavel
+
+DOIS_PI = 2.0 * np.pi
+
+# Revoluções mínimas antes de testar a convergência
+ORBITAS_MINIMAS = 2
+
+
+class MonitorOrbital:
+    """
+    Análise incremental de N órbitas em um campo central.
+
+    O primeiro registro (atualizar) define o estado inicial. Os
+    incrementos de azimute entre registros devem ser menores que meia
+    volta.
+
+    Atributos:
+    - orbitas: Revoluções que encerram a integração (ou None)
+    - tolerancia: Variação relativa que caracteriza convergência (ou None)
+    - revolucoes: Revoluções azimutais completas por corpo, shape (N,)
+    - tempo: Tempo do último registro
+    """
+
+    def __init__(self, orbitas: Optional[float] = None,
+                 tolerancia: Optional[float] = None,
+                 orbitas_minimas: int = ORBITAS_MINIMAS):
+        """
+        Parameters:
+        -----------
+        orbitas : float, optional
+            Encerrar quando todos os corpos ativos completarem este número
+            de revoluções
+        tolerancia : float, optional
+            Encerrar quando período, precessão e faixa de raios de todos os
+            corpos ativos variarem menos que isto (relativo) entre duas
+            revoluções
+        orbitas_minimas : int
+            Revoluções mínimas antes de testar a convergência
+        """
+        self.orbitas = orbitas
+        self.tolerancia = tolerancia
+        self.orbitas_minimas = orbitas_minimas
+        self.revolucoes = None
+
+    def _iniciar(self, tempo: float, posicoes: np.ndarray) -> None:
+        n = len(posicoes)
+        self.tempo_inicial = tempo
+        self.tempo = tempo
+        self._posicao_anterior = posicoes.copy()
+        self._tempos = [tempo, tempo]        # dois registros anteriores
+        r = np.sqrt(np.einsum('ij,ij->i', posicoes, posicoes))
+        self._raios = [r, r]
+        self._azimutes = [np.zeros(n), np.zeros(n)]
+        self.azimute = np.zeros(n)
+        self.revolucoes = np.zeros(n, dtype=np.int64)
+        self.raio_minimo = r.copy()
+        self.raio_maximo = r.copy()
+        self.periodo = np.full(n, np.nan)
+        self.periodo_radial = np.full(n, np.nan)
+        self.precessao = np.full(n, np.nan)
+        self.convergido = np.zeros(n, dtype=bool)
+        self._pericentros = np.zeros(n, dtype=np.int64)
+        self._tempo_pericentro = np.full(n, np.nan)
+        self._azimute_pericentro = np.full(n, np.nan)
+        self._medidas_revolucao = None
+        self._eixos = None
+        self._registros = 1
+
+    def atualizar(self, tempo: float, posicoes: np.ndarray,
+                  ativos: Optional[np.ndarray] = None) -> bool:
+        """
+        Registra o estado das órbitas em um instante.
+
+        Parameters:
+        -----------
+        tempo : float
+            Tempo do estado
+        posicoes : np.ndarray
+            Posições, shape (N, d)
+        ativos : np.ndarray, optional
+            Máscara (N,) dos corpos que contam para o término (padrão: todos)
+
+        Returns:
+        --------
+        bool
+            Se a integração pode ser encerrada (ver concluido)
+        """
+        posicoes = np.asarray(posicoes, dtype=float)
+        self._ativos = ativos
+        self.tempo = tempo
+        if self.revolucoes is None:
+            self._iniciar(tempo, posicoes)
+            return self.concluido
+
+        # Incremento de azimute entre registros, no plano da órbita
+        anterior = self._posicao_anterior
+        produto = np.einsum('ij,ij->i', anterior, posicoes)
+        if posicoes.shape[1] == 2:
+            vetorial = anterior[:, 0] * posicoes[:, 1] - anterior[:, 1] * posicoes[:, 0]
+        else:
+            normal = np.cross(anterior, posicoes)
+            if self._eixos is None:
+                # Sentido de giro fixado no primeiro deslocamento
+                norma = np.linalg.norm(normal, axis=1, keepdims=True)
+                self._eixos = np.where(norma > 0, normal / np.where(norma > 0, norma, 1.0), 0.0)
+            vetorial = np.einsum('ij,ij->i', normal, self._eixos)
+        azimute_anterior = self.azimute
+        self.azimute = azimute_anterior + np.arctan2(vetorial, produto)
+        self._posicao_anterior[:] = posicoes
+
+        r = np.sqrt(np.einsum('ij,ij->i', posicoes, posicoes))
+        np.minimum(self.raio_minimo, r, out=self.raio_minimo)
+        np.maximum(self.raio_maximo, r, out=self.raio_maximo)
+
+        anteriores = self._tempos[0], self._raios[0], self._azimutes[0]
+        self._tempos = [self._tempos[1], tempo]
+        self._raios = [self._raios[1], r]
+        self._azimutes = [self._azimutes[1], self.azimute]
+        self._registros += 1
+        if self._registros >= 3:
+            self._detectar_extremos(anteriores)
+        self._detectar_revolucoes(azimute_anterior, tempo)
+        return self.concluido
+
+    def _detectar_extremos(self, anteriores) -> None:
+        """Pericentros e apocentros no registro do meio dos três últimos."""
+        t0, r0, azimute0 = anteriores
+        t1, t2 = self._tempos
+        r1, r2 = self._raios
+        minimo = (r1 < r0) & (r1 <= r2)
+        maximo = (r1 > r0) & (r1 >= r2)
+        corpos = np.flatnonzero(minimo | maximo)
+        if len(corpos) == 0:
+            return
+
+        # Parábola r(s) = r1 + b s + a s², s = t - t1, pelos três registros
+        s0, s2 = t0 - t1, t2 - t1
+        inclinacao0 = (r0[corpos] - r1[corpos]) / s0
+        inclinacao2 = (r2[corpos] - r1[corpos]) / s2
+        a = (inclinacao0 - inclinacao2) / (s0 - s2)
+        b = inclinacao0 - a * s0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = np.clip(np.where(a != 0, -b / (2 * a), 0.0), s0, s2)
+        raio = r1[corpos] + b * s + a * s * s
+        omega = (self._azimutes[1][corpos] - azimute0[corpos]) / (s2 - s0)
+        azimute = self._azimutes[0][corpos] + omega * s
+        tempo = t1 + s
+
+        np.minimum.at(self.raio_minimo, corpos, raio)
+        np.maximum.at(self.raio_maximo, corpos, raio)
+
+        pericentro = minimo[corpos]
+        ids = corpos[pericentro]
+        if len(ids) == 0:
+            return
+        anteriores_validos = self._pericentros[ids] > 0
+        validos = ids[anteriores_validos]
+        self.periodo_radial[validos] = (tempo[pericentro][anteriores_validos]
+                                        - self._tempo_pericentro[validos])
+        self.precessao[validos] = (np.abs(azimute[pericentro][anteriores_validos]
+                                          - self._azimute_pericentro[validos]) - DOIS_PI)
+        self._tempo_pericentro[ids] = tempo[pericentro]
+        self._azimute_pericentro[ids] = azimute[pericentro]
+        self._pericentros[ids] += 1
+
+    def _detectar_revolucoes(self, azimute_anterior: np.ndarray, tempo: float) -> None:
+        """Revoluções completadas neste registro: período e convergência."""
+        voltas = (np.abs(self.azimute) // DOIS_PI).astype(np.int64)
+        corpos = np.flatnonzero(voltas > self.revolucoes)
+        if len(corpos) == 0:
+            return
+
+        # Instante do cruzamento de k voltas, por interpolação linear
+        t_anterior = self._tempos[0]
+        inicio = np.abs(azimute_anterior[corpos])
+        fim = np.abs(self.azimute[corpos])
+        k = voltas[corpos]
+        fracao = (k * DOIS_PI - inicio) / (fim - inicio)
+        t_cruzamento = t_anterior + fracao * (tempo - t_anterior)
+        self.revolucoes[corpos] = k
+        self.periodo[corpos] = (t_cruzamento - self.tempo_inicial) / k
+
+        # Convergência: medidas desta revolução contra as da anterior
+        medidas = np.stack([self.periodo, self.precessao / DOIS_PI,
+                            self.raio_minimo, self.raio_maximo])
+        if self._medidas_revolucao is None:
+            self._medidas_revolucao = np.full_like(medidas, np.nan)
+        if self.tolerancia is not None:
+            novas = medidas[:, corpos]
+            antigas = self._medidas_revolucao[:, corpos]
+            with np.errstate(invalid='ignore'):
+                proximas = ((np.abs(novas - antigas) <= self.tolerancia * np.abs(novas))
+                            | (np.isnan(novas) & np.isnan(antigas)))
+            # A precessão é comparada em voltas, não relativamente
+            with np.errstate(invalid='ignore'):
+                proximas[1] = ((np.abs(novas[1] - antigas[1]) <= self.tolerancia)
+                               | (np.isnan(novas[1]) & np.isnan(antigas[1])))
+            self.convergido[corpos] = proximas.all(axis=0) & (k >= self.orbitas_minimas)
+        self._medidas_revolucao[:, corpos] = medidas[:, corpos]
+
+    @property
+    def concluido(self) -> bool:
+        """
+        Se todos os corpos ativos completaram as órbitas pedidas ou
+        convergiram (sempre False sem orbitas nem tolerancia).
+        """
+        if self.revolucoes is None or (self.orbitas is None and self.tolerancia is None):
+            return False
+        ativos = slice(None) if self._ativos is None else self._ativos
+        if self.orbitas is not None and np.all(self.revolucoes[ativos] >= self.orbitas):
+            return True
+        return self.tolerancia is not None and bool(np.all(self.convergido[ativos]))
+
+    def resultados(self) -> Dict:
+        """
+        Medidas por corpo no estado atual.
+
+        Returns:
+        --------
+        dict
+            Arrays (N,): 'revolucoes', 'azimute' (desenrolado),
+            'periodo' (azimutal), 'periodo_radial', 'precessao' (radianos
+            por período radial), 'raio_minimo', 'raio_maximo',
+            'convergido'; e 'concluido'. Medidas ainda indefinidas são nan.
+        """
+        if self.revolucoes is None:
+            raise RuntimeError("Nenhum estado registrado")
+        return {
+            'revolucoes': self.revolucoes.copy(),
+            'azimute': self.azimute.copy(),
+            'periodo': self.periodo.copy(),
+            'periodo_radial': self.periodo_radial.copy(),
+            'precessao': self.precessao.copy(),
+            'raio_minimo': self.raio_minimo.copy(),
+            'raio_maximo': self.raio_maximo.copy(),
+            'convergido': self.convergido.copy(),
+            'concluido': self.concluido,
+        }
+
+
+def validar_curva_rotacao(raios: np.ndarray,
+                          lei: str = 'verlinde',
+                          massa: Optional[float] = None,
+                          orbitas: float = 1,
+                          dt: Optional[float] = None,
+                          passos_maximos: int = 100000,
+                          integrador: str = INTEGRADOR_PADRAO) -> Dict:
+    """
+    Mede a curva de rotação integrando órbitas circulares até fecharem.
+
+    Cada raio parte em órbita circular com velocidade_orbital_estavel; a
+    velocidade medida é 2πr̄/T, com T o período azimutal e r̄ o raio
+    médio. A integração para assim que todas as órbitas completam as
+    revoluções pedidas.
+
+    Parameters:
+    -----------
+    raios : np.ndarray
+        Raios iniciais
+    lei : str
+        'verlinde' ou 'newton'
+    massa : float, optional
+        Massa central (padrão: M_BURACO_NEGRO)
+    orbitas : float
+        Revoluções a completar
+    dt : float, optional
+        Passo de tempo (padrão: 1/200 do menor período circular)
+    passos_maximos : int
+        Limite de passos
+    integrador : str
+        'euler_semi_implicito' ou 'leapfrog'
+
+    Returns:
+    --------
+    dict
+        'velocidade_prevista', 'velocidade_medida', 'erro_relativo',
+        'periodo' (arrays por raio), 'passos' e 'concluido'
+    """
+    raios = np.atleast_1d(np.asarray(raios, dtype=float))
+    v_prevista = velocidade_orbital_estavel(raios, lei, massa)
+    if dt is None:
+        dt = float(np.min(DOIS_PI * raios / v_prevista)) / 200.0
+
+    posicoes = np.column_stack([raios, np.zeros_like(raios)])
+    velocidades = np.column_stack([np.zeros_like(raios), v_prevista])
+    monitor = MonitorOrbital(orbitas=orbitas)
+    integrar_orbitas(posicoes, velocidades, passos_maximos, dt, lei, massa,
+                     obter_backend('numpy'), integrador, monitor=monitor)
+
+    medidas = monitor.resultados()
+    raio_medio = 0.5 * (medidas['raio_minimo'] + medidas['raio_maximo'])
+    v_medida = DOIS_PI * raio_medio / medidas['periodo']
+    return {
+        'velocidade_prevista': v_prevista,
+        'velocidade_medida': v_medida,
+        'erro_relativo': np.abs(v_medida - v_prevista) / v_prevista,
+        'periodo': medidas['periodo'],
+        'passos': int(round(monitor.tempo / dt)),
+        'concluido': medidas['concluido'],
+    }
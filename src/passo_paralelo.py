@@ -0,0 +1,274 @@
+"""
+Módulo de Passo Paralelo: Estrelas em Memória Compartilhada
+
+Para galáxias com 10^6+ estrelas, um único processo não aproveita
+máquinas com muitos núcleos, e enviar os arrays de estrelas aos workers
+a cada passo (pickle) anula qualquer ganho. Aqui, posições e velocidades
+vivem em multiprocessing.shared_memory:
+
+- cada processo worker é dono de uma fatia contígua de estrelas e a
+  atualiza in-place com o kernel de backend_forcas;
+- o processo principal apenas envia o dt a cada worker e aguarda as
+  respostas por Pipes (uma mensagem de cada lado por passo), sem copiar
+  dados;
+- entre a liberação e a espera, o processo principal fica livre para
+  atualizar o agente consciente;
+- corpos removidos (capturados ou ejetados) são congelados por uma
+  máscara também compartilhada;
+- a espera acompanha também o término dos processos (sentinelas) e tem
+  tempo limite: um worker que morre vira RuntimeError, e os demais
+  workers e a memória compartilhada são liberados;
+- um executor descartado sem fechar() é liberado pelo seu finalizador
+  (weakref.finalize).
+
+Uma barreira (multiprocessing.Barrier) não serve aqui: se um worker
+parado nela morre, abort() e o tempo limite bloqueiam o processo
+principal esperando que o morto confirme o despertar.
+
+Como a força é central (sem interação entre estrelas), as fatias são
+independentes e o ganho é aproximadamente linear no número de núcleos.
+"""
+
+import multiprocessing
+import time
+import weakref
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from typing import List, Optional
+
+import numpy as np
+
+from src import rotacao_galactica
+from src.backend_forcas import BackendNumpy, LEIS_SUPORTADAS
+from src.precisao import dtype_estado
+
+# Espera máxima (s) do processo principal por um passo dos workers
+TEMPO_LIMITE_PASSO = 60.0
+
+# Espera máxima (s) pelo término de um worker antes de terminate()
+TEMPO_ENCERRAMENTO = 5.0
+
+
+def _laco_worker(nomes: tuple, forma: tuple, dtype: str, inicio: int, fim: int,
+                 conexao, lei: str, massa: float) -> None:
+    """Laço de um worker: um passo da sua fatia a cada dt recebido (None encerra)."""
+    memorias = [shared_memory.SharedMemory(name=nome) for nome in nomes]
+    try:
+        posicoes = np.ndarray(forma, dtype=dtype, buffer=memorias[0].buf)[inicio:fim]
+        velocidades = np.ndarray(forma, dtype=dtype, buffer=memorias[1].buf)[inicio:fim]
+        ativas = np.ndarray(forma[:1], dtype=np.float64, buffer=memorias[2].buf)[inicio:fim]
+        dt_linhas = np.empty((fim - inicio, 1), dtype=dtype)
+        backend = BackendNumpy()
+        while True:
+            try:
+                dt = conexao.recv()
+            except EOFError:
+                break  # processo principal encerrado
+            if dt is None:
+                break
+            # Corpos congelados (ativas = 0) não se movem
+            np.multiply(ativas, dt, out=dt_linhas[:, 0])
+            backend.passo_euler(posicoes, velocidades, dt_linhas, massa, lei)
+            conexao.send(True)
+    finally:
+        # Views precisam ser liberadas antes de fechar os segmentos
+        posicoes = velocidades = ativas = None
+        for memoria in memorias:
+            memoria.close()
+
+
+def _liberar_recursos(processos: List, conexoes: List, memorias: List) -> None:
+    """Encerra os workers e libera a memória compartilhada (via weakref.finalize)."""
+    try:
+        for conexao in conexoes:
+            try:
+                conexao.send(None)
+            except OSError:
+                pass  # worker já terminou
+        for processo in processos:
+            processo.join(TEMPO_ENCERRAMENTO)
+    finally:
+        for processo in processos:
+            if processo.is_alive():
+                processo.terminate()
+                processo.join(TEMPO_ENCERRAMENTO)
+        for conexao in conexoes:
+            conexao.close()
+        for memoria in memorias:
+            try:
+                memoria.close()
+            except BufferError:
+                pass  # ainda há views do estado; o mapeamento some com elas
+            try:
+                memoria.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class ExecutorParaleloEstrelas:
+    """
+    Avança estrelas em paralelo sobre arrays em memória compartilhada.
+
+    Uso:
+        with ExecutorParaleloEstrelas(posicoes, velocidades, workers=8) as executor:
+            executor.iniciar_passo(dt)
+            ...  # trabalho no processo principal
+            executor.aguardar_passo()
+            executor.posicoes  # estado atualizado (view da memória compartilhada)
+
+    Atributos:
+    - posicoes, velocidades: Arrays (N, d) na memória compartilhada
+    - ativas: Máscara (N,) compartilhada (1.0 ativa, 0.0 congelada)
+    - workers: Número de processos worker
+    - tempo_limite: Espera máxima (s) por um passo dos workers
+    """
+
+    def __init__(self, posicoes: np.ndarray,
+                 velocidades: np.ndarray,
+                 workers: Optional[int] = None,
+                 lei: str = 'verlinde',
+                 massa: Optional[float] = None,
+                 ativas: Optional[np.ndarray] = None,
+                 tempo_limite: float = TEMPO_LIMITE_PASSO):
+        """
+        Copia o estado para a memória compartilhada e inicia os workers.
+
+        Parameters:
+        -----------
+        posicoes, velocidades : np.ndarray
+            Estado inicial das estrelas, shape (N, d); float32 é mantido
+            (ver precisao), outros tipos viram float64
+        workers : int, optional
+            Número de processos (padrão: núcleos disponíveis, no máximo N)
+        lei : str
+            'verlinde' ou 'newton'
+        massa : float, optional
+            Massa central (padrão: M_BURACO_NEGRO no momento da criação)
+        ativas : np.ndarray, optional
+            Máscara booleana (N,) dos corpos que se movem (padrão: todos)
+        tempo_limite : float
+            Espera máxima (s) por um passo antes de considerar os workers
+            travados
+        """
+        if lei not in LEIS_SUPORTADAS:
+            raise ValueError(f"Lei deve ser uma de {LEIS_SUPORTADAS}")
+        dtype = dtype_estado(posicoes)
+        posicoes = np.asarray(posicoes, dtype=dtype)
+        velocidades = np.asarray(velocidades, dtype=dtype)
+        if posicoes.ndim != 2 or posicoes.shape != velocidades.shape:
+            raise ValueError("posicoes e velocidades devem ter o mesmo shape (N, d)")
+
+        n = len(posicoes)
+        self.workers = max(1, min(workers or multiprocessing.cpu_count(), n))
+        self.tempo_limite = tempo_limite
+        if massa is None:
+            massa = rotacao_galactica.M_BURACO_NEGRO
+
+        tamanhos = (posicoes.nbytes, posicoes.nbytes, 8 * n)
+        self._memorias = [shared_memory.SharedMemory(create=True, size=max(tamanho, 1))
+                          for tamanho in tamanhos]
+        self.posicoes = np.ndarray(posicoes.shape, dtype=dtype, buffer=self._memorias[0].buf)
+        self.velocidades = np.ndarray(posicoes.shape, dtype=dtype, buffer=self._memorias[1].buf)
+        self.ativas = np.ndarray((n,), dtype=np.float64, buffer=self._memorias[2].buf)
+        self.posicoes[:] = posicoes
+        self.velocidades[:] = velocidades
+        self.ativas[:] = 1.0 if ativas is None else ativas
+
+        contexto = multiprocessing.get_context()
+        self._em_andamento = False
+        self._processos = []
+        self._conexoes = []
+        # Libera workers e memória mesmo sem fechar() (coleta ou saída)
+        self._finalizador = weakref.finalize(self, _liberar_recursos, self._processos,
+                                             self._conexoes, self._memorias)
+
+        limites = np.linspace(0, n, self.workers + 1).astype(int)
+        nomes = tuple(m.name for m in self._memorias)
+        for k in range(self.workers):
+            principal, filho = contexto.Pipe()
+            processo = contexto.Process(target=_laco_worker, daemon=True,
+                                        args=(nomes, posicoes.shape, dtype.name,
+                                              int(limites[k]), int(limites[k + 1]),
+                                              filho, lei, float(massa)))
+            processo.start()
+            filho.close()
+            self._processos.append(processo)
+            self._conexoes.append(principal)
+
+    def _falhar(self, erro: Optional[BaseException] = None) -> None:
+        """Libera o executor e relata os workers que terminaram."""
+        processos = self._processos
+        self._liberar()
+        falhas = [f"worker {k} (código {processo.exitcode})"
+                  for k, processo in enumerate(processos) if processo.exitcode]
+        if falhas:
+            mensagem = "Passo paralelo interrompido, terminaram: " + ", ".join(falhas)
+        else:
+            mensagem = f"Passo paralelo excedeu o tempo limite de {self.tempo_limite} s"
+        raise RuntimeError(mensagem) from erro
+
+    def _liberar(self) -> None:
+        """Descarta as views e libera workers e memória compartilhada."""
+        self._processos = None
+        self._em_andamento = False
+        self.posicoes = self.velocidades = self.ativas = None
+        self._finalizador()
+
+    def iniciar_passo(self, dt: float) -> None:
+        """Libera os workers para um passo dt (retorna imediatamente)."""
+        if self._processos is None:
+            raise RuntimeError("Executor já foi fechado")
+        try:
+            for conexao in self._conexoes:
+                conexao.send(float(dt))
+        except OSError as erro:
+            self._falhar(erro)
+        self._em_andamento = True
+
+    def aguardar_passo(self) -> None:
+        """Bloqueia até todos os workers concluírem o passo em andamento."""
+        if not self._em_andamento:
+            return
+        pendentes = dict(zip(self._conexoes, self._processos))
+        limite = time.monotonic() + self.tempo_limite
+        while pendentes:
+            # Sentinelas ficam prontas quando um worker termina
+            prontos = wait(list(pendentes) + [p.sentinel for p in pendentes.values()],
+                           max(limite - time.monotonic(), 0.0))
+            if not prontos:
+                self._falhar()
+            for conexao in [c for c in pendentes if c in prontos]:
+                try:
+                    conexao.recv()
+                except EOFError as erro:
+                    self._falhar(erro)
+                del pendentes[conexao]
+            if any(processo.exitcode is not None for processo in pendentes.values()):
+                self._falhar()
+        self._em_andamento = False
+
+    def passo(self, dt: float) -> None:
+        """Um passo completo (iniciar + aguardar)."""
+        self.iniciar_passo(dt)
+        self.aguardar_passo()
+
+    def congelar(self, ids) -> None:
+        """Congela corpos (por índice) a partir do próximo passo."""
+        self.aguardar_passo()
+        self.ativas[np.asarray(ids, dtype=int)] = 0.0
+
+    def fechar(self) -> None:
+        """Encerra os workers e libera a memória compartilhada."""
+        if self._processos is None:
+            return
+        try:
+            self.aguardar_passo()
+        finally:
+            if self._processos is not None:
+                self._liberar()
+
+    def __enter__(self) -> 'ExecutorParaleloEstrelas':
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.fechar()
@@ -0,0 +1,286 @@
+"""
+Módulo de Pirâmides de Trajetórias: Níveis de Detalhe para Visualização
+
+Uma trajetória de um milhão de pontos mandaria um milhão de vértices ao
+matplotlib, embora a tela mostre alguns milhares de pixels. As pirâmides
+são calculadas uma vez por trajetória e respondem, para cada vista, só
+com a resolução necessária:
+
+- PiramideSerie (séries temporais, como simular_queda_entropica): em cada
+  nível, o mínimo e o máximo de cada bloco de fator^k amostras; uma
+  janela é respondida no nível mais grosso que ainda tem um bloco por
+  pixel, preservando os extremos (envelope mínimo/máximo);
+- PiramideCaminho (caminhos 2D, como o do agente na galáxia): cada
+  vértice recebe a tolerância a partir da qual Ramer-Douglas-Peucker o
+  descartaria; pedir uma tolerância devolve o caminho simplificado com
+  erro <= tolerância, sem refazer a simplificação.
+
+obter_piramide guarda as pirâmides já calculadas (trajetórias só crescem
+por append, então o comprimento invalida a entrada).
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+FATOR_PADRAO = 4
+
+# Abaixo deste número de blocos a pirâmide não ganha novos níveis
+BLOCOS_MINIMOS = 256
+
+# Tolerância mínima do caminho, relativa à diagonal da sua extensão
+TOLERANCIA_MINIMA_RELATIVA = 1e-5
+
+# Pirâmides mantidas por obter_piramide
+TAMANHO_CACHE = 32
+
+
+class PiramideSerie:
+    """
+    Envelopes mínimo/máximo de uma série temporal em vários níveis.
+
+    O nível k agrupa fator**k amostras; para cada bloco guarda os índices
+    do mínimo e do máximo, de modo que os vértices devolvidos são amostras
+    reais da série.
+
+    Atributos:
+    - valores: Série original, shape (T,)
+    - niveis: Lista de (tamanho_bloco, indices_minimo, indices_maximo)
+    """
+
+    def __init__(self, valores, fator: int = FATOR_PADRAO,
+                 blocos_minimos: int = BLOCOS_MINIMOS):
+        """
+        Parameters:
+        -----------
+        valores : array_like
+            Série temporal, shape (T,)
+        fator : int
+            Amostras de um nível agrupadas em cada bloco do seguinte
+        blocos_minimos : int
+            Blocos do nível mais grosso (aproximadamente)
+        """
+        if fator < 2:
+            raise ValueError("O fator deve ser >= 2")
+        self.valores = np.asarray(valores, dtype=float)
+        self.fator = fator
+        self.niveis = []
+
+        indices_minimo = indices_maximo = np.arange(len(self.valores))
+        tamanho = 1
+        while len(indices_minimo) > blocos_minimos:
+            blocos = -(-len(indices_minimo) // fator)
+            falta = blocos * fator - len(indices_minimo)
+            # O último bloco é completado repetindo o último índice
+            grupos_minimo = np.pad(indices_minimo, (0, falta), mode='edge').reshape(blocos, fator)
+            grupos_maximo = np.pad(indices_maximo, (0, falta), mode='edge').reshape(blocos, fator)
+            linhas = np.arange(blocos)
+            indices_minimo = grupos_minimo[linhas, self.valores[grupos_minimo].argmin(axis=1)]
+            indices_maximo = grupos_maximo[linhas, self.valores[grupos_maximo].argmax(axis=1)]
+            tamanho *= fator
+            self.niveis.append((tamanho, indices_minimo, indices_maximo))
+
+    def __len__(self) -> int:
+        return len(self.valores)
+
+    def amostrar(self, inicio: float = 0, fim: Optional[float] = None,
+                 pixels: int = 1000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vértices da janela [inicio, fim) com cerca de um bloco por pixel.
+
+        Parameters:
+        -----------
+        inicio, fim : float
+            Janela em índices de amostra (padrão: a série inteira)
+        pixels : int
+            Largura da vista em pixels
+
+        Returns:
+        --------
+        tuple
+            (indices, valores), no máximo 2 * pixels vértices em ordem
+            temporal (mais um bloco em cada borda)
+        """
+        n = len(self.valores)
+        inicio = int(min(max(np.floor(inicio), 0), n))
+        fim = n if fim is None else int(min(max(np.ceil(fim) + 1, inicio), n))
+        largura = fim - inicio
+
+        if largura <= 2 * pixels or not self.niveis:
+            indices = np.arange(inicio, fim)
+            return indices, self.valores[indices]
+
+        # Nível mais fino com no máximo um bloco por pixel
+        for tamanho, indices_minimo, indices_maximo in self.niveis:
+            if largura / tamanho <= pixels:
+                break
+        primeiro, ultimo = inicio // tamanho, -(-fim // tamanho)
+        indices = np.unique(np.concatenate([indices_minimo[primeiro:ultimo],
+                                            indices_maximo[primeiro:ultimo]]))
+        return indices, self.valores[indices]
+
+
+class PiramideCaminho:
+    """
+    Caminho 2D com simplificação Ramer-Douglas-Peucker pré-calculada.
+
+    Cada vértice recebe a maior tolerância com que RDP ainda o mantém
+    (as pontas são mantidas sempre); amostrar(tolerancia) devolve os
+    vértices acima dela, que é exatamente o resultado de RDP.
+
+    Atributos:
+    - pontos: Caminho original, shape (T, d) (a simplificação usa x e y)
+    - extensao: (x_min, x_max, y_min, y_max) do caminho
+    """
+
+    def __init__(self, pontos, tolerancia_minima: Optional[float] = None):
+        """
+        Parameters:
+        -----------
+        pontos : array_like
+            Caminho, shape (T, d)
+        tolerancia_minima : float, optional
+            Desvios abaixo deste valor não são refinados, o que limita o
+            custo da construção (padrão: TOLERANCIA_MINIMA_RELATIVA vezes
+            a diagonal da extensão)
+        """
+        self.pontos = np.asarray(pontos, dtype=float)
+        xy = self.pontos[:, :2]
+        n = len(xy)
+        if n:
+            minimos, maximos = xy.min(axis=0), xy.max(axis=0)
+            self.extensao = (minimos[0], maximos[0], minimos[1], maximos[1])
+        else:
+            self.extensao = (0.0, 0.0, 0.0, 0.0)
+        if tolerancia_minima is None:
+            diagonal = np.hypot(self.extensao[1] - self.extensao[0],
+                                self.extensao[3] - self.extensao[2])
+            tolerancia_minima = TOLERANCIA_MINIMA_RELATIVA * diagonal
+
+        importancia = np.zeros(n)
+        importancia[[0, -1] if n else []] = np.inf
+
+        # RDP por níveis: todos os segmentos de um nível são divididos de
+        # uma vez, com uma passada vetorizada pelos seus vértices internos
+        inicios = np.array([0] if n > 2 else [], dtype=np.intp)
+        fins = np.array([n - 1] if n > 2 else [], dtype=np.intp)
+        tetos = np.full(len(inicios), np.inf)
+        while len(inicios):
+            internos = fins - inicios - 1
+            segmento = np.repeat(np.arange(len(inicios)), internos)
+            deslocamentos = np.concatenate([[0], np.cumsum(internos)[:-1]])
+            indices = np.arange(len(segmento)) - deslocamentos[segmento] + inicios[segmento] + 1
+
+            a = xy[inicios][segmento]
+            corda = xy[fins][segmento] - a
+            relativos = xy[indices] - a
+            comprimento = np.hypot(corda[:, 0], corda[:, 1])
+            cruzado = np.abs(relativos[:, 0] * corda[:, 1] - relativos[:, 1] * corda[:, 0])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                distancias = np.where(comprimento > 0, cruzado / comprimento,
+                                      np.hypot(relativos[:, 0], relativos[:, 1]))
+
+            # Maior desvio de cada segmento (a primeira ocorrência, como argmax)
+            maximos = np.maximum.reduceat(distancias, deslocamentos)
+            candidatos = np.flatnonzero(distancias == maximos[segmento])
+            _, primeiros = np.unique(segmento[candidatos], return_index=True)
+            divisores = indices[candidatos[primeiros]]
+
+            dividir = maximos > tolerancia_minima
+            # Um vértice não sobrevive a uma tolerância que descarta o pai
+            valores = np.minimum(maximos, tetos)[dividir]
+            divisores = divisores[dividir]
+            importancia[divisores] = valores
+            novos_inicios = np.concatenate([inicios[dividir], divisores])
+            novos_fins = np.concatenate([divisores, fins[dividir]])
+            tetos = np.concatenate([valores, valores])
+            manter = novos_fins - novos_inicios > 1
+            inicios, fins, tetos = novos_inicios[manter], novos_fins[manter], tetos[manter]
+
+        self.tolerancia_minima = tolerancia_minima
+        self._ordem = np.argsort(-importancia, kind='stable')
+        self._importancia_negativa = -importancia[self._ordem]  # crescente
+
+    def __len__(self) -> int:
+        return len(self.pontos)
+
+    def amostrar(self, tolerancia: float,
+                 janela: Optional[Tuple[float, float, float, float]] = None) -> np.ndarray:
+        """
+        Caminho simplificado com desvio máximo <= tolerancia.
+
+        Parameters:
+        -----------
+        tolerancia : float
+            Desvio admitido, em unidades do caminho (por exemplo, a
+            largura de um pixel da vista)
+        janela : tuple, optional
+            (x_min, x_max, y_min, y_max): só os segmentos que podem cruzar
+            a janela são devolvidos; trechos separados são divididos por
+            uma linha de NaN
+
+        Returns:
+        --------
+        np.ndarray
+            Vértices mantidos, em ordem, shape (K, d)
+        """
+        mantidos = np.searchsorted(self._importancia_negativa, -tolerancia, side='left')
+        indices = np.sort(self._ordem[:max(mantidos, min(2, len(self.pontos)))])
+        pontos = self.pontos[indices]
+        if janela is None or len(pontos) < 2:
+            return pontos
+
+        # Segmentos cuja caixa envolvente cruza a janela
+        x_min, x_max, y_min, y_max = janela
+        x, y = pontos[:, 0], pontos[:, 1]
+        visiveis = ((np.maximum(x[:-1], x[1:]) >= x_min) & (np.minimum(x[:-1], x[1:]) <= x_max)
+                    & (np.maximum(y[:-1], y[1:]) >= y_min) & (np.minimum(y[:-1], y[1:]) <= y_max))
+        vertices = np.zeros(len(pontos), dtype=bool)
+        vertices[:-1] |= visiveis
+        vertices[1:] |= visiveis
+        linhas = np.flatnonzero(vertices)
+        quebras = np.flatnonzero(np.diff(linhas) > 1) + 1
+        return np.insert(pontos[linhas], quebras, np.nan, axis=0)
+
+
+_CACHE_PIRAMIDES: 'OrderedDict' = OrderedDict()
+
+
+def obter_piramide(trajetoria, tipo: str = 'caminho',
+                   **opcoes) -> Union[PiramideSerie, PiramideCaminho]:
+    """
+    Pirâmide de uma trajetória, calculada na primeira vez.
+
+    A entrada é identificada pelo objeto e pelo seu comprimento: uma
+    trajetória que cresceu por append é recalculada.
+
+    Parameters:
+    -----------
+    trajetoria : sequence or np.ndarray
+        Série (T,) para 'serie' ou caminho (T, d) para 'caminho'
+    tipo : str
+        'serie' ou 'caminho'
+    **opcoes
+        Repassadas ao construtor da pirâmide
+
+    Returns:
+    --------
+    PiramideSerie or PiramideCaminho
+        Pirâmide da trajetória
+    """
+    classes = {'serie': PiramideSerie, 'caminho': PiramideCaminho}
+    if tipo not in classes:
+        raise ValueError(f"Tipo de pirâmide desconhecido: {tipo!r}")
+    chave = (id(trajetoria), len(trajetoria), tipo, tuple(sorted(opcoes.items())))
+    entrada = _CACHE_PIRAMIDES.get(chave)
+    if entrada is not None and entrada[0] is trajetoria:
+        _CACHE_PIRAMIDES.move_to_end(chave)
+        return entrada[1]
+
+    piramide = classes[tipo](trajetoria, **opcoes)
+    # A referência à trajetória mantém o id válido enquanto estiver no cache
+    _CACHE_PIRAMIDES[chave] = (trajetoria, piramide)
+    while len(_CACHE_PIRAMIDES) > TAMANHO_CACHE:
+        _CACHE_PIRAMIDES.popitem(last=False)
+    return piramide
@@ -0,0 +1,185 @@
+"""
+Módulo de Precisão: Estados em float64 ou float32
+
+Os estados (posições e velocidades das estrelas, do agente e das órbitas
+integradas em conjunto) são float64 por padrão. Para conjuntos de 10^6
+corpos e trajetórias guardadas, float32 reduz pela metade a memória e o
+tráfego dos kernels limitados por banda, com erro bem abaixo do erro de
+truncamento do integrador.
+
+A política é a mesma em rotacao_galactica, agente_consciente,
+galaxia_consciente, backend_forcas, passo_paralelo e cache_estrelas:
+
+- precisao=None usa a precisão padrão (definir_precisao_padrao, 'float64'
+  de início); 'float32' ou 'float64' escolhem explicitamente;
+- o estado e os buffers dos kernels ficam na precisão escolhida (os
+  kernels seguem o dtype dos arrays que recebem);
+- reduções e acumulações de longo prazo continuam em float64 (ACUMULADOR):
+  energia, momento angular e razão virial (diagnosticos), azimutes e
+  revoluções (monitor_orbital), tempo simulado e médias.
+
+Limites de erro (LIMITES_ERRO), medidos por medir_erro_precisao na
+configuração de referência: 2000 estrelas, 2000 passos de Euler
+semi-implícito com dt = 0.1, lei de Verlinde (sementes 0 a 3). As
+derivas são as de DiagnosticoConservacao (relativas, máximo por corpo):
+
+    precisão   deriva de energia   excesso sobre float64   deriva de L   desvio de posição
+    float64    8.1e-02             -                       8.2e-15       -
+    float32    8.1e-02             <= 6.7e-07              <= 5.6e-06    <= 4.0e-03
+
+A deriva de energia é a do integrador (a mesma nas duas precisões); o
+arredondamento em float32 aparece no excesso sobre ela, no momento
+angular, que o Euler semi-implícito conserva exatamente em aritmética
+exata, e no desvio de posição final em relação à execução float64
+(relativo ao raio; é sobretudo erro de fase das órbitas internas, que
+cresce com o número de passos). Um passo do kernel NumPy com 2*10^6
+estrelas cai de 65 ms para 41 ms.
+
+LIMITES_ERRO tem margem de cerca de 3x sobre os valores medidos.
+"""
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+PRECISOES = {'float64': np.dtype(np.float64), 'float32': np.dtype(np.float32)}
+PRECISAO_PADRAO = 'float64'
+
+# Precisão das reduções e acumulações de longo prazo
+ACUMULADOR = np.dtype(np.float64)
+
+# Maiores erros aceitos por precisão na configuração de referência
+LIMITES_ERRO = {
+    'float64': {'excesso_deriva_energia': 0.0, 'deriva_momento_angular': 1e-12,
+                'desvio_posicao': 0.0},
+    'float32': {'excesso_deriva_energia': 2e-6, 'deriva_momento_angular': 2e-5,
+                'desvio_posicao': 1.2e-2},
+}
+
+_precisao_padrao = PRECISAO_PADRAO
+
+Precisao = Union[None, str, np.dtype, type]
+
+
+def definir_precisao_padrao(precisao: str = PRECISAO_PADRAO) -> None:
+    """
+    Define a precisão usada quando precisao=None.
+
+    Parameters:
+    -----------
+    precisao : str
+        'float64' ou 'float32'
+    """
+    global _precisao_padrao
+    _precisao_padrao = nome_precisao(precisao)
+
+
+def precisao_padrao() -> str:
+    """A precisão usada quando precisao=None."""
+    return _precisao_padrao
+
+
+def obter_dtype(precisao: Precisao = None) -> np.dtype:
+    """
+    dtype dos estados para uma precisão.
+
+    Parameters:
+    -----------
+    precisao : str or dtype, optional
+        'float64', 'float32' (ou os dtypes correspondentes); None usa a
+        precisão padrão
+
+    Returns:
+    --------
+    np.dtype
+        float64 ou float32
+    """
+    if precisao is None:
+        precisao = _precisao_padrao
+    try:
+        dtype = np.dtype(precisao)
+    except TypeError:
+        dtype = None
+    if dtype not in PRECISOES.values():
+        raise ValueError(f"Precisão deve ser uma de {tuple(PRECISOES)}, não {precisao!r}")
+    return dtype
+
+
+def nome_precisao(precisao: Precisao = None) -> str:
+    """Nome ('float64' ou 'float32') de uma precisão."""
+    return obter_dtype(precisao).name
+
+
+def dtype_estado(array: np.ndarray) -> np.dtype:
+    """dtype de um array de estado: o próprio, se suportado, senão float64."""
+    dtype = np.asarray(array).dtype
+    return dtype if dtype in PRECISOES.values() else PRECISOES['float64']
+
+
+def medir_erro_precisao(precisao: Precisao = 'float32',
+                        num_estrelas: int = 2000,
+                        passos: int = 2000,
+                        dt: float = 0.1,
+                        semente: Optional[int] = 0,
+                        intervalo: int = 100) -> Dict:
+    """
+    Mede o erro de uma precisão contra float64 por diagnósticos de conservação.
+
+    Integra as mesmas estrelas (condicoes_iniciais_estrelas) nas duas
+    precisões, com o backend NumPy e a lei de Verlinde.
+
+    Parameters:
+    -----------
+    precisao : str
+        Precisão medida
+    num_estrelas, passos, dt, semente
+        Configuração (o padrão é a de referência de LIMITES_ERRO)
+    intervalo : int
+        Passos entre registros dos diagnósticos
+
+    Returns:
+    --------
+    dict
+        'precisao', 'deriva_energia', 'deriva_momento_angular' (máximos
+        relativos na precisão medida), as mesmas derivas em float64
+        ('referencia'), 'excesso_deriva_energia' (diferença absoluta para
+        a deriva de float64), 'desvio_posicao' (máximo de
+        |x - x_64| / r_64), 'bytes_estado' e 'dentro_dos_limites'
+    """
+    from src.backend_forcas import BackendNumpy, integrar_orbitas
+    from src.diagnosticos import DiagnosticoConservacao
+    from src.galaxia_consciente import condicoes_iniciais_estrelas
+
+    nome = nome_precisao(precisao)
+    _, posicoes, velocidades = condicoes_iniciais_estrelas(num_estrelas, semente=semente,
+                                                           precisao='float64')
+    medidas = {}
+    for chave in ('float64', nome):
+        diagnostico = DiagnosticoConservacao(intervalo, 'verlinde')
+        finais, _ = integrar_orbitas(posicoes, velocidades, passos, dt, backend=BackendNumpy(),
+                                     diagnostico=diagnostico, precisao=chave)
+        resumo = diagnostico.resumo()
+        medidas[chave] = {
+            'deriva_energia': resumo['deriva_energia_maxima'],
+            'deriva_momento_angular': resumo['deriva_momento_angular_maxima'],
+            'finais': finais,
+        }
+
+    referencia = medidas['float64']['finais']
+    raios = np.linalg.norm(referencia, axis=1)
+    desvio = np.linalg.norm(medidas[nome]['finais'].astype(ACUMULADOR) - referencia, axis=1)
+    resultado = {
+        'precisao': nome,
+        'deriva_energia': medidas[nome]['deriva_energia'],
+        'deriva_momento_angular': medidas[nome]['deriva_momento_angular'],
+        'referencia': {chave: medidas['float64'][chave]
+                       for chave in ('deriva_energia', 'deriva_momento_angular')},
+        'excesso_deriva_energia': abs(medidas[nome]['deriva_energia']
+                                      - medidas['float64']['deriva_energia']),
+        'desvio_posicao': float((desvio / np.maximum(raios, 1e-300)).max(initial=0.0)),
+        'bytes_estado': 2 * posicoes.size * PRECISOES[nome].itemsize,
+    }
+    limites = LIMITES_ERRO[nome]
+    resultado['dentro_dos_limites'] = all(resultado[chave] <= limite
+                                          for chave, limite in limites.items())
+    return resultado
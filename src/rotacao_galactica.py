@@ -8,8 +8,9 @@ Objetivo: Demonstrar curva de rotação plana sem matéria escura.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Tuple, List, Optional
+from typing import Callable, Dict, Tuple, List, Optional
+from src.graficos import DPI_PADRAO, mostrar, pyplot
+from src.precisao import dtype_estado, obter_dtype
 
 # CONFIGURAÇÃO DA GALÁXIA
 G_NEWTON = 1.0           # Constante gravitacional newtoniana
@@ -17,26 +18,51 @@ M_BURACO_NEGRO = 1000.0  # Massa no centro da galáxia
 ESCALA_VERLINDE = 20.0   # Distância de transição Verlinde
 A_0 = 0.2               # Aceleração mínima do universo (constante de Verlinde)
 
-def forca_newtoniana(r: float) -> float:
+def _massa_encerrada(r, modelo_massa=None):
+    """
+    Massa que gera a gravidade no raio r.
+
+    modelo_massa pode ser None (massa pontual M_BURACO_NEGRO), um número
+    (massa pontual customizada) ou um perfil com massa_encerrada(r)
+    (ver modelos_massa).
+    """
+    if modelo_massa is None:
+        return M_BURACO_NEGRO
+    if np.isscalar(modelo_massa):
+        return modelo_massa
+    return modelo_massa.massa_encerrada(r)
+
+def forca_newtoniana(r, modelo_massa=None):
     """
     Força gravitacional newtoniana clássica.
-    F = GM/r²
+    F = GM(<r)/r²
 
     Parameters:
     -----------
-    r : float
-        Distância do centro
+    r : float or np.ndarray
+        Distância do centro (aceita arrays)
+    modelo_massa : float or PerfilMassa, optional
+        Massa central ou perfil radial de massa (padrão: M_BURACO_NEGRO)
 
     Returns:
     --------
-    float
+    float or np.ndarray
         Aceleração gravitacional
     """
-    if r < 1e-10:  # Evitar divisão por zero
-        return 0.0
-    return (G_NEWTON * M_BURACO_NEGRO) / (r ** 2)
-
-def forca_verlinde(r: float) -> float:
+    massa = _massa_encerrada(r, modelo_massa)
+    if np.ndim(r) == 0:
+        if r < 1e-10:  # Evitar divisão por zero
+            return 0.0
+        return (G_NEWTON * massa) / (r ** 2)
+
+    # Arrays float32 continuam float32 (ver precisao)
+    r = np.asarray(r)
+    r = r.astype(dtype_estado(r), copy=False)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aceleracao = (G_NEWTON * massa) / (r ** 2)
+    return np.where(r < 1e-10, 0.0, aceleracao)
+
+def forca_verlinde(r, modelo_massa=None):
     """
     Força gravitacional segundo a teoria entrópica de Verlinde.
 
@@ -46,30 +72,126 @@ def forca_verlinde(r: float) -> float:
 
     Parameters:
     -----------
-    r : float
-        Distância do centro
+    r : float or np.ndarray
+        Distância do centro (aceita arrays)
+    modelo_massa : float or PerfilMassa, optional
+        Massa central ou perfil radial de massa (padrão: M_BURACO_NEGRO)
 
     Returns:
     --------
-    float
+    float or np.ndarray
         Aceleração gravitacional entrópica
     """
-    if r < 1e-10:
-        return 0.0
-
     # Calcular aceleração newtoniana
-    aceleracao_newton = forca_newtoniana(r)
+    aceleracao_newton = forca_newtoniana(r, modelo_massa)
 
-    # Transição de fase baseada na aceleração
-    if aceleracao_newton > A_0:
-        # Perto do centro: comportamento newtoniano
-        return aceleracao_newton
-    else:
-        # Longe do centro: entropia muda o comportamento
-        # A força decai mais devagar, mantendo velocidade orbital constante
-        return np.sqrt(A_0 * aceleracao_newton)
+    if np.ndim(r) == 0:
+        if r < 1e-10:
+            return 0.0
+
+        # Transição de fase baseada na aceleração
+        if aceleracao_newton > A_0:
+            # Perto do centro: comportamento newtoniano
+            return aceleracao_newton
+        else:
+            # Longe do centro: entropia muda o comportamento
+            # A força decai mais devagar, mantendo velocidade orbital constante
+            return np.sqrt(A_0 * aceleracao_newton)
+
+    return np.where(aceleracao_newton > A_0, aceleracao_newton,
+                    np.sqrt(A_0 * aceleracao_newton))
+
+def nu_simples(y):
+    """Função interpolante "simples": ν(y) = 1/2 + sqrt(1/4 + 1/y)."""
+    return 0.5 + np.sqrt(0.25 + 1.0 / y)
+
+def nu_padrao(y):
+    """Função interpolante "padrão": ν(y) = sqrt(1/2 + sqrt(1/4 + 1/y²))."""
+    return np.sqrt(0.5 + np.sqrt(0.25 + 1.0 / y ** 2))
 
-def velocidade_orbital_estavel(r: float, modelo: str = 'newton') -> float:
+def familia_nu_n(n: float) -> Callable:
+    """
+    Família ν_n(y) = [(1 + sqrt(1 + 4 y^-n)) / 2]^(1/n).
+
+    n = 1 é a função simples e n = 2 a padrão; n -> infinito tende à
+    transição abrupta de forca_verlinde.
+    """
+    def nu(y):
+        return ((1.0 + np.sqrt(1.0 + 4.0 * y ** (-n))) / 2.0) ** (1.0 / n)
+    return nu
+
+def lei_interpolante(nu: Callable, a0: float = A_0) -> Callable:
+    """
+    Constrói uma lei de força g = a_N ν(a_N / a0).
+
+    Parameters:
+    -----------
+    nu : callable
+        Função interpolante ν(y), vetorizada
+    a0 : float
+        Aceleração de transição
+
+    Returns:
+    --------
+    callable
+        Lei (r, modelo_massa=None) -> aceleração, pronta para registrar
+    """
+    def lei(r, modelo_massa=None):
+        aceleracao_newton = np.asarray(forca_newtoniana(r, modelo_massa), dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            g = aceleracao_newton * nu(aceleracao_newton / a0)
+        return np.where(aceleracao_newton > 0, g, 0.0)[()]
+    return lei
+
+# Registro de leis de força: nome -> função (r, modelo_massa=None) -> aceleração
+# (tabelas_forca compila qualquer uma delas em splines)
+MODELOS_FORCA: Dict[str, Callable] = {
+    'newton': forca_newtoniana,
+    'verlinde': forca_verlinde,
+    'mond_simples': lei_interpolante(nu_simples),
+    'mond_padrao': lei_interpolante(nu_padrao),
+}
+
+def registrar_modelo_forca(nome: str, lei: Callable) -> None:
+    """
+    Registra uma lei de força para uso por nome nas simulações.
+
+    Parameters:
+    -----------
+    nome : str
+        Nome do modelo (ex.: 'mond_simples')
+    lei : callable
+        Função (r, modelo_massa=None) -> aceleração radial, aceitando
+        float ou np.ndarray (ver lei_interpolante e, para tabelas
+        compiladas, tabelas_forca)
+    """
+    if not callable(lei):
+        raise TypeError("A lei de força deve ser uma função (r, modelo_massa=None)")
+    MODELOS_FORCA[nome] = lei
+
+def obter_modelo_forca(modelo) -> Callable:
+    """
+    Resolve um modelo de força (nome registrado ou a própria função).
+
+    Parameters:
+    -----------
+    modelo : str or callable
+        Nome registrado em MODELOS_FORCA ou função (r, modelo_massa=None)
+
+    Returns:
+    --------
+    callable
+        Lei de força
+    """
+    if callable(modelo):
+        return modelo
+    try:
+        return MODELOS_FORCA[modelo]
+    except KeyError:
+        raise ValueError(f"Modelo desconhecido: {modelo!r}. "
+                         f"Registrados: {', '.join(sorted(MODELOS_FORCA))}") from None
+
+def velocidade_orbital_estavel(r, modelo: str = 'newton', modelo_massa=None):
     """
     Calcula a velocidade orbital necessária para órbita circular estável.
 
@@ -78,42 +200,49 @@ def velocidade_orbital_estavel(r: float, modelo: str = 'newton') -> float:
 
     Parameters:
     -----------
-    r : float
-        Raio da órbita
-    modelo : str
-        'newton' ou 'verlinde'
+    r : float or np.ndarray
+        Raio da órbita (aceita arrays)
+    modelo : str or callable
+        'newton', 'verlinde' ou outro modelo registrado (ver registrar_modelo_forca)
+    modelo_massa : float or PerfilMassa, optional
+        Massa central ou perfil radial de massa (padrão: M_BURACO_NEGRO)
 
     Returns:
     --------
-    float
+    float or np.ndarray
         Velocidade orbital
     """
-    if modelo == 'newton':
-        f = forca_newtoniana(r)
-    elif modelo == 'verlinde':
-        f = forca_verlinde(r)
-    else:
-        raise ValueError("Modelo deve ser 'newton' ou 'verlinde'")
-
+    f = obter_modelo_forca(modelo)(r, modelo_massa)
     return np.sqrt(f * r)
 
 def simular_orbita(modelo: str = 'newton',
                    raio_inicial: float = 10.0,
                    passos: int = 1000,
-                   dt: float = 0.1) -> Tuple[List[float], List[float], float]:
+                   dt: float = 0.1,
+                   modelo_massa=None,
+                   diagnostico=None,
+                   monitor=None) -> Tuple[List[float], List[float], float]:
     """
     Simula a órbita de uma estrela na galáxia.
 
     Parameters:
     -----------
-    modelo : str
-        'newton' ou 'verlinde'
+    modelo : str or callable
+        'newton', 'verlinde' ou outro modelo registrado
     raio_inicial : float
         Distância inicial do centro
     passos : int
         Número de passos da simulação
     dt : float
         Passo de tempo
+    modelo_massa : float or PerfilMassa, optional
+        Massa central ou perfil radial de massa (padrão: M_BURACO_NEGRO)
+    diagnostico : DiagnosticoConservacao, optional
+        Recebe o estado inicial e o de cada intervalo de passos (ver
+        diagnosticos); deve usar o mesmo modelo e massa
+    monitor : MonitorOrbital, optional
+        Recebe a posição de cada passo; a simulação termina antes de
+        passos se monitor.concluido (ver monitor_orbital)
 
     Returns:
     --------
@@ -123,22 +252,26 @@ def simular_orbita(modelo: str = 'newton',
     # Estado inicial: na posição (raio_inicial, 0) com velocidade tangencial
     x, y = raio_inicial, 0.0
 
+    # Lei de força resolvida uma única vez (não a cada passo)
+    forca = obter_modelo_forca(modelo)
+
     # Velocidade inicial para órbita circular
-    v_orbital = velocidade_orbital_estavel(raio_inicial, modelo)
+    v_orbital = velocidade_orbital_estavel(raio_inicial, forca, modelo_massa)
     vx, vy = 0.0, v_orbital
 
     trajetoria_x = [x]
     trajetoria_y = [y]
     velocidades = [v_orbital]
+    if diagnostico is not None:
+        diagnostico.registrar(0, 0.0, np.array([[x, y]]), np.array([[vx, vy]]))
+    if monitor is not None:
+        monitor.atualizar(0.0, np.array([[x, y]]))
 
-    for _ in range(passos):
+    for passo in range(1, passos + 1):
         r = np.sqrt(x**2 + y**2)
 
         # Calcular aceleração baseada no modelo
-        if modelo == 'newton':
-            aceleracao_total = forca_newtoniana(r)
-        else:
-            aceleracao_total = forca_verlinde(r)
+        aceleracao_total = forca(r, modelo_massa)
 
         # Vetor aceleração (direção radial para o centro)
         ax = -aceleracao_total * (x / r)
@@ -156,33 +289,39 @@ def simular_orbita(modelo: str = 'newton',
         trajetoria_y.append(y)
         velocidades.append(np.sqrt(vx**2 + vy**2))
 
+        if diagnostico is not None and diagnostico.deve_registrar(passo):
+            diagnostico.registrar(passo, passo * dt, np.array([[x, y]]), np.array([[vx, vy]]))
+        if monitor is not None and monitor.atualizar(passo * dt, np.array([[x, y]])):
+            break
+
     velocidade_media = np.mean(velocidades)
     return trajetoria_x, trajetoria_y, velocidade_media
 
 def calcular_curva_rotacao(raios: np.ndarray,
-                          modelo: str = 'newton') -> np.ndarray:
+                          modelo: str = 'newton',
+                          modelo_massa=None,
+                          precisao: Optional[str] = None) -> np.ndarray:
     """
-    Calcula a curva de rotação para múltiplos raios.
+    Calcula a curva de rotação para múltiplos raios (vetorizado).
 
     Parameters:
     -----------
     raios : np.ndarray
         Array de raios para calcular
-    modelo : str
-        'newton' ou 'verlinde'
+    modelo : str or callable
+        'newton', 'verlinde' ou outro modelo registrado
+    modelo_massa : float or PerfilMassa, optional
+        Massa central ou perfil radial de massa (padrão: M_BURACO_NEGRO)
+    precisao : str, optional
+        'float64' ou 'float32' (padrão: a precisão padrão, ver precisao)
 
     Returns:
     --------
     np.ndarray
         Velocidades orbitais para cada raio
     """
-    velocidades = []
-
-    for r in raios:
-        v = velocidade_orbital_estavel(r, modelo)
-        velocidades.append(v)
-
-    return np.array(velocidades)
+    raios = np.atleast_1d(np.asarray(raios, dtype=obter_dtype(precisao)))
+    return velocidade_orbital_estavel(raios, modelo, modelo_massa)
 
 def plotar_comparacao_orbitas(raio_teste: float = 50.0,
                               passos: int = 2000) -> None:
@@ -196,6 +335,7 @@ def plotar_comparacao_orbitas(raio_teste: float = 50.0,
     passos : int
         Passos da simulação
     """
+    plt = pyplot()
     # Simular órbitas
     tx_n, ty_n, _ = simular_orbita('newton', raio_teste, passos)
     tx_v, ty_v, _ = simular_orbita('verlinde', raio_teste, passos)
@@ -233,6 +373,7 @@ def plotar_curva_rotacao(raios: Optional[np.ndarray] = None) -> None:
     raios : np.ndarray, optional
         Raios para calcular (padrão: linspace 5-100)
     """
+    plt = pyplot()
     if raios is None:
         raios = np.linspace(5, 100, 20)
 
@@ -274,7 +415,8 @@ def plotar_curva_rotacao(raios: Optional[np.ndarray] = None) -> None:
         print("❌ FALHA: Ajustar parâmetros da transição Verlinde")
 
 def demonstracao_completa(raio_teste: float = 50.0,
-                         salvar_figuras: bool = True) -> None:
+                         salvar_figuras: bool = True,
+                         dpi: int = DPI_PADRAO) -> None:
     """
     Demonstração completa: órbitas + curva de rotação.
 
@@ -284,7 +426,10 @@ def demonstracao_completa(raio_teste: float = 50.0,
         Raio para teste orbital
     salvar_figuras : bool
         Se deve salvar figuras
+    dpi : int
+        Resolução da figura salva
     """
+    plt = pyplot()
     print("=" * 70)
     print("DEMONSTRAÇÃO: ROTAÇÃO GALÁCTICA - NEWTON vs VERLINDE")
     print("=" * 70)
@@ -336,10 +481,10 @@ def demonstracao_completa(raio_teste: float = 50.0,
     plt.tight_layout()
 
     if salvar_figuras:
-        plt.savefig('images/rotacao_galactica_completa.png', dpi=300, bbox_inches='tight')
+        fig.savefig('images/rotacao_galactica_completa.png', dpi=dpi, bbox_inches='tight')
         print("\n💾 Figuras salvas em 'images/rotacao_galactica_completa.png'")
 
-    plt.show()
+    mostrar(fig)
 
     # Análise final
     print("\n🔬 ANÁLISE FINAL:")
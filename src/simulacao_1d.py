@@ -6,7 +6,10 @@ da maximização de entropia, sem programar forças diretamente.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
+from src.aleatorio import obter_provedor
+from src.graficos import DPI_PADRAO, linha_lod, mostrar, pyplot
+from src.instrumentacao import INSTRUMENTACAO_NULA
+from src.piramide_trajetorias import obter_piramide
 
 # --- CONFIGURAÇÃO DO UNIVERSO ENTRÓPICO ---
 # Não existe constante G. Não existe Lei de Newton aqui.
@@ -41,7 +44,26 @@ def densidade_informacao(x):
     # Simulando força gravitacional ~1/r^2
     return 1.0 / (distancia ** 2)
 
-def simular_queda_entropica(posicao_inicial=None, passos=None, temperatura=0.1):
+def densidade_informacao_vetorizada(x: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de densidade_informacao para um array de posições.
+
+    Parameters:
+    -----------
+    x : np.ndarray
+        Posições das partículas (qualquer shape)
+
+    Returns:
+    --------
+    np.ndarray
+        Densidade de informação em cada posição (mesmo shape de x)
+    """
+    distancia = np.abs(np.asarray(x, dtype=float) - POSICAO_MASSA)
+    with np.errstate(divide='ignore'):
+        return np.where(distancia < 1.0, 10000.0, 1.0 / distancia ** 2)
+
+def simular_queda_entropica(posicao_inicial=None, passos=None, temperatura=0.1,
+                            instrumentacao=None, aleatorio=None):
     """
     Simula a queda entrópica de uma partícula em direção ao centro de massa.
 
@@ -53,6 +75,13 @@ def simular_queda_entropica(posicao_inicial=None, passos=None, temperatura=0.1):
         Número de passos da simulação (padrão: PASSOS)
     temperatura : float, optional
         Temperatura do sistema (agitação térmica)
+    instrumentacao : Instrumentacao, optional
+        Recebe os contadores 'metropolis_propostas' e 'metropolis_aceitos'
+        (taxa de aceitação no relatório) e um registro por passo; os
+        observadores recebem a posição atual (ver instrumentacao)
+    aleatorio : ProvedorAleatorio, optional
+        Fonte das propostas e dos sorteios de Metropolis (padrão: um
+        provedor com semente tirada de np.random, ver aleatorio)
 
     Returns:
     --------
@@ -64,12 +93,18 @@ def simular_queda_entropica(posicao_inicial=None, passos=None, temperatura=0.1):
     if passos is None:
         passos = PASSOS
 
+    if instrumentacao is None:
+        instrumentacao = INSTRUMENTACAO_NULA
+    aleatorio = obter_provedor(aleatorio)
+
     posicao = posicao_inicial
     trajetoria = [posicao]
+    aceitos = 0
 
+    instrumentacao.iniciar()
     for _ in range(passos):
         # 1. Propor um movimento aleatório (Random Walk puro)
-        passo = np.random.choice([-1, 1]) * 0.5
+        passo = aleatorio.sinal() * 0.5
         nova_posicao_proposta = posicao + passo
 
         # 2. Calcular a Variação de Entropia (Delta S)
@@ -85,18 +120,24 @@ def simular_queda_entropica(posicao_inicial=None, passos=None, temperatura=0.1):
 
         # Se a entropia aumenta (diferenca_S > 0), aceitamos sempre.
         # Se diminui, aceitamos com uma probabilidade pequena.
-        if diferenca_S > 0 or np.random.rand() < np.exp(diferenca_S / temperatura):
+        if diferenca_S > 0 or aleatorio.uniforme() < np.exp(diferenca_S / temperatura):
             posicao = nova_posicao_proposta
+            aceitos += 1
 
         trajetoria.append(posicao)
+        instrumentacao.registrar_passo(len(trajetoria) - 1, posicao)
 
         # Se tocou na massa, para
         if abs(posicao - POSICAO_MASSA) < 1.0:
             break
 
+    instrumentacao.finalizar()
+    instrumentacao.contar('metropolis_propostas', len(trajetoria) - 1)
+    instrumentacao.contar('metropolis_aceitos', aceitos)
     return trajetoria
 
-def plotar_simulacao(trajetoria, salvar_figura=False, nome_arquivo='simulacao_gravidade.png'):
+def plotar_simulacao(trajetoria, salvar_figura=False, nome_arquivo='simulacao_gravidade.png',
+                     dpi=DPI_PADRAO):
     """
     Plota a trajetória da simulação.
 
@@ -108,9 +149,13 @@ def plotar_simulacao(trajetoria, salvar_figura=False, nome_arquivo='simulacao_gr
         Se True, salva a figura em arquivo
     nome_arquivo : str, optional
         Nome do arquivo para salvar a figura
+    dpi : int, optional
+        Resolução da figura salva
     """
-    plt.figure(figsize=(10, 6))
-    plt.plot(trajetoria, label='Trajetória da Partícula')
+    plt = pyplot()
+    fig = plt.figure(figsize=(10, 6))
+    # Envelope mínimo/máximo na resolução da vista (ver piramide_trajetorias)
+    linha_lod(plt.gca(), obter_piramide(trajetoria, 'serie'), label='Trajetória da Partícula')
     plt.axhline(y=POSICAO_MASSA, color='r', linestyle='--', label='Centro de Massa (Alta Entropia)')
     plt.title('Simulação de Gravidade Entrópica (Verlinde)\nSem Força G, apenas Maximização de Entropia')
     plt.xlabel('Tempo (Passos)')
@@ -119,10 +164,10 @@ def plotar_simulacao(trajetoria, salvar_figura=False, nome_arquivo='simulacao_gr
     plt.grid(True, alpha=0.3)
 
     if salvar_figura:
-        plt.savefig(nome_arquivo, dpi=300, bbox_inches='tight')
+        plt.savefig(nome_arquivo, dpi=dpi, bbox_inches='tight')
         print(f"Figura salva como {nome_arquivo}")
 
-    plt.show()
+    mostrar(fig)
 
 if __name__ == "__main__":
     # --- EXECUÇÃO E PROVA ---
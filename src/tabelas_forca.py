@@ -0,0 +1,349 @@
+"""
+Módulo de Tabelas de Força: Leis Customizadas Compiladas em Splines
+
+Este módulo complementa o registro de modelos de rotacao_galactica com:
+
+- Leis interpolantes do tipo MOND, g = a_N ν(a_N / a0), com as famílias
+  ν "simples", "padrão" e ν_n (definidas em rotacao_galactica, que
+  registra 'mond_simples' e 'mond_padrao'; reexportadas aqui)
+- Compilação de qualquer lei registrada em uma tabela de spline cúbica
+  monótona (PCHIP) em log g × log r, refinada até um erro relativo
+  controlado
+- Tabelas do potencial Φ(r) = ∫ g dr de uma lei, usadas nos diagnósticos
+  de energia (ver diagnosticos)
+
+Uma lei compilada custa uma avaliação de polinômio por chamada,
+independentemente do custo da expressão analítica original, e pode ser
+registrada como um novo modelo para simular_orbita e
+velocidade_orbital_estavel.
+"""
+
+import math
+import warnings
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from src.rotacao_galactica import (familia_nu_n, lei_interpolante, nu_padrao,  # noqa: F401
+                                   nu_simples, obter_modelo_forca, registrar_modelo_forca)
+
+# Cache das tabelas já compiladas
+_CACHE_TABELAS: Dict[tuple, 'TabelaForca'] = {}
+_CACHE_POTENCIAIS: Dict[tuple, 'TabelaPotencial'] = {}
+
+NOS_INICIAIS = 64
+NOS_MAXIMOS = 1 << 17
+
+
+class TabelaForca:
+    """
+    Lei de força tabelada: spline PCHIP de log g em log r, grade uniforme.
+
+    Atributos:
+    - r_min, r_max: Intervalo tabelado (fora dele, usa a lei original)
+    - nos: Número de nós da tabela
+    - erro_relativo: Maior erro relativo medido dentro dos intervalos
+    """
+
+    def __init__(self, lei: Callable,
+                 r_min: float = 0.1,
+                 r_max: float = 1e4,
+                 tolerancia: float = 1e-4,
+                 modelo_massa=None):
+        """
+        Compila a lei, dobrando o número de nós até atingir a tolerância.
+
+        Parameters:
+        -----------
+        lei : callable
+            Lei (r, modelo_massa=None) -> aceleração (positiva no intervalo)
+        r_min, r_max : float
+            Intervalo tabelado
+        tolerancia : float
+            Erro relativo máximo admitido, verificado em pontos internos
+            de cada intervalo.
+            Leis com quinas (como forca_verlinde) convergem em primeira
+            ordem perto da quina e exigem mais nós
+        modelo_massa : float or PerfilMassa, optional
+            Modelo de massa fixo para o qual a tabela é compilada
+        """
+        if not 0 < r_min < r_max:
+            raise ValueError("É necessário 0 < r_min < r_max")
+
+        self.lei = lei
+        self.modelo_massa = modelo_massa
+        self.r_min = r_min
+        self.r_max = r_max
+        self.tolerancia = tolerancia
+
+        # scipy.interpolate leva centenas de ms para importar; só as
+        # tabelas de força precisam dele (não o potencial dos diagnósticos)
+        from scipy.interpolate import PchipInterpolator
+
+        nos = NOS_INICIAIS
+        while True:
+            log_r = np.linspace(math.log(r_min), math.log(r_max), nos)
+            spline = PchipInterpolator(log_r, self._log_lei(log_r))
+
+            # Erro em pontos internos de cada intervalo (1/4, 1/2 e 3/4)
+            passo = log_r[1] - log_r[0]
+            internos = (log_r[:-1, None] + passo * np.array([0.25, 0.5, 0.75])).ravel()
+            erro = np.max(np.abs(np.expm1(spline(internos) - self._log_lei(internos))))
+            if erro <= tolerancia:
+                break
+            if nos >= NOS_MAXIMOS:
+                warnings.warn(f"Tolerância {tolerancia:g} não atingida com {nos} nós "
+                              f"(erro relativo {erro:.2e})", RuntimeWarning)
+                break
+            nos = 2 * nos - 1
+
+        self.nos = nos
+        self.erro_relativo = float(erro)
+
+        self._x0 = float(log_r[0])
+        self._h = float(log_r[1] - log_r[0])
+        self._inv_h = 1.0 / self._h
+        self._coeficientes = spline.c.T.copy()  # shape (nos - 1, 4)
+        self._coeficientes_lista = [tuple(c) for c in self._coeficientes]
+
+    def _log_lei(self, log_r: np.ndarray) -> np.ndarray:
+        g = np.asarray(self.lei(np.exp(log_r), self.modelo_massa), dtype=float)
+        if np.any(g <= 0):
+            raise ValueError("A lei deve ser positiva em todo o intervalo tabelado")
+        return np.log(g)
+
+    def __call__(self, r, modelo_massa=None):
+        """
+        Avalia a tabela (float ou np.ndarray).
+
+        modelo_massa é aceito por compatibilidade com as leis registradas,
+        mas deve ser o mesmo usado na compilação.
+        """
+        if modelo_massa is not None and modelo_massa != self.modelo_massa:
+            raise ValueError("Tabela compilada para outro modelo de massa")
+
+        if isinstance(r, float) or np.ndim(r) == 0:
+            # Caminho escalar em Python puro: usado a cada passo dos integradores
+            if not self.r_min <= r <= self.r_max:
+                return self.lei(r, self.modelo_massa)
+            u = (math.log(r) - self._x0) * self._inv_h
+            i = min(int(u), self.nos - 2)
+            t = (u - i) * self._h
+            c0, c1, c2, c3 = self._coeficientes_lista[i]
+            return math.exp(((c0 * t + c1) * t + c2) * t + c3)
+
+        r = np.asarray(r, dtype=float)
+        with np.errstate(divide='ignore'):
+            u = (np.log(r) - self._x0) * self._inv_h
+        dentro = (r >= self.r_min) & (r <= self.r_max)
+        i = np.clip(u, 0, self.nos - 2).astype(np.int64)
+        t = (np.clip(u, 0, self.nos - 1) - i) * self._h
+        c = self._coeficientes[i]
+        resultado = np.exp(((c[:, 0] * t + c[:, 1]) * t + c[:, 2]) * t + c[:, 3])
+        if not dentro.all():
+            resultado[~dentro] = self.lei(r[~dentro], self.modelo_massa)
+        return resultado
+
+
+def compilar_modelo(modelo,
+                    r_min: float = 0.1,
+                    r_max: float = 1e4,
+                    tolerancia: float = 1e-4,
+                    modelo_massa=None) -> TabelaForca:
+    """
+    Compila (com cache) um modelo registrado ou uma lei em TabelaForca.
+
+    Parameters:
+    -----------
+    modelo : str or callable
+        Nome registrado em rotacao_galactica.MODELOS_FORCA ou a própria lei
+    r_min, r_max : float
+        Intervalo tabelado
+    tolerancia : float
+        Erro relativo máximo
+    modelo_massa : float or PerfilMassa, optional
+        Modelo de massa fixo da tabela
+
+    Returns:
+    --------
+    TabelaForca
+        Tabela compilada (reaproveitada em chamadas repetidas)
+    """
+    lei = obter_modelo_forca(modelo)
+    chave = (lei, r_min, r_max, tolerancia, modelo_massa)
+    if chave not in _CACHE_TABELAS:
+        _CACHE_TABELAS[chave] = TabelaForca(lei, r_min, r_max, tolerancia, modelo_massa)
+    return _CACHE_TABELAS[chave]
+
+
+def registrar_modelo_tabelado(nome: str, modelo, **kwargs) -> TabelaForca:
+    """
+    Compila um modelo e registra a tabela com um novo nome.
+
+    Exemplo: registrar_modelo_tabelado('verlinde_tabelado', 'verlinde')
+    permite simular_orbita('verlinde_tabelado', ...).
+
+    Returns:
+    --------
+    TabelaForca
+        Tabela registrada
+    """
+    tabela = compilar_modelo(modelo, **kwargs)
+    registrar_modelo_forca(nome, tabela)
+    return tabela
+
+
+class TabelaPotencial:
+    """
+    Potencial Φ(r) de uma lei de força central, integrado numericamente.
+
+    Φ'(r) = g(r), com Φ(r_min) = 0: a lei de Verlinde tem cauda 1/r e o
+    potencial diverge no infinito, então só diferenças de Φ têm sentido.
+    Os nós (grade uniforme em log r) são obtidos por Simpson intervalo a
+    intervalo; entre nós, Φ é interpolado por Hermite cúbico com a
+    derivada exata r g(r) em relação a log r.
+
+    Atributos:
+    - r_min, r_max: Intervalo tabelado; fora dele, Φ é estendido com a lei
+      local (1/r² abaixo de r_min, 1/r acima de r_max)
+    - nos: Número de nós da tabela
+    """
+
+    def __init__(self, lei: Callable,
+                 r_min: float = 1e-2,
+                 r_max: float = 1e6,
+                 nos: int = 2048,
+                 modelo_massa=None):
+        """
+        Parameters:
+        -----------
+        lei : callable
+            Lei (r, modelo_massa=None) -> aceleração, vetorizada
+        r_min, r_max : float
+            Intervalo tabelado
+        nos : int
+            Número de nós
+        modelo_massa : float or PerfilMassa, optional
+            Modelo de massa fixo para o qual a tabela é calculada
+        """
+        if not 0 < r_min < r_max:
+            raise ValueError("É necessário 0 < r_min < r_max")
+
+        self.lei = lei
+        self.modelo_massa = modelo_massa
+        self.r_min = r_min
+        self.r_max = r_max
+        self.nos = nos
+
+        log_r = np.linspace(math.log(r_min), math.log(r_max), nos)
+        self._x0 = float(log_r[0])
+        self._h = float(log_r[1] - log_r[0])
+        self._inv_h = 1.0 / self._h
+
+        # dΦ/dlog r = r g(r); Simpson em cada intervalo
+        self._derivada = self._r_g(log_r)
+        meios = self._r_g(log_r[:-1] + 0.5 * self._h)
+        incrementos = self._h / 6.0 * (self._derivada[:-1] + 4.0 * meios + self._derivada[1:])
+        self._potencial = np.concatenate([[0.0], np.cumsum(incrementos)])
+
+        # Hermite cúbico por intervalo, em t = (log r - log r_i) / h:
+        # Φ = ((c0 t + c1) t + c2) t + c3
+        p0, p1 = self._potencial[:-1], self._potencial[1:]
+        d0, d1 = self._h * self._derivada[:-1], self._h * self._derivada[1:]
+        self._coeficientes = (2 * p0 + d0 - 2 * p1 + d1, -3 * p0 - 2 * d0 + 3 * p1 - d1, d0, p0)
+
+    def _r_g(self, log_r: np.ndarray) -> np.ndarray:
+        r = np.exp(log_r)
+        return r * np.asarray(self.lei(r, self.modelo_massa), dtype=float)
+
+    def __call__(self, r) -> np.ndarray:
+        """Avalia Φ(r) (float ou np.ndarray)."""
+        return self.avaliar(r)[0]
+
+    def avaliar(self, r) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Avalia Φ(r) e r g(r) = dΦ/dlog r pela mesma interpolação.
+
+        Parameters:
+        -----------
+        r : float or np.ndarray
+            Raios
+
+        Returns:
+        --------
+        tuple
+            (Φ(r), r g(r))
+        """
+        forma = np.shape(r)
+        r = np.asarray(r, dtype=float).ravel()
+        with np.errstate(divide='ignore'):
+            u = np.log(r)
+        u -= self._x0
+        u *= self._inv_h
+        fora = u.size and (u.min() < 0 or u.max() > self.nos - 1)
+        t = np.clip(u, 0, self.nos - 1)
+        i = t.astype(np.int64)
+        np.minimum(i, self.nos - 2, out=i)
+        t -= i
+
+        # Horner in-place, com um take contíguo por coeficiente
+        c0, c1, c2, c3 = (coeficiente.take(i) for coeficiente in self._coeficientes)
+        potencial = c0 * t
+        potencial += c1
+        potencial *= t
+        potencial += c2
+        potencial *= t
+        potencial += c3
+        derivada = c0
+        derivada *= 3 * self._inv_h
+        derivada *= t
+        c1 *= 2 * self._inv_h
+        derivada += c1
+        derivada *= t
+        c2 *= self._inv_h
+        derivada += c2
+
+        if fora:
+            abaixo = r < self.r_min
+            acima = r > self.r_max
+            with np.errstate(divide='ignore'):
+                # Abaixo de r_min, extensão newtoniana (r g ∝ 1/r);
+                # acima de r_max, entrópica (r g constante)
+                potencial[abaixo] = self._derivada[0] * (1.0 - self.r_min / r[abaixo])
+                derivada[abaixo] = self._derivada[0] * self.r_min / r[abaixo]
+                potencial[acima] = (self._potencial[-1]
+                                    + self._derivada[-1] * np.log(r[acima] / self.r_max))
+                derivada[acima] = self._derivada[-1]
+        return potencial.reshape(forma)[()], derivada.reshape(forma)[()]
+
+
+def compilar_potencial(modelo,
+                       r_min: float = 1e-2,
+                       r_max: float = 1e6,
+                       nos: int = 2048,
+                       modelo_massa=None) -> TabelaPotencial:
+    """
+    Tabela (com cache) do potencial de um modelo registrado ou de uma lei.
+
+    Parameters:
+    -----------
+    modelo : str or callable
+        Nome registrado em rotacao_galactica.MODELOS_FORCA ou a própria lei
+    r_min, r_max : float
+        Intervalo tabelado
+    nos : int
+        Número de nós
+    modelo_massa : float or PerfilMassa, optional
+        Modelo de massa fixo da tabela
+
+    Returns:
+    --------
+    TabelaPotencial
+        Tabela calculada (reaproveitada em chamadas repetidas)
+    """
+    lei = obter_modelo_forca(modelo)
+    chave = (lei, r_min, r_max, nos, modelo_massa)
+    if chave not in _CACHE_POTENCIAIS:
+        _CACHE_POTENCIAIS[chave] = TabelaPotencial(lei, r_min, r_max, nos, modelo_massa)
+    return _CACHE_POTENCIAIS[chave]
+
@@ -0,0 +1,342 @@
+"""
+Módulo de Varredura de Parâmetros: Ajuste do Agente Consciente
+
+Este módulo executa grades de parâmetros do AgenteConsciente e da
+GalaxiaConsciente (forca_consciente, horizonte_previsao, temperatura,
+dt e estado inicial) em um pool de processos, guardando cada resultado
+em um cache em disco endereçado por conteúdo.
+
+A chave de cada ponto é o hash dos parâmetros completos, da semente e da
+versão do código. Ao estender ou refinar uma grade, apenas os pontos
+novos são simulados; os demais são lidos do cache.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.agente_consciente import AgenteConsciente
+from src.cache_estrelas import CacheCampoEstelar
+from src.galaxia_consciente import GalaxiaConsciente
+from src.versao_codigo import VERSAO_CODIGO
+
+# Parâmetros padrão de cada simulação (fazem parte da chave do cache)
+PARAMETROS_AGENTE = {
+    'forca_consciente': 0.1,
+    'horizonte_previsao': 5,
+    'temperatura': 0.1,
+    'dt': 0.1,
+    'passos': 1000,
+    'posicao_inicial': (10.0, 0.0),
+    'velocidade_inicial': (0.0, 1.0),
+}
+
+PARAMETROS_GALAXIA = {
+    'forca_consciente': 0.5,
+    'horizonte_previsao': 10,
+    'temperatura': 0.1,
+    'dt': 0.1,
+    'passos': 1000,
+    'posicao_inicial': (20.0, 0.0),
+    'velocidade_inicial': (0.0, 2.0),
+    'raio_galaxia': 100.0,
+    'num_estrelas': 50,
+    'centro_massa': 1000.0,
+}
+
+
+def gerar_grade(**eixos) -> List[Dict[str, Any]]:
+    """
+    Gera o produto cartesiano dos valores de cada parâmetro.
+
+    Exemplo: gerar_grade(forca_consciente=[0.1, 0.5], temperatura=[0.05, 0.1])
+    produz 4 pontos.
+
+    Returns:
+    --------
+    list
+        Lista de dicionários de parâmetros
+    """
+    nomes = list(eixos)
+    return [dict(zip(nomes, valores))
+            for valores in itertools.product(*(eixos[n] for n in nomes))]
+
+
+def _normalizar(valor: Any) -> Any:
+    """Converte tuplas e tipos numpy para tipos JSON canônicos."""
+    if isinstance(valor, (tuple, list, np.ndarray)):
+        return [_normalizar(v) for v in valor]
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def completar_parametros(parametros: Dict[str, Any],
+                         simulacao: str = 'agente') -> Dict[str, Any]:
+    """
+    Completa um ponto da grade com os valores padrão da simulação.
+
+    Parameters:
+    -----------
+    parametros : dict
+        Parâmetros explicitamente variados
+    simulacao : str
+        'agente' ou 'galaxia'
+
+    Returns:
+    --------
+    dict
+        Parâmetros completos e normalizados
+    """
+    if simulacao == 'agente':
+        padrao = PARAMETROS_AGENTE
+    elif simulacao == 'galaxia':
+        padrao = PARAMETROS_GALAXIA
+    else:
+        raise ValueError("Simulação deve ser 'agente' ou 'galaxia'")
+
+    desconhecidos = set(parametros) - set(padrao)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(desconhecidos)}")
+
+    completos = dict(padrao)
+    completos.update(parametros)
+    return {nome: _normalizar(valor) for nome, valor in completos.items()}
+
+
+class CacheResultados:
+    """
+    Cache em disco endereçado por conteúdo para resultados de simulação.
+
+    Cada resultado é salvo em <diretorio>/<ab>/<chave>.npz, onde a chave é
+    o SHA-256 dos parâmetros, da semente, do tipo de simulação e da
+    versão do código.
+    """
+
+    def __init__(self, diretorio: str = '.cache_varredura'):
+        """
+        Parameters:
+        -----------
+        diretorio : str
+            Diretório raiz do cache
+        """
+        self.diretorio = diretorio
+
+    @staticmethod
+    def chave(parametros: Dict[str, Any], semente: int, simulacao: str,
+              versao: str = VERSAO_CODIGO) -> str:
+        """
+        Calcula a chave de conteúdo de um ponto.
+
+        Returns:
+        --------
+        str
+            Hash SHA-256 hexadecimal
+        """
+        conteudo = json.dumps({'parametros': parametros, 'semente': semente,
+                               'simulacao': simulacao, 'versao': versao},
+                              sort_keys=True)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, chave[:2], chave + '.npz')
+
+    def contem(self, chave: str) -> bool:
+        return os.path.exists(self._caminho(chave))
+
+    def carregar(self, chave: str) -> Optional[Dict[str, Any]]:
+        """
+        Lê um resultado do cache.
+
+        Returns:
+        --------
+        dict or None
+            Resultado salvo, ou None se a chave não existir
+        """
+        caminho = self._caminho(chave)
+        if not os.path.exists(caminho):
+            return None
+        with np.load(caminho, allow_pickle=False) as dados:
+            resultado = {nome: dados[nome] for nome in dados.files}
+        resultado['metricas'] = json.loads(str(resultado['metricas']))
+        return resultado
+
+    def salvar(self, chave: str, resultado: Dict[str, Any]) -> None:
+        """
+        Salva um resultado de forma atômica (escrita em arquivo temporário
+        seguida de renomeação), permitindo vários processos no mesmo cache.
+        """
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho),
+                                                 suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'wb') as arquivo:
+                np.savez_compressed(
+                    arquivo,
+                    trajetoria=np.asarray(resultado['trajetoria'], dtype=float),
+                    metricas=np.array(json.dumps(resultado['metricas'])),
+                )
+            os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+
+def _simular_agente(parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """Executa um AgenteConsciente isolado com os parâmetros dados."""
+    agente = AgenteConsciente(
+        posicao_inicial=tuple(parametros['posicao_inicial']),
+        velocidade_inicial=tuple(parametros['velocidade_inicial']),
+        horizonte_previsao=parametros['horizonte_previsao'],
+        forca_consciente=parametros['forca_consciente'],
+        temperatura=parametros['temperatura'],
+    )
+    trajetoria = agente.simular_orbita(steps=parametros['passos'],
+                                       dt=parametros['dt'])
+    distancia_final = float(np.linalg.norm(agente.posicao))
+
+    return {
+        'trajetoria': np.array(trajetoria),
+        'metricas': {
+            'distancia_final': distancia_final,
+            'passos_executados': len(trajetoria) - 1,
+            'escapou': distancia_final > 100.0,
+        },
+    }
+
+
+def _simular_galaxia(parametros: Dict[str, Any], semente: int,
+                     diretorio_campo_estelar: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Executa uma GalaxiaConsciente com agente usando os parâmetros dados.
+
+    As estrelas usam a semente do ponto; com diretorio_campo_estelar, sua
+    evolução é lida do cache do campo estelar em vez de integrada.
+    """
+    galaxia = GalaxiaConsciente(raio_galaxia=parametros['raio_galaxia'],
+                                num_estrelas=parametros['num_estrelas'],
+                                centro_massa=parametros['centro_massa'],
+                                semente=semente)
+    if diretorio_campo_estelar is not None:
+        galaxia.usar_campo_estelar(CacheCampoEstelar(diretorio_campo_estelar),
+                                   parametros['passos'], parametros['dt'])
+    galaxia.adicionar_agente_consciente(
+        posicao_inicial=tuple(parametros['posicao_inicial']),
+        velocidade_inicial=tuple(parametros['velocidade_inicial']),
+    )
+    agente = galaxia.agente_consciente
+    agente.forca_consciente = parametros['forca_consciente']
+    agente.horizonte_previsao = parametros['horizonte_previsao']
+    agente.temperatura = parametros['temperatura']
+
+    resultados = galaxia.simular_galaxia(passos=parametros['passos'],
+                                         dt=parametros['dt'])
+    dados_agente = resultados['agente_consciente']
+
+    return {
+        'trajetoria': np.array(dados_agente['trajetoria']),
+        'metricas': {
+            'distancia_final': float(dados_agente['distancia_final']),
+            'passos_executados': len(dados_agente['trajetoria']) - 1,
+            'escapou': bool(resultados['sucesso_escape']),
+            'chegou_objetivo': bool(resultados['sucesso_objetivo']),
+        },
+    }
+
+
+def _executar_ponto(tarefa: tuple) -> Dict[str, Any]:
+    """
+    Executa um ponto da grade (função de topo, serializável para o pool).
+
+    Parameters:
+    -----------
+    tarefa : tuple
+        (parametros, semente, simulacao, diretorio_campo_estelar)
+    """
+    parametros, semente, simulacao, diretorio_campo_estelar = tarefa
+    np.random.seed(semente)
+    if simulacao == 'agente':
+        return _simular_agente(parametros)
+    return _simular_galaxia(parametros, semente, diretorio_campo_estelar)
+
+
+def executar_varredura(grade: List[Dict[str, Any]],
+                       simulacao: str = 'agente',
+                       semente: int = 0,
+                       workers: Optional[int] = None,
+                       diretorio_cache: str = '.cache_varredura',
+                       diretorio_campo_estelar: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Executa uma grade de parâmetros usando o cache em disco.
+
+    Todos os pontos usam a mesma semente (números aleatórios comuns), de
+    forma que diferenças entre pontos refletem os parâmetros e não o ruído.
+
+    Parameters:
+    -----------
+    grade : list
+        Pontos da grade (ver gerar_grade); parâmetros ausentes usam o padrão
+    simulacao : str
+        'agente' (AgenteConsciente isolado) ou 'galaxia' (GalaxiaConsciente)
+    semente : int
+        Semente do gerador aleatório de cada ponto
+    workers : int, optional
+        Número de processos (padrão: todos os núcleos; 1 = execução serial)
+    diretorio_cache : str
+        Diretório do cache de resultados
+    diretorio_campo_estelar : str, optional
+        Diretório do cache do campo estelar (apenas 'galaxia'): pontos que
+        diferem só nos parâmetros do agente reutilizam a mesma evolução
+        das estrelas
+
+    Returns:
+    --------
+    list
+        Um dicionário por ponto, na ordem da grade, com 'parametros',
+        'chave', 'trajetoria', 'metricas' e 'em_cache'
+    """
+    cache = CacheResultados(diretorio_cache)
+    pontos = [completar_parametros(p, simulacao) for p in grade]
+    chaves = [cache.chave(p, semente, simulacao) for p in pontos]
+
+    # Apenas pontos inéditos (e sem duplicatas) são simulados
+    pendentes = {}
+    for parametros, chave in zip(pontos, chaves):
+        if chave not in pendentes and not cache.contem(chave):
+            pendentes[chave] = parametros
+
+    if simulacao == 'galaxia' and diretorio_campo_estelar is not None:
+        # Cada campo estelar distinto é calculado uma vez, antes do pool
+        cache_campo = CacheCampoEstelar(diretorio_campo_estelar)
+        campos = {(p['num_estrelas'], p['raio_galaxia'], p['centro_massa'], p['dt'], p['passos'])
+                  for p in pendentes.values()}
+        for num_estrelas, raio_galaxia, centro_massa, dt, passos in campos:
+            cache_campo.obter(semente, num_estrelas, raio_galaxia, centro_massa, dt, passos)
+
+    tarefas = [(p, semente, simulacao, diretorio_campo_estelar) for p in pendentes.values()]
+    if workers == 1 or len(tarefas) <= 1:
+        calculados = [_executar_ponto(t) for t in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            calculados = list(pool.map(_executar_ponto, tarefas))
+
+    for chave, resultado in zip(pendentes, calculados):
+        cache.salvar(chave, resultado)
+
+    resultados = []
+    for parametros, chave in zip(pontos, chaves):
+        resultado = cache.carregar(chave)
+        resultado['parametros'] = parametros
+        resultado['chave'] = chave
+        resultado['em_cache'] = chave not in pendentes
+        resultados.append(resultado)
+
+    return resultados
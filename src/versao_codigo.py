@@ -0,0 +1,42 @@
+"""
+Módulo de Versão do Código: Hash das Fontes do Pacote
+
+Os caches em disco (varredura_parametros e cache_estrelas) incluem na
+chave a versão do código que produziu cada resultado. Os resultados
+dependem não só dos simuladores, mas também de tudo o que eles importam
+(backends, conjunto ativo, aleatório, precisão, modelos de massa,
+integradores, tabelas de força); por isso a versão é o hash de todos os
+src/*.py, e não de uma lista escolhida à mão que envelhece a cada módulo
+novo.
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+
+def calcular_versao_codigo(diretorio: Optional[str] = None) -> str:
+    """
+    Calcula a versão do código como hash de todas as fontes do pacote.
+
+    Parameters:
+    -----------
+    diretorio : str, optional
+        Diretório das fontes (padrão: o deste módulo, src/)
+
+    Returns:
+    --------
+    str
+        Hash hexadecimal curto dos nomes e conteúdos dos arquivos .py
+    """
+    if diretorio is None:
+        diretorio = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha256()
+    for nome in sorted(n for n in os.listdir(diretorio) if n.endswith('.py')):
+        h.update(nome.encode())
+        with open(os.path.join(diretorio, nome), 'rb') as arquivo:
+            h.update(arquivo.read())
+    return h.hexdigest()[:16]
+
+
+VERSAO_CODIGO = calcular_versao_codigo()
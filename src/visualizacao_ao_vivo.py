@@ -0,0 +1,406 @@
+"""
+Módulo de Visualização ao Vivo: Simulação e Renderização Desacopladas
+
+simular_galaxia não mostra nada até terminar, e plotar dentro do laço
+deixaria a física tão lenta quanto o desenho. Aqui as duas partes rodam
+em threads separadas e só se comunicam por uma fila curta:
+
+- ProdutorSimulacao avança a galáxia (GalaxiaConsciente.iterar_passos,
+  sem histórico) numa thread e, a cada intervalo de passos, publica um
+  instantâneo dizimado (cópia de até maximo_estrelas estrelas e dos
+  corpos);
+- FilaDescarte é limitada e nunca bloqueia quem publica: cheia, ela
+  descarta o instantâneo mais antigo;
+- VisualizadorAoVivo consome o instantâneo mais recente na sua própria
+  taxa de quadros (fps) e o desenha com o blitting de AnimadorTrajetorias;
+  quadros que o desenho não acompanha são descartados, e a simulação não
+  espera pela renderização.
+
+Pausar e retomar custam à simulação só a leitura de um atributo por
+passo; a thread pausada espera num threading.Event, sem consumir CPU.
+Os kernels NumPy das estrelas liberam o GIL, de modo que a física e o
+desenho se sobrepõem; o desenho ainda disputa o GIL com a parte Python
+do passo, custo limitado por fps e maximo_estrelas.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from src.galaxia_consciente import FATOR_ESCAPE
+from src.graficos import pyplot
+
+# Instantâneos guardados na fila (o renderizador só usa o mais recente)
+CAPACIDADE_PADRAO = 2
+
+# Estrelas copiadas em cada instantâneo
+MAXIMO_ESTRELAS_PADRAO = 5000
+
+
+class FilaDescarte:
+    """
+    Fila limitada em que publicar nunca bloqueia.
+
+    Com a fila cheia, o item mais antigo é descartado. Segura para um
+    produtor e um consumidor em threads diferentes.
+
+    Atributos:
+    - publicados: Itens publicados
+    - descartados: Itens descartados sem serem consumidos
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_PADRAO):
+        if capacidade < 1:
+            raise ValueError("A capacidade deve ser >= 1")
+        self._itens = deque(maxlen=capacidade)
+        self._condicao = threading.Condition()
+        self.publicados = 0
+        self.descartados = 0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def publicar(self, item) -> None:
+        """Acrescenta um item, descartando o mais antigo se a fila estiver cheia."""
+        with self._condicao:
+            if len(self._itens) == self._itens.maxlen:
+                self.descartados += 1
+            self._itens.append(item)
+            self.publicados += 1
+            self._condicao.notify()
+
+    def mais_recente(self, timeout: Optional[float] = None):
+        """
+        Retira o item mais recente e descarta os anteriores.
+
+        Parameters:
+        -----------
+        timeout : float, optional
+            Segundos de espera por um item (None: espera indefinidamente;
+            0: não espera)
+
+        Returns:
+        --------
+        object or None
+            O item, ou None se nada foi publicado dentro do timeout
+        """
+        with self._condicao:
+            if not self._itens and timeout != 0:
+                self._condicao.wait(timeout)
+            if not self._itens:
+                return None
+            item = self._itens.pop()
+            self.descartados += len(self._itens)
+            self._itens.clear()
+            return item
+
+
+class ProdutorSimulacao:
+    """
+    Roda a galáxia numa thread e publica instantâneos dizimados.
+
+    Cada instantâneo é um dict como os quadros de animacao ('passo',
+    'estrelas' (M, d) e 'corpos' ({nome: posição})), com cópias: o estado
+    da galáxia continua mudando enquanto o instantâneo é desenhado.
+
+    Atributos:
+    - fila: FilaDescarte com os instantâneos
+    - resultados: Resultados da galáxia (como simular_galaxia), ao terminar
+    - erro: Exceção que interrompeu a simulação, se houver
+    """
+
+    def __init__(self, galaxia, passos: int = 1000, dt: float = 0.1,
+                 intervalo: int = 1,
+                 maximo_estrelas: int = MAXIMO_ESTRELAS_PADRAO,
+                 capacidade: int = CAPACIDADE_PADRAO,
+                 integrador_agente=None):
+        """
+        Parameters:
+        -----------
+        galaxia : GalaxiaConsciente
+            Galáxia a simular (o histórico é desativado)
+        passos, dt, integrador_agente
+            Como em simular_galaxia
+        intervalo : int
+            Passos entre instantâneos
+        maximo_estrelas : int
+            Estrelas copiadas por instantâneo (uma a cada
+            ceil(N / maximo_estrelas))
+        capacidade : int
+            Instantâneos guardados na fila
+        """
+        self.galaxia = galaxia
+        self.passos = passos
+        self.dt = dt
+        self.intervalo = max(int(intervalo), 1)
+        self.maximo_estrelas = maximo_estrelas
+        self.integrador_agente = integrador_agente
+        self.fila = FilaDescarte(capacidade)
+        self.resultados = None
+        self.erro = None
+
+        self._pausado = False
+        self._liberado = threading.Event()
+        self._liberado.set()
+        self._parar = False
+        self._thread = threading.Thread(target=self._executar, name='produtor-galaxia',
+                                        daemon=True)
+
+    @property
+    def ativo(self) -> bool:
+        """Se a simulação ainda está rodando."""
+        return self._thread.is_alive()
+
+    @property
+    def pausado(self) -> bool:
+        """Se a simulação está pausada."""
+        return self._pausado
+
+    def iniciar(self) -> 'ProdutorSimulacao':
+        """Inicia a thread da simulação."""
+        self._thread.start()
+        return self
+
+    def pausar(self) -> None:
+        """Pausa a simulação ao fim do passo corrente."""
+        self._liberado.clear()
+        self._pausado = True
+
+    def retomar(self) -> None:
+        """Retoma a simulação pausada."""
+        self._pausado = False
+        self._liberado.set()
+
+    def parar(self) -> None:
+        """Interrompe a simulação ao fim do passo corrente."""
+        self._parar = True
+        self.retomar()
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a simulação terminar.
+
+        Returns:
+        --------
+        bool
+            True se a thread terminou dentro do timeout
+        """
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def instantaneo(self, estrelas: Optional[np.ndarray] = None) -> Dict:
+        """
+        Cópia dizimada do estado atual da galáxia.
+
+        Parameters:
+        -----------
+        estrelas : np.ndarray, optional
+            Posições (N, d) das estrelas (padrão: galaxia.posicoes)
+
+        Returns:
+        --------
+        dict
+            'passo', 'estrelas' (M, d) e 'corpos' ({nome: posição})
+        """
+        galaxia = self.galaxia
+        if estrelas is None:
+            estrelas = galaxia.posicoes
+        estrelas = np.asarray(estrelas)
+        salto = max(-(-len(estrelas) // max(self.maximo_estrelas, 1)), 1)
+        corpos = {}
+        if galaxia.agente_consciente is not None:
+            corpos['agente'] = np.array(galaxia.agente_consciente.posicao, dtype=float)
+        return {'passo': galaxia.passo_atual,
+                'estrelas': np.array(estrelas[::salto]),
+                'corpos': corpos}
+
+    def _executar(self) -> None:
+        galaxia = self.galaxia
+        galaxia.registrar_historico = False
+        try:
+            self.fila.publicar(self.instantaneo())
+            ultimo = galaxia.passo_atual
+            for estrelas in galaxia.iterar_passos(self.passos, self.dt,
+                                                  self.integrador_agente):
+                ultimo = galaxia.passo_atual
+                if ultimo % self.intervalo == 0:
+                    self.fila.publicar(self.instantaneo(estrelas))
+                # Sem pausa, o custo por passo é a leitura destes dois atributos
+                if self._pausado:
+                    self._liberado.wait()
+                if self._parar:
+                    break
+            if ultimo % self.intervalo:
+                self.fila.publicar(self.instantaneo())
+            self.resultados = galaxia.resultados()
+        except Exception as erro:  # repassada por VisualizadorAoVivo.executar
+            self.erro = erro
+
+
+class VisualizadorAoVivo:
+    """
+    Mostra a galáxia enquanto ela é simulada.
+
+    A janela aceita as teclas espaço/p (pausar ou retomar) e q (parar);
+    fechar a janela também para a simulação.
+    """
+
+    def __init__(self, galaxia, passos: int = 1000, dt: float = 0.1,
+                 fps: float = 30, intervalo: int = 1,
+                 maximo_estrelas: int = MAXIMO_ESTRELAS_PADRAO,
+                 capacidade: int = CAPACIDADE_PADRAO,
+                 integrador_agente=None, **opcoes_animador):
+        """
+        Parameters:
+        -----------
+        galaxia : GalaxiaConsciente
+            Galáxia a simular
+        passos, dt, integrador_agente
+            Como em simular_galaxia
+        fps : float
+            Quadros por segundo do renderizador
+        intervalo, maximo_estrelas, capacidade
+            Como em ProdutorSimulacao
+        **opcoes_animador
+            Repassadas a AnimadorTrajetorias (tamanho, dpi, rastro...)
+        """
+        if fps <= 0:
+            raise ValueError("fps deve ser positivo")
+        self.galaxia = galaxia
+        self.fps = fps
+        self.produtor = ProdutorSimulacao(galaxia, passos, dt, intervalo, maximo_estrelas,
+                                          capacidade, integrador_agente)
+        self.opcoes_animador = opcoes_animador
+        self.quadros = 0
+        self._processar_eventos = None
+
+    def pausar(self) -> None:
+        """Pausa a simulação (a janela continua respondendo)."""
+        self.produtor.pausar()
+
+    def retomar(self) -> None:
+        """Retoma a simulação."""
+        self.produtor.retomar()
+
+    def alternar_pausa(self) -> None:
+        """Pausa a simulação rodando ou retoma a pausada."""
+        if self.produtor.pausado:
+            self.retomar()
+        else:
+            self.pausar()
+
+    def parar(self) -> None:
+        """Interrompe a simulação e o laço de renderização."""
+        self.produtor.parar()
+
+    def _animador_janela(self) -> Callable[[Dict], None]:
+        """Renderizador padrão: AnimadorTrajetorias numa janela do pyplot."""
+        from src.animacao import AnimadorTrajetorias
+
+        plt = pyplot()
+        opcoes = dict(self.opcoes_animador)
+        figura = plt.figure(figsize=opcoes.pop('tamanho', (8.0, 8.0)),
+                            dpi=opcoes.pop('dpi', 100))
+        nomes = ['agente'] if self.galaxia.agente_consciente is not None else []
+        animador = AnimadorTrajetorias(self.galaxia.raio_galaxia * FATOR_ESCAPE, nomes,
+                                       titulo=opcoes.pop('titulo', 'Galáxia ao vivo'),
+                                       figura=figura, **opcoes)
+
+        def tecla(evento):
+            if evento.key in (' ', 'p'):
+                self.alternar_pausa()
+            elif evento.key == 'q':
+                self.parar()
+
+        figura.canvas.mpl_connect('key_press_event', tecla)
+        figura.canvas.mpl_connect('close_event', lambda evento: self.parar())
+        # A janela precisa responder mesmo sem quadros novos (pausada)
+        self._processar_eventos = figura.canvas.flush_events
+        plt.show(block=False)
+        return animador.renderizar
+
+    def executar(self, renderizador: Optional[Callable[[Dict], None]] = None,
+                 quadros_maximos: Optional[int] = None) -> Dict:
+        """
+        Roda a simulação e renderiza até ela terminar.
+
+        Parameters:
+        -----------
+        renderizador : callable, optional
+            Recebe cada instantâneo desenhado (padrão: AnimadorTrajetorias
+            numa janela do pyplot)
+        quadros_maximos : int, optional
+            Para a simulação após este número de quadros
+
+        Returns:
+        --------
+        dict
+            Resultados da galáxia (como simular_galaxia), mais
+            'visualizacao': quadros, instantaneos_publicados,
+            instantaneos_descartados, tempo_s e fps_medio
+        """
+        if renderizador is None:
+            renderizador = self._animador_janela()
+
+        periodo = 1.0 / self.fps
+        produtor, fila = self.produtor, self.produtor.fila
+        inicio = time.perf_counter()
+        produtor.iniciar()
+        try:
+            while produtor.ativo or len(fila):
+                tique = time.perf_counter()
+                instantaneo = fila.mais_recente(timeout=periodo)
+                if instantaneo is not None:
+                    renderizador(instantaneo)
+                    self.quadros += 1
+                    if quadros_maximos is not None and self.quadros >= quadros_maximos:
+                        produtor.parar()
+                        break
+                elif self._processar_eventos is not None:
+                    self._processar_eventos()
+                restante = periodo - (time.perf_counter() - tique)
+                if restante > 0:
+                    time.sleep(restante)
+        finally:
+            produtor.parar()
+            produtor.aguardar()
+        if produtor.erro is not None:
+            raise produtor.erro
+
+        tempo = time.perf_counter() - inicio
+        resultados = produtor.resultados or self.galaxia.resultados()
+        resultados['visualizacao'] = {
+            'quadros': self.quadros,
+            'instantaneos_publicados': fila.publicados,
+            'instantaneos_descartados': fila.descartados,
+            'tempo_s': tempo,
+            'fps_medio': self.quadros / tempo if tempo > 0 else 0.0,
+        }
+        return resultados
+
+
+def visualizar_galaxia(galaxia, passos: int = 1000, dt: float = 0.1,
+                       fps: float = 30, **opcoes) -> Dict:
+    """
+    Simula a galáxia mostrando-a ao vivo numa janela.
+
+    Parameters:
+    -----------
+    galaxia : GalaxiaConsciente
+        Galáxia a simular
+    passos, dt : int, float
+        Como em simular_galaxia
+    fps : float
+        Quadros por segundo da janela
+    **opcoes
+        Repassadas a VisualizadorAoVivo
+
+    Returns:
+    --------
+    dict
+        Resultados de VisualizadorAoVivo.executar
+    """
+    return VisualizadorAoVivo(galaxia, passos, dt, fps, **opcoes).executar()
@@ -4,16 +4,54 @@ Testes para as simulações de gravidade emergente
 
 import sys
 import os
+import json
+import subprocess
+import tempfile
+import time
 import unittest
+from unittest import mock
 import numpy as np
 
 # Adicionar src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-from simulacao_1d import simular_queda_entropica, densidade_informacao, POSICAO_MASSA
-from agente_consciente import AgenteConsciente, comparar_agente_vs_materia_inerte
-from rotacao_galactica import forca_newtoniana, forca_verlinde, velocidade_orbital_estavel, simular_orbita
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from simulacao_1d import (simular_queda_entropica, densidade_informacao,
+                          densidade_informacao_vetorizada, POSICAO_MASSA)
+from agente_consciente import (AgenteConsciente, comparar_agente_vs_materia_inerte,
+                               comparar_agente_vs_materia_inerte_lote, mapa_comparacao,
+                               DESFECHO_ABSORVIDO, DESFECHO_ESCAPOU,
+                               densidade_entropica_vetorizada, direcao_tangencial)
+from rotacao_galactica import (forca_newtoniana, forca_verlinde, velocidade_orbital_estavel,
+                               simular_orbita, calcular_curva_rotacao,
+                               registrar_modelo_forca)
 from galaxia_consciente import GalaxiaConsciente
+import backend_forcas
+from backend_forcas import obter_backend, integrar_orbitas
+from passo_paralelo import ExecutorParaleloEstrelas
+from galaxias_lote import LoteGalaxias, DESFECHO_ATIVA, DESFECHO_CAPTURADO, DESFECHO_ESCAPOU
+from conjunto_ativo import ConjuntoAtivo
+from varredura_parametros import gerar_grade, executar_varredura, CacheResultados
+from cache_estrelas import CacheCampoEstelar
+from diagnosticos import DiagnosticoConservacao
+from monitor_orbital import MonitorOrbital, validar_curva_rotacao
+import benchmark_simulacoes
+from instrumentacao import Instrumentacao
+import linha_comando
+import graficos
+import animacao
+from aleatorio import ProvedorAleatorio
+from src import precisao  # o mesmo módulo (e precisão padrão) dos simuladores
+from visualizacao_ao_vivo import FilaDescarte, ProdutorSimulacao, VisualizadorAoVivo
+from piramide_trajetorias import PiramideSerie, PiramideCaminho, obter_piramide
+from integrador_adaptativo import FATOR_CRESCIMENTO_MAX, IntegradorAdaptativo
+from campo_entropico import GradeCampoEntropico, obter_grade_campo
+from modelos_massa import (MassaPontual, DiscoExponencial, DiscoGas, BojoHernquist,
+                           BojoPlummer, PerfilTabulado, ModeloMassaComposto)
+from ajuste_rotacao import (carregar_curva_observada, velocidade_verlinde_parametrica,
+                            ajustar_curva, ajustar_galaxias)
+from tabelas_forca import (TabelaForca, compilar_modelo, lei_interpolante,
+                           nu_simples, familia_nu_n)
 
 class TestSimulacao1D(unittest.TestCase):
     """Testes para a simulação 1D"""
@@ -155,6 +193,35 @@ class TestAgenteConsciente(unittest.TestCase):
         self.assertGreater(dist_consciente, 0.0)
         self.assertGreater(dist_inerte, 0.0)
 
+    def test_comparacao_em_lote(self):
+        """Testa comparação vetorizada de muitos agentes e partículas inertes"""
+        np.random.seed(3)
+        m = 64
+        posicoes = np.tile([10.0, 0.0], (m, 1))
+        velocidades = np.tile([0.0, 1.0], (m, 1))
+        lote = comparar_agente_vs_materia_inerte_lote(posicoes, velocidades, steps=300)
+
+        for nome in ('raio_final_consciente', 'tempo_vida_inerte', 'desfecho_inerte'):
+            self.assertEqual(lote[nome].shape, (m,))
+
+        # Partículas absorvidas terminam dentro do raio de absorção
+        absorvidas = lote['desfecho_inerte'] == DESFECHO_ABSORVIDO
+        self.assertTrue(np.all(lote['raio_final_inerte'][absorvidas] < 1.0))
+        self.assertTrue(np.all(lote['tempo_vida_inerte'][absorvidas] <= 300))
+        escaparam = lote['desfecho_consciente'] == DESFECHO_ESCAPOU
+        self.assertTrue(np.all(lote['raio_final_consciente'][escaparam] > 100.0))
+
+    def test_mapa_comparacao(self):
+        """Testa mapa de vitória da consciência sobre condições iniciais"""
+        np.random.seed(4)
+        mapa = mapa_comparacao(np.array([5.0, 10.0, 20.0]), np.array([0.0, 1.0]),
+                               steps=100, repeticoes=4)
+
+        self.assertEqual(mapa['vitoria_consciente'].shape, (3, 2))
+        self.assertTrue(np.all(np.isfinite(mapa['raio_final_consciente'])))
+        self.assertTrue(np.all((mapa['vitoria_consciente'] >= 0) &
+                               (mapa['vitoria_consciente'] <= 1)))
+
 class TestRotacaoGalactica(unittest.TestCase):
     """Testes para simulação de rotação galáctica"""
 
@@ -234,6 +301,1050 @@ class TestRotacaoGalactica(unittest.TestCase):
         for v in v_newton + v_verlinde:
             self.assertGreater(v, 0)
 
+class TestModelosMassa(unittest.TestCase):
+    """Testes para perfis de massa estendidos"""
+
+    def test_limites_analiticos(self):
+        """Testa massas encerradas em limites conhecidos"""
+        self.assertAlmostEqual(BojoHernquist(500.0, 2.0).massa_encerrada(1e9), 500.0, places=3)
+        self.assertAlmostEqual(BojoPlummer(500.0, 2.0).massa_encerrada(2.0), 500.0 / 2 ** 1.5)
+        self.assertAlmostEqual(DiscoExponencial(800.0, 5.0).massa_encerrada(0.0), 0.0)
+
+        # Esfera de densidade uniforme
+        raios = np.linspace(0.5, 10.0, 400)
+        esfera = PerfilTabulado(raios, np.ones_like(raios))
+        self.assertAlmostEqual(esfera.massa_encerrada(10.0) / (4 / 3 * np.pi * 1000.0), 1.0, places=3)
+
+    def test_modelo_composto_tabelado(self):
+        """Testa que a tabela composta reproduz a soma dos componentes"""
+        componentes = [MassaPontual(100.0), DiscoExponencial(800.0, 5.0),
+                       BojoHernquist(200.0, 1.0), DiscoGas(100.0)]
+        modelo = ModeloMassaComposto(componentes)
+
+        raios = np.logspace(-1, 3, 50)
+        exato = sum(c.massa_encerrada(raios) for c in componentes)
+        np.testing.assert_allclose(modelo.massa_encerrada(raios), exato, rtol=1e-4)
+
+    def test_composto_abaixo_de_r_min(self):
+        """Testa massa pontual + halo abaixo do intervalo tabelado"""
+        from modelos_massa import PerfilMassa
+        pontual, halo = MassaPontual(100.0), BojoHernquist(5000.0, 20.0)
+        modelo = pontual + halo
+        raios = np.array([1e-4, 5e-3, modelo.r_min / 2])
+        # A massa pontual não cai com r³ abaixo de r_min
+        np.testing.assert_allclose(modelo.massa_encerrada(raios),
+                                   100.0 + halo.massa_encerrada(raios), rtol=1e-12)
+        self.assertAlmostEqual(modelo.massa_encerrada(1e-6), 100.0, places=6)
+
+        with self.assertRaises(TypeError):
+            PerfilMassa()
+
+    def test_forcas_vetorizadas_com_perfil(self):
+        """Testa forças vetorizadas com perfil de massa e massa pontual padrão"""
+        raios = np.array([0.0, 5.0, 50.0, 150.0])
+        np.testing.assert_allclose(forca_verlinde(raios), [forca_verlinde(r) for r in raios])
+
+        modelo = ModeloMassaComposto([DiscoExponencial(1000.0, 10.0)])
+        vetorizada = forca_newtoniana(raios, modelo)
+        pontual = [forca_newtoniana(r, modelo) for r in raios]
+        np.testing.assert_allclose(vetorizada, pontual)
+
+        # Massa estendida: menos massa encerrada no centro que a pontual
+        v_pontual = calcular_curva_rotacao([5.0], 'verlinde')
+        v_disco = calcular_curva_rotacao([5.0], 'verlinde', modelo)
+        self.assertLess(v_disco[0], v_pontual[0])
+
+        tx, ty, v_media = simular_orbita('verlinde', 30.0, 50, modelo_massa=modelo)
+        self.assertEqual(len(tx), 51)
+        self.assertGreater(v_media, 0)
+
+class TestAjusteRotacao(unittest.TestCase):
+    """Testes para o ajuste de curvas de rotação observadas"""
+
+    def _escrever_curva(self, diretorio, nome, massa, a0, n, ruido=0.0):
+        raios = np.linspace(2.0, 150.0, 30)
+        v = velocidade_verlinde_parametrica(raios, massa, a0, n)
+        sigma = 0.02 * v + 0.1
+        v = v + ruido * sigma * np.random.default_rng(0).standard_normal(len(v))
+        caminho = os.path.join(diretorio, nome)
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write('# curva sintética\nraio,velocidade,sigma\n')
+            for linha in zip(raios, v, sigma):
+                arquivo.write('%.10g,%.10g,%.10g\n' % linha)
+        return caminho
+
+    def test_transicao_tende_a_verlinde(self):
+        """Testa que a transição suave recupera forca_verlinde para n grande"""
+        raios = np.array([5.0, 50.0, 150.0])
+        esperado = velocidade_orbital_estavel(raios, 'verlinde')
+        obtido = velocidade_verlinde_parametrica(raios, 1000.0, 0.2, n=200.0)
+        np.testing.assert_allclose(obtido, esperado, rtol=1e-2)
+
+    def test_recupera_parametros(self):
+        """Testa recuperação dos parâmetros de uma curva sintética"""
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = self._escrever_curva(diretorio, 'ngc_teste.csv', 3000.0, 0.3, 4.0)
+            curva = carregar_curva_observada(caminho)
+            self.assertEqual(curva['nome'], 'ngc_teste')
+            self.assertEqual(len(curva['raio']), 30)
+
+            for metodo in ('analitico', 'diferencas'):
+                resultado = ajustar_curva(curva, jacobiano=metodo)
+                self.assertTrue(resultado['sucesso'])
+                self.assertAlmostEqual(resultado['massa'] / 3000.0, 1.0, places=3)
+                self.assertAlmostEqual(resultado['a0'] / 0.3, 1.0, places=2)
+                self.assertLess(resultado['chi2_reduzido'], 1e-6)
+
+    def test_ajuste_em_lote(self):
+        """Testa ajuste de várias galáxias em paralelo"""
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminhos = [self._escrever_curva(diretorio, f'g{i}.txt', 1000.0 * (i + 1), 0.2, 8.0, 1.0)
+                        for i in range(3)]
+            resultados = ajustar_galaxias(caminhos, workers=2, livres=('massa',))
+
+            self.assertEqual([r['arquivo'] for r in resultados], caminhos)
+            for i, resultado in enumerate(resultados):
+                self.assertAlmostEqual(resultado['massa'] / (1000.0 * (i + 1)), 1.0, places=1)
+
+class TestTabelasForca(unittest.TestCase):
+    """Testes para o registro de leis de força e tabelas compiladas"""
+
+    def test_registro_de_modelo(self):
+        """Testa modelo customizado registrado por nome"""
+        registrar_modelo_forca('teste_mond', lei_interpolante(nu_simples))
+        v = velocidade_orbital_estavel(np.array([10.0, 50000.0]), 'teste_mond')
+        self.assertTrue(np.all(v > 0))
+
+        # Regime profundo: v^4 -> G M a0 (curva plana)
+        self.assertAlmostEqual(v[1] ** 4 / (1000.0 * 0.2), 1.0, places=2)
+
+        with self.assertRaises(ValueError):
+            velocidade_orbital_estavel(10.0, 'modelo_inexistente')
+
+    def test_tabela_erro_controlado(self):
+        """Testa que a tabela respeita a tolerância relativa"""
+        lei = lei_interpolante(familia_nu_n(3.0))
+        tabela = TabelaForca(lei, r_min=0.5, r_max=2000.0, tolerancia=1e-6)
+
+        raios = np.exp(np.random.default_rng(0).uniform(np.log(0.5), np.log(2000.0), 1000))
+        np.testing.assert_allclose(tabela(raios), lei(raios), rtol=2e-6)
+        self.assertAlmostEqual(tabela(37.3) / lei(37.3), 1.0, places=5)
+
+        # Fora do intervalo a lei original é usada
+        self.assertEqual(tabela(5000.0), lei(5000.0))
+
+    def test_orbita_com_tabela(self):
+        """Testa integração de órbita com lei tabelada em cache"""
+        tabela = compilar_modelo(forca_verlinde, tolerancia=1e-4)
+        self.assertIs(tabela, compilar_modelo(forca_verlinde, tolerancia=1e-4))
+
+        tx_a, ty_a, _ = simular_orbita('verlinde', 50.0, 500)
+        tx_t, ty_t, _ = simular_orbita(tabela, 50.0, 500)
+        self.assertAlmostEqual(tx_a[-1], tx_t[-1], places=1)
+        self.assertAlmostEqual(ty_a[-1], ty_t[-1], places=1)
+
+    def test_mond_registrado_sem_tabelas(self):
+        """Testa que as leis MOND existem sem importar tabelas_forca"""
+        codigo = ("import sys; from src import rotacao_galactica as rg; "
+                  "rg.simular_orbita('mond_simples', 50.0, 10); "
+                  "rg.obter_modelo_forca('mond_padrao'); "
+                  "print('src.tabelas_forca' in sys.modules)")
+        raiz = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        saida = subprocess.run([sys.executable, '-c', codigo], cwd=raiz, capture_output=True,
+                               text=True, check=True)
+        self.assertEqual(saida.stdout.strip(), 'False')
+
+    def test_tabela_aceita_massa_igual(self):
+        """Testa que a tabela compara o modelo de massa por igualdade"""
+        tabela = TabelaForca(forca_verlinde, r_min=1.0, r_max=100.0, modelo_massa=1000.0)
+        massa = float('1' + '000.0')  # mesmo valor, outro objeto
+        self.assertEqual(tabela(10.0, massa), tabela(10.0))
+        with self.assertRaises(ValueError):
+            tabela(10.0, 2000.0)
+
+class TestBackendForcas(unittest.TestCase):
+    """Testes para os backends do kernel de força"""
+
+    def test_kernel_igual_a_forca_verlinde(self):
+        """Testa que o kernel vetorizado reproduz forca_verlinde"""
+        posicoes = np.random.uniform(-200, 200, (1000, 2))
+        r = np.linalg.norm(posicoes, axis=1)
+        esperado = -forca_verlinde(r)[:, None] * posicoes / r[:, None]
+        for nome in backend_forcas.backends_disponiveis():
+            aceleracao = obter_backend(nome).aceleracao(posicoes)
+            np.testing.assert_allclose(aceleracao, esperado, rtol=1e-12)
+
+    def test_fallback_sem_numexpr(self):
+        """Testa que 'auto' usa NumPy quando numexpr não está disponível"""
+        original = backend_forcas.numexpr
+        backend_forcas.numexpr = None
+        try:
+            self.assertEqual(obter_backend('auto').nome, 'numpy')
+            with self.assertRaises(ImportError):
+                obter_backend('numexpr')
+        finally:
+            backend_forcas.numexpr = original
+        with self.assertRaises(ValueError):
+            obter_backend('inexistente')
+
+    def test_selecao_backend_galaxia(self):
+        """Testa que a troca de backend em tempo de execução preserva a física"""
+        np.random.seed(0)
+        referencia = GalaxiaConsciente(num_estrelas=8)
+        referencia.simular_galaxia(passos=20)
+
+        np.random.seed(0)
+        galaxia = GalaxiaConsciente(num_estrelas=8)
+        galaxia.simular_galaxia(passos=10)
+        galaxia.definir_backend('auto')
+        galaxia.simular_galaxia(passos=10)
+
+        np.testing.assert_allclose(galaxia.posicoes, referencia.posicoes, rtol=1e-10)
+        self.assertEqual(len(galaxia.estrelas[0]['trajetoria']), 21)
+        np.testing.assert_array_equal(galaxia.estrelas[0]['trajetoria'][-1],
+                                      galaxia.estrelas[0]['posicao'])
+
+        # Órbitas independentes integradas em lote coincidem com as estrelas
+        np.random.seed(0)
+        inicial = GalaxiaConsciente(num_estrelas=8)
+        posicoes, _ = integrar_orbitas(inicial.posicoes, inicial.velocidades, passos=20)
+        np.testing.assert_allclose(posicoes, referencia.posicoes, rtol=1e-10)
+
+class TestPassoParalelo(unittest.TestCase):
+    """Testes para o passo das estrelas em memória compartilhada"""
+
+    def test_executor_igual_ao_serial(self):
+        """Testa que os workers reproduzem a integração serial"""
+        posicoes = np.random.uniform(5, 100, (101, 2))
+        velocidades = np.random.normal(0, 1, (101, 2))
+        esperado, _ = integrar_orbitas(posicoes, velocidades, passos=15)
+
+        with ExecutorParaleloEstrelas(posicoes, velocidades, workers=3) as executor:
+            for _ in range(15):
+                executor.passo(0.1)
+            np.testing.assert_allclose(executor.posicoes, esperado, rtol=1e-12)
+
+        with self.assertRaises(RuntimeError):
+            executor.iniciar_passo(0.1)
+
+    def test_galaxia_paralela(self):
+        """Testa galáxia com workers: mesmo resultado e retorno ao modo serial"""
+        np.random.seed(0)
+        serial = GalaxiaConsciente(num_estrelas=12)
+        serial.simular_galaxia(passos=30)
+
+        np.random.seed(0)
+        galaxia = GalaxiaConsciente(num_estrelas=12)
+        galaxia.definir_paralelismo(workers=2)
+        try:
+            galaxia.simular_galaxia(passos=20)
+        finally:
+            galaxia.encerrar_paralelismo()
+        galaxia.simular_galaxia(passos=10)
+
+        np.testing.assert_allclose(galaxia.posicoes, serial.posicoes, rtol=1e-12)
+        np.testing.assert_array_equal(galaxia.estrelas[5]['posicao'], galaxia.posicoes[5])
+        self.assertEqual(len(galaxia.estrelas[5]['trajetoria']), 31)
+
+    def test_worker_morto_gera_erro(self):
+        """Testa que a morte de um worker vira RuntimeError em vez de bloquear"""
+        from multiprocessing import shared_memory
+        posicoes = np.random.uniform(5, 100, (40, 2))
+        executor = ExecutorParaleloEstrelas(posicoes, np.zeros_like(posicoes), workers=2,
+                                            tempo_limite=30.0)
+        executor.passo(0.1)
+        processos = list(executor._processos)
+        nomes = [memoria.name for memoria in executor._memorias]
+        processos[0].kill()
+        processos[0].join()
+
+        inicio = time.perf_counter()
+        with self.assertRaisesRegex(RuntimeError, 'worker 0'):
+            executor.passo(0.1)
+        # Detectado pelo término do processo, não pelo tempo limite
+        self.assertLess(time.perf_counter() - inicio, 10.0)
+        self.assertFalse(any(processo.is_alive() for processo in processos))
+        for nome in nomes:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=nome)
+        executor.fechar()
+
+    def test_finalizador_libera_recursos(self):
+        """Testa que um executor descartado sem fechar() libera workers e memória"""
+        import gc
+        from multiprocessing import shared_memory
+        posicoes = np.random.uniform(5, 100, (40, 2))
+        executor = ExecutorParaleloEstrelas(posicoes, np.zeros_like(posicoes), workers=2)
+        executor.passo(0.1)
+        processos = list(executor._processos)
+        nomes = [memoria.name for memoria in executor._memorias]
+        del executor
+        gc.collect()
+        self.assertFalse(any(processo.is_alive() for processo in processos))
+        for nome in nomes:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=nome)
+
+class TestGalaxiasLote(unittest.TestCase):
+    """Testes para a simulação de galáxias em lote"""
+
+    def test_lote_igual_a_galaxias_individuais(self):
+        """Testa que o lote reproduz GalaxiaConsciente galáxia a galáxia"""
+        massas, raios, estrelas = [1000.0, 1500.0], [80.0, 60.0], [12, 5]
+
+        np.random.seed(4)
+        individuais = [GalaxiaConsciente(raio_galaxia=r, num_estrelas=n, centro_massa=m)
+                       for m, r, n in zip(massas, raios, estrelas)]
+        for galaxia in individuais:
+            galaxia.adicionar_agente_consciente(posicao_inicial=(25.0, 0.0),
+                                                velocidade_inicial=(0.0, 3.0))
+            galaxia.agente_consciente.temperatura = 0.0
+            galaxia.simular_galaxia(passos=300)
+
+        np.random.seed(4)
+        lote = LoteGalaxias(2, estrelas, raios, massas, posicao_agente=(25.0, 0.0),
+                            velocidade_agente=(0.0, 3.0), temperatura=0.0)
+        resultados = lote.simular(passos=300)
+
+        for k, galaxia in enumerate(individuais):
+            self.assertEqual(resultados['passos_executados'][k],
+                             len(galaxia.agente_consciente.trajetoria) - 1)
+            np.testing.assert_allclose(resultados['posicao_final_agente'][k],
+                                       galaxia.agente_consciente.posicao, rtol=1e-12)
+            np.testing.assert_allclose(lote.posicoes[k, :estrelas[k]], galaxia.posicoes,
+                                       rtol=1e-12)
+        # Preenchimento permanece na origem
+        self.assertFalse(lote.mascara_estrelas[1, 5:].any())
+        np.testing.assert_array_equal(lote.posicoes[1, 5:], 0.0)
+
+    def test_mascara_de_termino(self):
+        """Testa que galáxias terminadas ficam congeladas"""
+        # Galáxia 0 pequena (agente escapa cedo), galáxia 1 grande
+        lote = LoteGalaxias(2, num_estrelas=4, raio_galaxia=[20.0, 500.0],
+                            posicao_agente=(10.0, 0.0), sementes=[0, 1])
+        resultados = lote.simular(passos=100)
+
+        self.assertEqual(resultados['desfechos'][0], DESFECHO_ESCAPOU)
+        self.assertEqual(resultados['desfechos'][1], DESFECHO_ATIVA)
+        self.assertEqual(resultados['passos_executados'][1], 100)
+        self.assertLess(resultados['passos_executados'][0], 100)
+
+        trajetorias = resultados['trajetorias_agente']
+        self.assertEqual(trajetorias.shape, (101, 2, 2))
+        parada = resultados['passos_executados'][0]
+        self.assertTrue(np.all(trajetorias[parada:, 0] == trajetorias[-1, 0]))
+
+    def test_captura_igual_a_galaxia_individual(self):
+        """Testa que o lote termina por captura no mesmo passo de GalaxiaConsciente"""
+        # Sem força consciente nem ruído, o agente atravessa o centro em linha reta
+        np.random.seed(2)
+        galaxia = GalaxiaConsciente(num_estrelas=6, raio_galaxia=60.0)
+        galaxia.adicionar_agente_consciente(posicao_inicial=(10.0, 0.0),
+                                            velocidade_inicial=(-1.0, 0.05))
+        galaxia.agente_consciente.temperatura = 0.0
+        galaxia.agente_consciente.forca_consciente = 0.0
+        galaxia.simular_galaxia(passos=500)
+        self.assertEqual(galaxia.eventos[-1]['tipo'], 'capturada')
+
+        np.random.seed(2)
+        lote = LoteGalaxias(1, 6, 60.0, posicao_agente=(10.0, 0.0),
+                            velocidade_agente=(-1.0, 0.05), forca_consciente=0.0,
+                            temperatura=0.0)
+        resultados = lote.simular(passos=500)
+
+        self.assertEqual(resultados['desfechos'][0], DESFECHO_CAPTURADO)
+        self.assertEqual(resultados['passos_executados'][0],
+                         len(galaxia.agente_consciente.trajetoria) - 1)
+        np.testing.assert_allclose(resultados['posicao_final_agente'][0],
+                                   galaxia.agente_consciente.posicao, rtol=1e-12)
+        np.testing.assert_allclose(lote.posicoes[0], galaxia.posicoes, rtol=1e-12)
+
+    def test_estrelas_removidas_congeladas(self):
+        """Testa que estrelas capturadas/escapadas congelam como no ConjuntoAtivo"""
+        lote = LoteGalaxias(1, 40, 30.0, sementes=[1], temperatura=0.0)
+        lote.velocidades[0, :6] *= 3.0     # ejetadas
+        lote.velocidades[0, 6:12] *= 0.05  # caem no centro
+        resultados = lote.simular(passos=200)
+
+        galaxia = GalaxiaConsciente(num_estrelas=40, raio_galaxia=30.0, semente=1)
+        galaxia.velocidades[:6] *= 3.0
+        galaxia.velocidades[6:12] *= 0.05
+        galaxia.simular_galaxia(passos=int(resultados['passos_executados'][0]))
+
+        self.assertEqual(resultados['estrelas_ativas'][0], galaxia._conjunto_ativo.num_ativos)
+        self.assertLess(resultados['estrelas_ativas'][0], 40)
+        np.testing.assert_allclose(lote.posicoes[0], galaxia.posicoes, rtol=1e-12)
+
+class TestConjuntoAtivo(unittest.TestCase):
+    """Testes para a remoção de corpos capturados e ejetados"""
+
+    @staticmethod
+    def _galaxia_perturbada(**kwargs):
+        galaxia = GalaxiaConsciente(num_estrelas=40, raio_galaxia=30.0, semente=1, **kwargs)
+        galaxia.velocidades[:6] *= 3.0     # ejetadas
+        galaxia.velocidades[6:12] *= 0.05  # caem no centro
+        return galaxia
+
+    def test_eventos_e_congelamento(self):
+        """Testa registro de capturas/escapes e corpos congelados no evento"""
+        galaxia = self._galaxia_perturbada()
+        resultados = galaxia.simular_galaxia(passos=200)
+
+        eventos = resultados['eventos']
+        self.assertEqual(sorted(e['id'] for e in eventos), list(range(12)))
+        self.assertEqual({e['tipo'] for e in eventos if e['id'] < 6}, {'escapou'})
+        self.assertEqual({e['tipo'] for e in eventos if e['id'] >= 6}, {'capturada'})
+        self.assertEqual(resultados['estrelas_ativas'], 28)
+
+        for evento in eventos:
+            np.testing.assert_array_equal(galaxia.posicoes[evento['id']], evento['posicao'])
+            self.assertAlmostEqual(evento['tempo'], 0.1 * evento['passo'])
+
+    def test_compactacao_nao_altera_resultado(self):
+        """Testa que compactação, modo serial, paralelo e cache coincidem"""
+        referencia = self._galaxia_perturbada()
+        referencia._conjunto_ativo.intervalo_compactacao = 0
+        referencia.simular_galaxia(passos=100)
+
+        compactada = self._galaxia_perturbada()
+        compactada._conjunto_ativo.intervalo_compactacao = 3
+        compactada.simular_galaxia(passos=100)
+        np.testing.assert_array_equal(compactada.posicoes, referencia.posicoes)
+
+        paralela = self._galaxia_perturbada()
+        paralela.definir_paralelismo(workers=2)
+        try:
+            paralela.simular_galaxia(passos=100)
+        finally:
+            paralela.encerrar_paralelismo()
+        np.testing.assert_array_equal(paralela.posicoes, referencia.posicoes)
+        self.assertEqual([(e['id'], e['passo']) for e in paralela.eventos],
+                         [(e['id'], e['passo']) for e in referencia.eventos])
+
+    def test_conjunto_isolado(self):
+        """Testa ConjuntoAtivo diretamente com o backend NumPy"""
+        posicoes = np.array([[1.5, 0.0], [10.0, 0.0], [60.0, 0.0]])
+        velocidades = np.zeros((3, 2))
+        conjunto = ConjuntoAtivo(posicoes, velocidades, raio_captura=2.0, raio_escape=50.0,
+                                 intervalo_compactacao=1)
+        novos = conjunto.passo(obter_backend('numpy'), 0.01, passo=1, tempo=0.01)
+
+        self.assertEqual([(e['id'], e['tipo']) for e in novos],
+                         [(0, 'capturada'), (2, 'escapou')])
+        self.assertEqual(conjunto.num_ativos, 1)
+        np.testing.assert_array_equal(conjunto.ids_ativos, [1])
+
+        # Após compactação, só o corpo ativo se move
+        congelada = posicoes[0].copy()
+        conjunto.passo(obter_backend('numpy'), 0.01, passo=2, tempo=0.02)
+        np.testing.assert_array_equal(posicoes[0], congelada)
+        self.assertLess(posicoes[1, 0], 10.0)
+
+class TestGalaxia3D(unittest.TestCase):
+    """Testes para o modo 3D (estados (N, d))"""
+
+    def _simular(self, **kwargs):
+        np.random.seed(1)
+        galaxia = GalaxiaConsciente(num_estrelas=30, semente=3, **kwargs)
+        galaxia.adicionar_agente_consciente()
+        galaxia.agente_consciente.temperatura = 0.0
+        galaxia.simular_galaxia(passos=200)
+        return galaxia
+
+    def test_disco_plano_reproduz_2d(self):
+        """Testa que o 3D sem inclinação é o 2D com z = 0"""
+        plana = self._simular()
+        espacial = self._simular(dimensao=3)
+
+        self.assertEqual(espacial.posicoes.shape, (30, 3))
+        np.testing.assert_array_equal(espacial.posicoes[:, :2], plana.posicoes)
+        np.testing.assert_array_equal(espacial.posicoes[:, 2], 0.0)
+        np.testing.assert_array_equal(np.array(espacial.agente_consciente.trajetoria)[:, :2],
+                                      plana.agente_consciente.trajetoria)
+
+        # Direção tangencial 3D no plano coincide com a 2D, nos dois sentidos
+        v = np.array([[0.5, 1.0], [0.5, -1.0]])
+        x = np.array([[3.0, 0.0], [3.0, 0.0]])
+        np.testing.assert_array_equal(direcao_tangencial(np.pad(x, ((0, 0), (0, 1))),
+                                                         np.pad(v, ((0, 0), (0, 1))))[:, :2],
+                                      direcao_tangencial(x, v))
+
+    def test_orbitas_inclinadas(self):
+        """Testa órbitas inclinadas: saem do plano e continuam circulares"""
+        galaxia = GalaxiaConsciente(num_estrelas=20, semente=5, dimensao=3,
+                                    inclinacao_maxima=np.pi / 4)
+        raios = np.linalg.norm(galaxia.posicoes, axis=1)
+        for _ in range(200):
+            galaxia.atualizar_fisica_estrelas(0.05)
+
+        self.assertGreater(np.abs(galaxia.posicoes[:, 2]).max(), 1.0)
+        np.testing.assert_allclose(np.linalg.norm(galaxia.posicoes, axis=1), raios, rtol=0.05)
+
+    def test_agente_escapa_fora_do_plano(self):
+        """Testa agentes 3D (galáxia e lote) escapando na direção z"""
+        np.random.seed(2)
+        galaxia = GalaxiaConsciente(num_estrelas=10, semente=0, dimensao=3)
+        galaxia.adicionar_agente_consciente(posicao_inicial=(20.0, 0.0, 0.0),
+                                            velocidade_inicial=(0.0, 2.0, 0.0),
+                                            objetivo=(0.0, 0.0, 150.0))
+        resultados = galaxia.simular_galaxia(passos=1000)
+        self.assertTrue(resultados['sucesso_escape'])
+        self.assertGreater(galaxia.agente_consciente.posicao[2], 30.0)
+
+        lote = LoteGalaxias(3, num_estrelas=10, dimensao=3, inclinacao_maxima=0.3,
+                            velocidade_agente=(0.0, 2.0, 1.0), sementes=[0, 1, 2])
+        resultados = lote.simular(passos=500)
+        self.assertEqual(resultados['trajetorias_agente'].shape[1:], (3, 3))
+        self.assertTrue(resultados['sucesso_escape'].all())
+        self.assertTrue((lote.posicoes_agente[:, 2] > 0).all())
+
+class TestDiagnosticos(unittest.TestCase):
+    """Testes para os diagnósticos de conservação"""
+
+    def test_potencial_tabelado(self):
+        """Testa a tabela do potencial de Verlinde contra a forma fechada"""
+        from tabelas_forca import compilar_potencial
+        from rotacao_galactica import A_0
+        massa = 1000.0
+        potencial = compilar_potencial('verlinde', modelo_massa=massa)
+        self.assertIs(compilar_potencial('verlinde', modelo_massa=massa), potencial)
+
+        r = np.logspace(-1, 5, 500)
+        r_t = np.sqrt(massa / A_0)  # Transição newtoniano -> entrópico
+        esperado = np.where(r < r_t, massa * (1 / r[0] - 1 / r),
+                            massa * (1 / r[0] - 1 / r_t) + np.sqrt(A_0 * massa) * np.log(r / r_t))
+        valores, r_g = potencial.avaliar(r)
+        np.testing.assert_allclose(valores - valores[0], esperado, atol=1e-4)
+        np.testing.assert_allclose(r_g, r * forca_verlinde(r, massa), rtol=1e-6)
+
+    def test_deriva_por_integrador(self):
+        """Testa derivas e razão virial em órbitas circulares"""
+        from galaxia_consciente import condicoes_iniciais_estrelas
+        _, posicoes, velocidades = condicoes_iniciais_estrelas(200, semente=0)
+        derivas = {}
+        for integrador in ('euler_semi_implicito', 'leapfrog'):
+            diagnostico = DiagnosticoConservacao(10, 'verlinde', 1000.0)
+            integrar_orbitas(posicoes, velocidades, 200, 0.1, massa=1000.0,
+                             backend=obter_backend('numpy'), integrador=integrador,
+                             diagnostico=diagnostico)
+            resumo = diagnostico.resumo()
+            self.assertEqual(resumo['registros'], 21)
+            self.assertAlmostEqual(resumo['razao_virial'][0], 1.0, places=6)
+            self.assertLess(resumo['deriva_momento_angular_maxima'], 1e-10)
+            derivas[integrador] = resumo['deriva_energia_maxima']
+
+        self.assertLess(derivas['leapfrog'], 1e-3)
+        self.assertLess(derivas['leapfrog'], derivas['euler_semi_implicito'] / 10)
+
+    def test_galaxia_e_simular_orbita(self):
+        """Testa os diagnósticos opcionais da galáxia e de simular_orbita"""
+        np.random.seed(0)
+        galaxia = GalaxiaConsciente(num_estrelas=20, semente=1)
+        self.assertIsNone(galaxia.simular_galaxia(passos=5)['diagnosticos'])
+
+        galaxia.ativar_diagnosticos(intervalo=5)
+        resultados = galaxia.simular_galaxia(passos=20)
+        diagnosticos = resultados['diagnosticos']
+        np.testing.assert_array_equal(diagnosticos['passo'], [5, 10, 15, 20, 25])
+        self.assertLess(diagnosticos['deriva_energia_maxima'], 0.1)
+
+        diagnostico = DiagnosticoConservacao(25, 'newton', 500.0)
+        simular_orbita('newton', 10.0, 100, 0.01, 500.0, diagnostico=diagnostico)
+        resumo = diagnostico.resumo()
+        np.testing.assert_array_equal(resumo['passo'], [0, 25, 50, 75, 100])
+        self.assertTrue(diagnostico.dentro_da_tolerancia(1e-3))
+
+class TestMonitorOrbital(unittest.TestCase):
+    """Testes para a detecção de revoluções e o término antecipado"""
+
+    def test_orbita_kepleriana(self):
+        """Testa período, precessão e faixa de raios de uma elipse newtoniana"""
+        massa, r_apo, v_apo = 1000.0, 150.0, 2.0
+        monitor = MonitorOrbital(orbitas=3)
+        integrar_orbitas(np.array([[r_apo, 0.0]]), np.array([[0.0, v_apo]]), 10**6, 0.2,
+                         'newton', massa, obter_backend('numpy'), 'leapfrog', monitor=monitor)
+        medidas = monitor.resultados()
+
+        # Elipse: pericentro e semieixo pela energia e momento angular
+        energia = 0.5 * v_apo ** 2 - massa / r_apo
+        semieixo = -massa / (2 * energia)
+        r_peri = 2 * semieixo - r_apo
+        periodo = 2 * np.pi * np.sqrt(semieixo ** 3 / massa)
+
+        self.assertTrue(medidas['concluido'])
+        self.assertEqual(medidas['revolucoes'][0], 3)
+        self.assertLess(monitor.tempo, 3.01 * periodo)
+        np.testing.assert_allclose(medidas['periodo'], periodo, rtol=1e-3)
+        np.testing.assert_allclose(medidas['periodo_radial'], periodo, rtol=1e-3)
+        np.testing.assert_allclose(medidas['raio_minimo'], r_peri, rtol=1e-3)
+        self.assertLess(abs(medidas['precessao'][0]), 1e-3)
+
+    def test_precessao_e_convergencia(self):
+        """Testa a precessão entrópica e o término por convergência"""
+        monitor = MonitorOrbital(tolerancia=1e-3)
+        tx, _, _ = simular_orbita('verlinde', 60.0, 10**6, 0.1, 1000.0, monitor=monitor)
+        medidas = monitor.resultados()
+        self.assertTrue(medidas['convergido'][0])
+        self.assertLess(len(tx), 10**6)
+
+        # Órbita excêntrica no regime 1/r: apsides recuam
+        monitor = MonitorOrbital(orbitas=2)
+        integrar_orbitas(np.array([[150.0, 0.0]]), np.array([[0.0, 2.5]]), 10**6, 0.2,
+                         'verlinde', 1000.0, obter_backend('numpy'), 'leapfrog', monitor=monitor)
+        self.assertLess(monitor.resultados()['precessao'][0], -1.0)
+
+    def test_termino_antecipado(self):
+        """Testa validar_curva_rotacao e a galáxia sem agente parando cedo"""
+        validacao = validar_curva_rotacao(np.array([20.0, 50.0, 80.0]), 'verlinde', 1000.0,
+                                          integrador='leapfrog')
+        self.assertTrue(validacao['concluido'])
+        self.assertLess(validacao['passos'], 100000)
+        self.assertLess(validacao['erro_relativo'].max(), 1e-3)
+
+        galaxia = GalaxiaConsciente(raio_galaxia=40.0, num_estrelas=10, semente=0)
+        galaxia.ativar_monitor_orbital(orbitas=1)
+        resultados = galaxia.simular_galaxia(passos=100000)
+        self.assertLess(galaxia.passo_atual, 1000)
+        self.assertTrue((resultados['orbitas']['revolucoes'] >= 1).all())
+
+class TestBenchmarks(unittest.TestCase):
+    """Testes para a suíte de benchmarks"""
+
+    PARAMETROS = {'passos': 20, 'caminhantes': 2, 'estrelas': 10, 'agentes': 2}
+
+    def test_executar_e_salvar(self):
+        """Testa a execução reduzida e o arquivo de referência"""
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'referencia.json')
+            argv = ['--repeticoes', '1', '--filtro', 'simular_orbita_newton', 'simular_galaxia']
+            argv += [f'--{nome}={valor}' for nome, valor in self.PARAMETROS.items()]
+            with mock.patch('sys.stdout'):
+                self.assertEqual(benchmark_simulacoes.main(argv + ['--salvar', caminho]), 0)
+                self.assertEqual(benchmark_simulacoes.main(
+                    argv + ['--comparar', caminho, '--tolerancia', '1000']), 0)
+            with open(caminho, encoding='utf-8') as arquivo:
+                referencia = json.load(arquivo)
+
+        self.assertEqual(referencia['parametros'], self.PARAMETROS)
+        galaxia = referencia['resultados']['simular_galaxia']
+        self.assertEqual(galaxia['trabalho'], 20 * 10)
+        self.assertGreater(galaxia['pico_memoria_bytes'], 0)
+        self.assertAlmostEqual(galaxia['vazao'], galaxia['trabalho'] / galaxia['tempo_s'])
+
+    def test_comparacao_detecta_regressao(self):
+        """Testa a comparação com a referência"""
+        def execucao(tempo, memoria):
+            return {'parametros': self.PARAMETROS,
+                    'resultados': {'simular_orbita_newton': {'tempo_s': tempo,
+                                                             'pico_memoria_bytes': memoria}}}
+        referencia = execucao(1.0, 1000)
+        self.assertFalse(benchmark_simulacoes.comparar(execucao(1.1, 1000), referencia)[0]['regressao'])
+        self.assertTrue(benchmark_simulacoes.comparar(execucao(1.5, 1000), referencia)[0]['regressao'])
+        self.assertTrue(benchmark_simulacoes.comparar(execucao(1.0, 2000), referencia)[0]['regressao'])
+        with self.assertRaises(ValueError):
+            benchmark_simulacoes.comparar(dict(execucao(1.0, 1000), parametros={}), referencia)
+
+class TestInstrumentacao(unittest.TestCase):
+    """Testes para a instrumentação dos laços de simulação"""
+
+    def test_fases_contadores_e_observadores(self):
+        """Testa a divisão por fase e os observadores da galáxia"""
+        galaxia = GalaxiaConsciente(num_estrelas=10, semente=3)
+        instrumentacao = galaxia.instrumentar(Instrumentacao(perfilar=['estrelas']))
+        observados = []
+        instrumentacao.adicionar_observador(lambda passo, g: observados.append(g.passo_atual), 5)
+        with mock.patch('sys.stdout'):
+            resultados = galaxia.simular_galaxia(passos=20)
+
+        relatorio = resultados['instrumentacao']
+        self.assertEqual(observados, [5, 10, 15, 20])
+        self.assertEqual(relatorio['passos'], 20)
+        self.assertEqual(relatorio['contadores']['avaliacoes_forca'], 20 * 10)
+        self.assertEqual(relatorio['fases']['estrelas']['chamadas'], 20)
+        self.assertLessEqual(sum(f['fracao'] for f in relatorio['fases'].values()), 1.0)
+        self.assertIn('passo_euler', instrumentacao.estatisticas_perfil())
+
+    def test_taxa_aceitacao_metropolis(self):
+        """Testa os contadores de Metropolis da queda entrópica"""
+        instrumentacao = Instrumentacao()
+        trajetoria = simular_queda_entropica(passos=200, instrumentacao=instrumentacao)
+        relatorio = instrumentacao.relatorio()
+        self.assertEqual(relatorio['contadores']['metropolis_propostas'], len(trajetoria) - 1)
+        movimentos = np.count_nonzero(np.diff(trajetoria))
+        self.assertEqual(relatorio['contadores']['metropolis_aceitos'], movimentos)
+        self.assertGreater(relatorio['passos_por_segundo'], 0)
+
+    def test_desativada_por_padrao(self):
+        """Testa que sem instrumentação o relatório fica vazio"""
+        galaxia = GalaxiaConsciente(num_estrelas=5)
+        with mock.patch('sys.stdout'):
+            self.assertIsNone(galaxia.simular_galaxia(passos=3)['instrumentacao'])
+
+class TestImportacao(unittest.TestCase):
+    """Testes para a importação do núcleo numérico sem matplotlib"""
+
+    # Tempo máximo para importar o núcleo, além do próprio NumPy
+    ORCAMENTO_S = 0.5
+    MODULOS = ['src.simulacao_1d', 'src.rotacao_galactica', 'src.agente_consciente',
+               'src.galaxia_consciente', 'src.galaxias_lote', 'src.passo_paralelo']
+
+    def _importar(self):
+        codigo = (
+            "import sys, time, json\n"
+            "import numpy\n"
+            "inicio = time.perf_counter()\n"
+            f"for modulo in {self.MODULOS!r}:\n"
+            "    __import__(modulo)\n"
+            "print(json.dumps({'tempo': time.perf_counter() - inicio,\n"
+            "                  'pesados': sorted(m for m in ('matplotlib', 'scipy')\n"
+            "                                    if m in sys.modules)}))\n"
+        )
+        raiz = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        saida = subprocess.run([sys.executable, '-c', codigo], cwd=raiz, capture_output=True,
+                               text=True, check=True)
+        return json.loads(saida.stdout)
+
+    def test_nucleo_sem_matplotlib(self):
+        """Testa que o núcleo não importa matplotlib nem scipy"""
+        self.assertEqual(self._importar()['pesados'], [])
+
+    def test_orcamento_de_importacao(self):
+        """Testa o tempo de importação do núcleo"""
+        self.assertLess(self._importar()['tempo'], self.ORCAMENTO_S)
+
+class TestLinhaComando(unittest.TestCase):
+    """Testes para a execução em lote pela linha de comando"""
+
+    def test_lote_por_configuracao(self):
+        """Testa uma configuração JSON com várias execuções e a saída gravada"""
+        configuracao = {
+            'simulacao': 'orbita',
+            'semente': 7,
+            'parametros': {'passos': 50},
+            'execucoes': [{'parametros': {'modelo': 'newton'}},
+                          {'simulacao': 'galaxia', 'rotulo': 'g',
+                           'parametros': {'num_estrelas': 5, 'passos': 10}}],
+        }
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'lote.json')
+            with open(caminho, 'w', encoding='utf-8') as arquivo:
+                json.dump(configuracao, arquivo)
+            saida = os.path.join(diretorio, 'saida')
+            with mock.patch('sys.stdout'):
+                codigo = linha_comando.main(['--config', caminho, '--saida', saida,
+                                             '--sem-grafico', '--param', 'dt=0.05'])
+            self.assertEqual(codigo, 0)
+            with open(os.path.join(saida, 'resumo.json'), encoding='utf-8') as arquivo:
+                resumo = json.load(arquivo)
+            self.assertEqual([e['rotulo'] for e in resumo], ['orbita_000', 'g'])
+            self.assertEqual([e['semente'] for e in resumo], [7, 8])
+            self.assertEqual(resumo[0]['parametros']['dt'], 0.05)
+            self.assertEqual(resumo[1]['metricas']['passos_executados'], 10)
+            with np.load(os.path.join(saida, 'orbita_000.npz')) as arrays:
+                self.assertEqual(len(arrays['x']), 51)
+            self.assertFalse(os.path.exists(os.path.join(saida, 'g.png')))
+
+    def test_parametros_desconhecidos(self):
+        """Testa a validação dos parâmetros"""
+        with self.assertRaises(ValueError):
+            linha_comando.montar_execucoes({'simulacao': 'orbita', 'parametros': {'raio': 1}})
+        with self.assertRaises(ValueError):
+            linha_comando.montar_execucoes({'simulacao': 'inexistente'})
+
+    def test_grafico_sem_janela(self):
+        """Testa a gravação do gráfico com o backend Agg"""
+        with tempfile.TemporaryDirectory() as diretorio, mock.patch('sys.stdout'):
+            linha_comando.main(['queda_1d', '--param', 'passos=20', '--saida', diretorio])
+            self.assertTrue(os.path.exists(os.path.join(diretorio, 'queda_1d_000.png')))
+
+class TestRenderizacao(unittest.TestCase):
+    """Testes para a renderização de muitas trajetórias"""
+
+    def test_colecao_trajetorias(self):
+        """Testa a LineCollection única e a decimação"""
+        plt = graficos.pyplot()
+        fig, ax = plt.subplots()
+        trajetorias = np.random.normal(size=(300, 11, 3))
+        colecao = graficos.colecao_trajetorias(ax, trajetorias, passo=3, color='b')
+        segmentos = colecao.get_segments()
+        self.assertEqual(len(ax.collections), 1)
+        self.assertEqual(len(segmentos), 300)
+        self.assertEqual(len(segmentos[0]), 5)  # passos 0, 3, 6, 9 e o último
+        np.testing.assert_allclose(segmentos[7][-1], trajetorias[7, -1, :2])
+        plt.close(fig)
+
+    def test_galaxia_em_modo_lote(self):
+        """Testa que a galáxia vira poucos artistas e não abre janela"""
+        galaxia = GalaxiaConsciente(num_estrelas=2000, semente=5)
+        galaxia.adicionar_agente_consciente()
+        with mock.patch('sys.stdout'):
+            galaxia.simular_galaxia(passos=20)
+        figuras = []
+        graficos.definir_modo_lote()
+        try:
+            with mock.patch('galaxia_consciente.mostrar', side_effect=figuras.append):
+                galaxia.plotar_galaxia_consciente(salvar=False)
+        finally:
+            graficos.definir_modo_lote(False)
+        ax = figuras[0].axes[0]
+        # Uma coleção de trajetórias e dois scatter (estrelas e objetivo), mais os do agente
+        self.assertLessEqual(len(ax.collections), 5)
+        self.assertEqual(len(ax.collections[0].get_segments()), 2000)
+        graficos.pyplot().close(figuras[0])
+
+class TestPiramideTrajetorias(unittest.TestCase):
+    """Testes para as pirâmides de níveis de detalhe"""
+
+    def test_envelope_da_serie(self):
+        """Testa que o envelope preserva os extremos com poucos vértices"""
+        serie = np.cumsum(np.random.choice([-0.5, 0.5], size=200000))
+        piramide = PiramideSerie(serie)
+        indices, valores = piramide.amostrar(pixels=500)
+        self.assertLessEqual(len(indices), 2 * 500 + 4)
+        self.assertEqual(valores.max(), serie.max())
+        self.assertEqual(valores.min(), serie.min())
+        np.testing.assert_array_equal(valores, serie[indices])
+
+        indices, valores = piramide.amostrar(50000, 60000, 500)
+        self.assertGreaterEqual(indices.min(), 49000)
+        self.assertLessEqual(indices.max(), 61000)
+        self.assertEqual(valores.max(), serie[50000:60001].max())
+        np.testing.assert_array_equal(PiramideSerie(serie[:100]).amostrar()[1], serie[:100])
+
+    def test_caminho_respeita_tolerancia(self):
+        """Testa o erro da simplificação e a monotonicidade nos níveis"""
+        n = 5000
+        caminho = np.c_[np.arange(n, dtype=float), np.cumsum(np.random.normal(size=n))]
+        piramide = PiramideCaminho(caminho)
+        anteriores = 0
+        for tolerancia in (10.0, 2.0, 0.5):
+            simplificado = piramide.amostrar(tolerancia)
+            self.assertGreater(len(simplificado), anteriores)
+            anteriores = len(simplificado)
+            np.testing.assert_array_equal(simplificado[[0, -1]], caminho[[0, -1]])
+            # Desvio de cada ponto à reta do segmento simplificado que o cobre
+            segmento = np.clip(np.searchsorted(simplificado[:, 0], caminho[:, 0]) - 1,
+                               0, len(simplificado) - 2)
+            a, b = simplificado[segmento], simplificado[segmento + 1]
+            corda = b - a
+            relativos = caminho - a
+            desvio = (np.abs(relativos[:, 0] * corda[:, 1] - relativos[:, 1] * corda[:, 0])
+                      / np.hypot(corda[:, 0], corda[:, 1]))
+            self.assertLessEqual(desvio.max(), tolerancia + 1e-9)
+
+    def test_cache_e_atualizacao_da_vista(self):
+        """Testa o cache das pirâmides e a troca de resolução no zoom"""
+        trajetoria = list(np.cumsum(np.random.normal(size=(20000, 2)), axis=0))
+        piramide = obter_piramide(trajetoria)
+        self.assertIs(obter_piramide(trajetoria), piramide)
+        trajetoria.append(trajetoria[-1])
+        self.assertIsNot(obter_piramide(trajetoria), piramide)
+
+        plt = graficos.pyplot()
+        fig, ax = plt.subplots()
+        serie = np.cumsum(np.random.normal(size=100000))
+        linha = graficos.linha_lod(ax, PiramideSerie(serie), pixels=200)
+        self.assertLessEqual(len(linha.get_xdata()), 2 * 200 + 4)
+        ax.set_xlim(1000, 1100)
+        np.testing.assert_array_equal(linha.get_xdata(), np.arange(1000, 1101))
+        plt.close(fig)
+
+class TestAnimacao(unittest.TestCase):
+    """Testes para a exportação de animações em streaming"""
+
+    def test_galaxia_para_png_sem_historico(self):
+        """Testa a animação da galáxia simulada quadro a quadro"""
+        galaxia = GalaxiaConsciente(num_estrelas=200, semente=2)
+        galaxia.adicionar_agente_consciente()
+        with tempfile.TemporaryDirectory() as diretorio, mock.patch('sys.stdout'):
+            resumo = animacao.animar_galaxia(galaxia, passos=10, destino=diretorio,
+                                             intervalo=5, dpi=40)
+            arquivos = sorted(os.listdir(diretorio))
+        self.assertEqual(resumo['quadros'], 3)  # passos 0, 5 e 10
+        self.assertEqual(arquivos, ['quadro_00000.png', 'quadro_00001.png', 'quadro_00002.png'])
+        self.assertEqual(galaxia.passo_atual, 10)
+        self.assertEqual(len(galaxia._historico_estrelas), 1)
+
+    def test_quadros_de_arquivo_com_blitting(self):
+        """Testa os quadros lidos de um .npy e a reutilização dos artistas"""
+        posicoes = np.random.uniform(-50, 50, size=(6, 100, 2))
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, 'estrelas.npy')
+            np.save(caminho, posicoes)
+            quadros = list(animacao.quadros_arquivo(caminho, intervalo=2,
+                                                    corpos={'agente': posicoes[:, 0]}))
+            self.assertEqual([q['passo'] for q in quadros], [0, 2, 4])
+            animador = animacao.AnimadorTrajetorias(60.0, ['agente'], dpi=30)
+            artistas = len(animador.ax.get_children())
+            imagens = [animador.renderizar(q).copy() for q in quadros]
+            del quadros
+        self.assertEqual(len(animador.ax.get_children()), artistas)
+        self.assertEqual(imagens[0].shape, animador.tamanho_pixels[::-1] + (4,))
+        self.assertFalse(np.array_equal(imagens[0], imagens[1]))
+
+    def test_video_requer_ffmpeg(self):
+        """Testa o erro quando o ffmpeg não está disponível"""
+        with mock.patch('shutil.which', return_value=None):
+            with self.assertRaises(RuntimeError):
+                animacao.EscritorVideo('saida.mp4', 10, 10)
+
+class TestVisualizacaoAoVivo(unittest.TestCase):
+    """Testes para o visualizador ao vivo (simulação e renderização em threads)"""
+
+    def test_fila_descarta_o_mais_antigo(self):
+        """Testa que publicar nunca bloqueia e o consumidor recebe o mais recente"""
+        fila = FilaDescarte(capacidade=2)
+        for item in range(5):
+            fila.publicar(item)
+        self.assertEqual(len(fila), 2)
+        self.assertEqual(fila.mais_recente(timeout=0), 4)
+        self.assertIsNone(fila.mais_recente(timeout=0))
+        self.assertEqual(fila.publicados, 5)
+        self.assertEqual(fila.descartados, 4)
+
+    def test_renderizacao_lenta_nao_bloqueia_simulacao(self):
+        """Testa que quadros são descartados em vez de atrasar a simulação"""
+        galaxia = GalaxiaConsciente(num_estrelas=3000, semente=4)
+        galaxia.adicionar_agente_consciente()
+        desenhados = []
+
+        def renderizador(instantaneo):
+            desenhados.append(instantaneo['passo'])
+            time.sleep(0.05)
+
+        visualizador = VisualizadorAoVivo(galaxia, passos=60, fps=50, maximo_estrelas=500)
+        with mock.patch('sys.stdout'):
+            resultados = visualizador.executar(renderizador)
+        estatisticas = resultados['visualizacao']
+        self.assertEqual(estatisticas['quadros'], len(desenhados))
+        self.assertEqual(estatisticas['instantaneos_publicados'], galaxia.passo_atual + 1)
+        self.assertGreater(estatisticas['instantaneos_descartados'], 0)
+        self.assertEqual(desenhados, sorted(desenhados))
+        self.assertEqual(resultados['estrelas_inertes'], 3000)
+
+    def test_pausar_e_retomar(self):
+        """Testa que a simulação pausada não avança e retoma do mesmo ponto"""
+        galaxia = GalaxiaConsciente(num_estrelas=50, semente=5)
+        produtor = ProdutorSimulacao(galaxia, passos=200, maximo_estrelas=10)
+        produtor.pausar()
+        produtor.iniciar()
+        time.sleep(0.1)
+        passo = galaxia.passo_atual
+        self.assertLessEqual(passo, 1)
+        time.sleep(0.1)
+        self.assertEqual(galaxia.passo_atual, passo)
+        self.assertTrue(produtor.ativo)
+        self.assertEqual(produtor.fila.mais_recente(timeout=0)['estrelas'].shape, (10, 2))
+        produtor.retomar()
+        self.assertTrue(produtor.aguardar(timeout=30))
+        self.assertIsNone(produtor.erro)
+        self.assertIsNotNone(produtor.resultados)
+
+class TestProvedorAleatorio(unittest.TestCase):
+    """Testes para o provedor de números aleatórios em blocos"""
+
+    def test_sequencia_independe_do_bloco(self):
+        """Testa que o tamanho do bloco e a ordem dos pedidos não mudam os valores"""
+        pequeno = ProvedorAleatorio(11, tamanho_bloco=3)
+        grande = ProvedorAleatorio(11)
+        normais_p = [pequeno.normal(0.5, 2) for _ in range(10)]
+        sinais_p = [pequeno.sinal() for _ in range(10)]
+        uniformes_g = [grande.uniforme() for _ in range(7)]
+        sinais_g = [grande.sinal() for _ in range(10)]
+        normais_g = [grande.normal(0.5, (2,)) for _ in range(10)]
+        np.testing.assert_array_equal(np.concatenate(normais_p), np.concatenate(normais_g))
+        self.assertEqual(sinais_p, sinais_g)
+        self.assertEqual(set(sinais_g), {-1.0, 1.0})
+        self.assertTrue(all(0.0 <= u < 1.0 for u in uniformes_g))
+        self.assertEqual(grande.normal(1.0, (2, 3)).shape, (2, 3))
+
+    def test_distribuicoes(self):
+        """Testa médias e desvios dos valores entregues"""
+        aleatorio = ProvedorAleatorio(0, tamanho_bloco=1000)
+        normais = np.concatenate([aleatorio.normal(2.0, 3) for _ in range(10000)])
+        uniformes = np.array([aleatorio.uniforme() for _ in range(20000)])
+        sinais = np.array([aleatorio.sinal() for _ in range(20000)])
+        self.assertAlmostEqual(normais.mean(), 0.0, delta=0.05)
+        self.assertAlmostEqual(normais.std(), 2.0, delta=0.05)
+        self.assertAlmostEqual(uniformes.mean(), 0.5, delta=0.01)
+        self.assertAlmostEqual(sinais.mean(), 0.0, delta=0.03)
+
+    def test_simuladores_reproduziveis(self):
+        """Testa que a mesma semente reproduz as simulações"""
+        queda = [simular_queda_entropica(passos=300, aleatorio=ProvedorAleatorio(5))
+                 for _ in range(2)]
+        self.assertEqual(queda[0], queda[1])
+        comparacoes = [comparar_agente_vs_materia_inerte(steps=100, aleatorio=ProvedorAleatorio(5))
+                       for _ in range(2)]
+        np.testing.assert_array_equal(comparacoes[0][0], comparacoes[1][0])
+        np.testing.assert_array_equal(comparacoes[0][1], comparacoes[1][1])
+        # Sem provedor, np.random.seed continua valendo
+        np.random.seed(8)
+        primeira = simular_queda_entropica(passos=300)
+        np.random.seed(8)
+        self.assertEqual(simular_queda_entropica(passos=300), primeira)
+
+    def test_simuladores_em_lote_reproduziveis(self):
+        """Testa que os simuladores em lote aceitam o provedor"""
+        posicoes = np.random.uniform(5, 20, (8, 2))
+        velocidades = np.random.normal(0, 1, (8, 2))
+        comparacoes = [comparar_agente_vs_materia_inerte_lote(
+            posicoes, velocidades, steps=100, aleatorio=ProvedorAleatorio(3)) for _ in range(2)]
+        for nome, valores in comparacoes[0].items():
+            np.testing.assert_array_equal(valores, comparacoes[1][nome])
+
+        lotes = [LoteGalaxias(3, 10, sementes=[0, 1, 2], aleatorio=ProvedorAleatorio(3))
+                 for _ in range(2)]
+        resultados = [lote.simular(passos=50) for lote in lotes]
+        np.testing.assert_array_equal(resultados[0]['trajetorias_agente'],
+                                      resultados[1]['trajetorias_agente'])
+
+class TestPrecisao(unittest.TestCase):
+    """Testes para a política de precisão float64/float32"""
+
+    def test_obter_dtype_e_padrao(self):
+        """Testa a resolução da precisão e a troca da precisão padrão"""
+        self.assertEqual(precisao.obter_dtype(), np.float64)
+        self.assertEqual(precisao.obter_dtype('float32'), np.float32)
+        self.assertEqual(precisao.obter_dtype(np.float32), np.float32)
+        with self.assertRaises(ValueError):
+            precisao.obter_dtype('float16')
+        precisao.definir_precisao_padrao('float32')
+        try:
+            self.assertEqual(AgenteConsciente().posicao.dtype, np.float32)
+            self.assertEqual(calcular_curva_rotacao(np.array([5.0, 50.0]), 'verlinde').dtype,
+                             np.float32)
+        finally:
+            precisao.definir_precisao_padrao()
+        self.assertEqual(AgenteConsciente().posicao.dtype, np.float64)
+
+    def test_galaxia_float32(self):
+        """Testa o estado float32 da galáxia contra a execução float64"""
+        galaxias = {}
+        for nome in ('float64', 'float32'):
+            galaxia = GalaxiaConsciente(num_estrelas=300, semente=3, precisao=nome)
+            galaxia.ativar_diagnosticos(intervalo=10)
+            with mock.patch('sys.stdout'):
+                resultados = galaxia.simular_galaxia(passos=100)
+            galaxias[nome] = (galaxia, resultados)
+        g32, r32 = galaxias['float32']
+        g64, r64 = galaxias['float64']
+        self.assertEqual(g32.posicoes.dtype, np.float32)
+        self.assertEqual(g32._historico_estrelas[-1].dtype, np.float32)
+        self.assertEqual(g32.posicoes.nbytes * 2, g64.posicoes.nbytes)
+        self.assertEqual(r32['precisao'], 'float32')
+        np.testing.assert_allclose(g32.posicoes, g64.posicoes, rtol=0, atol=1e-3 * g64.raio_galaxia)
+        # Diagnósticos acumulam em float64
+        self.assertLess(r32['diagnosticos']['deriva_momento_angular_maxima'],
+                        precisao.LIMITES_ERRO['float32']['deriva_momento_angular'])
+
+    def test_limites_de_erro_documentados(self):
+        """Testa que float32 respeita LIMITES_ERRO na configuração de referência"""
+        medida = precisao.medir_erro_precisao('float32')
+        self.assertTrue(medida['dentro_dos_limites'], medida)
+        self.assertGreater(medida['deriva_momento_angular'], 0.0)
+        self.assertLess(medida['excesso_deriva_energia'], 1e-3 * medida['deriva_energia'])
+
 class TestGalaxiaConsciente(unittest.TestCase):
     """Testes para simulação de galáxia consciente"""
 
@@ -336,5 +1447,231 @@ class TestGalaxiaConsciente(unittest.TestCase):
         self.assertIsNotNone(agent_data)
         self.assertGreater(len(agent_data['trajetoria']), 1)
 
+class TestVarreduraParametros(unittest.TestCase):
+    """Testes para a varredura de parâmetros com cache"""
+
+    def test_gerar_grade(self):
+        """Testa produto cartesiano da grade"""
+        grade = gerar_grade(forca_consciente=[0.1, 0.5], temperatura=[0.05, 0.1, 0.2])
+        self.assertEqual(len(grade), 6)
+        self.assertIn({'forca_consciente': 0.5, 'temperatura': 0.2}, grade)
+
+    def test_cache_reaproveita_pontos(self):
+        """Testa que grade estendida só simula pontos novos"""
+        with tempfile.TemporaryDirectory() as diretorio:
+            grade = gerar_grade(forca_consciente=[0.1, 0.3], passos=[20])
+            primeira = executar_varredura(grade, semente=7, workers=1,
+                                          diretorio_cache=diretorio)
+            self.assertFalse(any(r['em_cache'] for r in primeira))
+
+            estendida = gerar_grade(forca_consciente=[0.1, 0.3, 0.6], passos=[20])
+            segunda = executar_varredura(estendida, semente=7, workers=1,
+                                         diretorio_cache=diretorio)
+            self.assertEqual([r['em_cache'] for r in segunda], [True, True, False])
+
+            # Resultado do cache é idêntico ao calculado
+            np.testing.assert_array_equal(primeira[0]['trajetoria'],
+                                          segunda[0]['trajetoria'])
+
+    def test_chave_depende_da_semente(self):
+        """Testa que a chave do cache inclui semente e parâmetros"""
+        parametros = {'forca_consciente': 0.1}
+        chave_a = CacheResultados.chave(parametros, 0, 'agente')
+        chave_b = CacheResultados.chave(parametros, 1, 'agente')
+        self.assertNotEqual(chave_a, chave_b)
+
+    def test_chave_depende_das_dependencias(self):
+        """Testa que editar um módulo usado pelos simuladores muda a chave"""
+        import shutil
+        from src import cache_estrelas, varredura_parametros, versao_codigo
+        fontes = os.path.dirname(versao_codigo.__file__)
+        with tempfile.TemporaryDirectory() as diretorio:
+            for nome in os.listdir(fontes):
+                if nome.endswith('.py'):
+                    shutil.copy(os.path.join(fontes, nome), diretorio)
+            versao = versao_codigo.calcular_versao_codigo(diretorio)
+            # Os dois caches usam a mesma versão, de todo o pacote
+            self.assertEqual(versao, varredura_parametros.VERSAO_CODIGO)
+            self.assertEqual(versao, cache_estrelas.VERSAO_CAMPO)
+
+            with open(os.path.join(diretorio, 'precisao.py'), 'a') as arquivo:
+                arquivo.write('\n# alterado\n')
+            editada = versao_codigo.calcular_versao_codigo(diretorio)
+        self.assertNotEqual(editada, versao)
+        parametros = {'forca_consciente': 0.1}
+        self.assertNotEqual(CacheResultados.chave(parametros, 0, 'agente', versao),
+                            CacheResultados.chave(parametros, 0, 'agente', editada))
+
+class TestCacheEstrelas(unittest.TestCase):
+    """Testes para o cache do campo estelar"""
+
+    def test_reproducao_identica_a_integracao(self):
+        """Testa que o campo em cache reproduz exatamente a integração"""
+        with tempfile.TemporaryDirectory() as diretorio:
+            cache = CacheCampoEstelar(diretorio)
+
+            integrada = GalaxiaConsciente(num_estrelas=20, semente=3)
+            integrada.simular_galaxia(passos=40)
+
+            reproduzida = GalaxiaConsciente(num_estrelas=20, semente=3)
+            reproduzida.usar_campo_estelar(cache, passos=50, dt=0.1)
+            reproduzida.simular_galaxia(passos=40)
+
+            np.testing.assert_array_equal(reproduzida.posicoes, integrada.posicoes)
+            np.testing.assert_array_equal(reproduzida.velocidades, integrada.velocidades)
+            np.testing.assert_array_equal(reproduzida.estrelas[4]['trajetoria'],
+                                          integrada.estrelas[4]['trajetoria'])
+
+            # Segunda galáxia reutiliza o mesmo arquivo (memmap)
+            chave = CacheCampoEstelar.chave(3, 20, 100.0, 1000.0, 0.1, 50)
+            self.assertTrue(cache.contem(chave))
+            posicoes, _, _ = cache.obter(3, 20, 100.0, 1000.0, 0.1, 50)
+            self.assertIsInstance(posicoes, np.memmap)
+
+            # dt diferente ou passos além do campo são rejeitados
+            with self.assertRaises(ValueError):
+                reproduzida.atualizar_fisica_estrelas(dt=0.05)
+            with self.assertRaises(ValueError):
+                reproduzida.simular_galaxia(passos=20)
+
+    def test_requer_semente(self):
+        """Testa que o campo estelar exige galáxia com semente"""
+        with tempfile.TemporaryDirectory() as diretorio:
+            with self.assertRaises(ValueError):
+                GalaxiaConsciente(num_estrelas=3).usar_campo_estelar(
+                    CacheCampoEstelar(diretorio), passos=10)
+
+    def test_varredura_com_campo_estelar(self):
+        """Testa que a varredura de galáxia dá o mesmo resultado com o campo em cache"""
+        with tempfile.TemporaryDirectory() as diretorio:
+            grade = gerar_grade(forca_consciente=[0.3, 0.6], passos=[30], num_estrelas=[10])
+            sem_campo = executar_varredura(grade, 'galaxia', semente=2, workers=1,
+                                           diretorio_cache=os.path.join(diretorio, 'a'))
+            com_campo = executar_varredura(grade, 'galaxia', semente=2, workers=1,
+                                           diretorio_cache=os.path.join(diretorio, 'b'),
+                                           diretorio_campo_estelar=os.path.join(diretorio, 'c'))
+            for a, b in zip(sem_campo, com_campo):
+                np.testing.assert_array_equal(a['trajetoria'], b['trajetoria'])
+            # Os dois pontos compartilham um único campo estelar
+            self.assertEqual(len(os.listdir(os.path.join(diretorio, 'c'))), 1)
+
+class TestCampoEntropico(unittest.TestCase):
+    """Testes para avaliação vetorizada e grades do campo entrópico"""
+
+    def test_versoes_vetorizadas(self):
+        """Testa que as versões vetorizadas coincidem com as pontuais"""
+        xs = np.array([0.0, 0.5, 3.0, -10.0, 50.0])
+        esperado = [densidade_informacao(x) for x in xs]
+        np.testing.assert_allclose(densidade_informacao_vetorizada(xs), esperado)
+
+        agente = AgenteConsciente()
+        pontos = np.array([[0.0, 0.0], [3.0, 4.0], [-20.0, 1.0]])
+        esperado = [agente.densidade_entropica(p) for p in pontos]
+        np.testing.assert_allclose(densidade_entropica_vetorizada(pontos), esperado)
+
+    def test_grade_interpolada(self):
+        """Testa interpolação do campo e do gradiente em grade 2D"""
+        grade = obter_grade_campo()
+        self.assertIs(grade, obter_grade_campo())  # Construída uma única vez
+
+        pontos = np.array([[10.0, 0.0], [0.0, -30.0], [25.0, 25.0]])
+        np.testing.assert_allclose(grade.avaliar(pontos),
+                                   densidade_entropica_vetorizada(pontos), rtol=1e-2)
+
+        # Gradiente de 1/r² em (10, 0): (-2/r³, 0)
+        gradiente = grade.gradiente(np.array([10.0, 0.0]))
+        np.testing.assert_allclose(gradiente, [-2e-3, 0.0], rtol=2e-2, atol=1e-6)
+
+        # Fora da grade o perfil original é usado
+        self.assertAlmostEqual(grade.avaliar(np.array([200.0, 0.0])), 1.0 / 200.0 ** 2)
+
+    def test_grade_3d_perfil_customizado(self):
+        """Testa grade 3D de um perfil customizado usada pelo agente"""
+        def perfil(pontos):
+            return np.exp(-np.linalg.norm(pontos, axis=-1) / 10.0)
+
+        grade = GradeCampoEntropico.de_perfil(perfil, ((-20, 20),) * 3, resolucao=81)
+        ponto = np.array([5.0, 3.0, 2.0])
+        self.assertAlmostEqual(float(grade.avaliar(ponto)), float(perfil(ponto)), places=3)
+
+        agente = AgenteConsciente()
+        agente.campo_entropico = obter_grade_campo()
+        self.assertAlmostEqual(agente.densidade_entropica(np.array([10.0, 0.0])), 0.01, places=4)
+
+    def test_descontinuidade_e_fora_da_grade(self):
+        """Testa o perfil exato perto de r = 1 e o gradiente fora da grade"""
+        from campo_entropico import gradiente_densidade_entropica
+        grade = obter_grade_campo()
+        # Passo 0.5: a interpolação atravessaria o salto de 1000 para 1/r²
+        pontos = np.array([[1.2, 0.0], [0.9, 0.3], [1.7, 1.1]])
+        np.testing.assert_allclose(grade.avaliar(pontos),
+                                   densidade_entropica_vetorizada(pontos), rtol=1e-12)
+        np.testing.assert_allclose(grade.gradiente(pontos),
+                                   gradiente_densidade_entropica(pontos), rtol=1e-12)
+
+        # Fora da grade: gradiente analítico, não o valor da borda
+        np.testing.assert_allclose(grade.gradiente(np.array([150.0, 0.0])),
+                                   [-2.0 / 150.0 ** 3, 0.0], rtol=1e-12)
+
+    def test_cache_de_grades_limitado(self):
+        """Testa que o cache de grades descarta as menos usadas"""
+        import campo_entropico
+        primeira = obter_grade_campo(resolucao=11)
+        for resolucao in range(12, 12 + campo_entropico.TAMANHO_CACHE):
+            obter_grade_campo(resolucao=resolucao)
+        self.assertLessEqual(len(campo_entropico._CACHE_GRADES), campo_entropico.TAMANHO_CACHE)
+        self.assertIsNot(obter_grade_campo(resolucao=11), primeira)
+
+class TestIntegradorAdaptativo(unittest.TestCase):
+    """Testes para o integrador de passo adaptativo"""
+
+    def test_passos_menores_perto_do_centro(self):
+        """Testa que o passo diminui perto do centro entrópico"""
+        np.random.seed(1)
+        perto = IntegradorAdaptativo()
+        AgenteConsciente((2.0, 0.0), (0.0, 0.5)).simular_orbita(20, 0.1, integrador=perto)
+
+        longe = IntegradorAdaptativo()
+        AgenteConsciente((60.0, 0.0), (0.0, 0.5)).simular_orbita(20, 0.1, integrador=longe)
+
+        self.assertLess(np.mean(perto.historico_dt), np.mean(longe.historico_dt))
+
+    def test_campo_distante_usa_menos_passos(self):
+        """Testa que longe do centro o tempo total é coberto com menos passos"""
+        np.random.seed(2)
+        integrador = IntegradorAdaptativo()
+        agente = AgenteConsciente((60.0, 0.0), (0.0, 0.2))
+        trajetoria = agente.simular_orbita(steps=200, dt=0.1, integrador=integrador)
+
+        self.assertLess(len(integrador.historico_dt), 200)
+        self.assertEqual(len(trajetoria), len(integrador.historico_dt) + 1)
+        self.assertAlmostEqual(integrador.tempo, 20.0, places=9)
+
+    def test_sincronizacao_com_estrelas(self):
+        """Testa que o agente fica sincronizado com o passo das estrelas"""
+        galaxia = GalaxiaConsciente(num_estrelas=3)
+        galaxia.adicionar_agente_consciente(posicao_inicial=(3.0, 0.0),
+                                            velocidade_inicial=(0.0, 1.0))
+        integrador = IntegradorAdaptativo()
+        resultados = galaxia.simular_galaxia(passos=20, dt=0.1,
+                                             integrador_agente=integrador)
+
+        traj = resultados['agente_consciente']['trajetoria']
+        self.assertEqual(len(traj), len(resultados['trajetorias_inertes'][0]))
+        self.assertAlmostEqual(integrador.tempo, 0.1 * (len(traj) - 1), places=9)
+
+    def test_passo_cortado_mantem_sugestao(self):
+        """Testa que o corte por dt_limite não encolhe o passo seguinte"""
+        np.random.seed(3)
+        integrador = IntegradorAdaptativo()
+        agente = AgenteConsciente((60.0, 0.0), (0.0, 0.2))
+        for _ in range(5):
+            integrador.passo(agente)
+        sugerido = integrador._dt_sugerido
+
+        self.assertEqual(integrador.passo(agente, dt_limite=1e-4), 1e-4)
+        self.assertEqual(integrador._dt_sugerido, sugerido)
+        self.assertGreater(integrador.passo(agente), 1e-4 * FATOR_CRESCIMENTO_MAX)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file